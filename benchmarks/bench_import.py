@@ -0,0 +1,121 @@
+"""Import‑Zeit‑Benchmark für den Cocktail‑PDF‑Generator.
+
+Misst in jeweils frischen Interpretern, wie lange typische Einstiege brauchen
+(``import cocktail_pdf_generator``, Rezepte laden, Generator holen), und prüft,
+dass reportlab und Pillow dabei nur geladen werden, wo gerendert wird.
+
+Beispiele::
+
+    python benchmarks/bench_import.py --out import.json
+    python benchmarks/bench_import.py --baseline import.json
+
+Ein „schwerer“ Import in einem leichten Szenario ist immer ein Fehler (Exit‑Code 1);
+mit ``--baseline`` zählen zusätzlich Verlangsamungen über ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = (
+    "reportlab.pdfgen",
+    "reportlab.lib.utils",
+    "reportlab.lib.pagesizes",
+    "reportlab.lib.units",
+    "PIL.Image",
+)
+
+# Name → (Anweisung, schwere Module erlaubt?)
+SCENARIOS: Dict[str, Tuple[str, bool]] = {
+    "package": ("import cocktail_pdf_generator", False),
+    "load": ("from cocktail_pdf_generator import load_recipe_json, iter_recipes", False),
+    "catalogue": ("from cocktail_pdf_generator import RecipeCatalogue, compile_catalogue", False),
+    "folder": ("from cocktail_pdf_generator import generate_pdfs_from_folder, generate_collection_pdf", False),
+    "sheets": ("from cocktail_pdf_generator import generate_double_a4_sheet, generate_quadruple_a4_sheet", False),
+    "render": ("from cocktail_pdf_generator import create_cocktail_pdf, IMAGE_CACHE", True),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{stmt}
+ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+# ---------------------------------------------------------------------------
+# Messung – jede Wiederholung in einem neuen Prozess
+# ---------------------------------------------------------------------------
+
+def probe(stmt: str) -> Dict[str, Any]:
+    code = _PROBE.format(stmt=stmt, heavy=HEAVY)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def run_scenario(stmt: str, repeat: int) -> Dict[str, Any]:
+    samples = [probe(stmt) for _ in range(repeat)]
+    times = [s["ms"] for s in samples]
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "heavy": samples[-1]["heavy"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Vergleich mit Baseline
+# ---------------------------------------------------------------------------
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, slack_ms: float) -> List[str]:
+    """Regressionen: Median langsamer als ``baseline * (1 + tolerance) + slack_ms``."""
+    problems = []
+    for name, cur in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if old and cur["median_ms"] > old["median_ms"] * (1 + tolerance) + slack_ms:
+            problems.append(f"{name}: {cur['median_ms']} ms statt {old['median_ms']} ms")
+    return problems
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), nargs="+", default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--out", type=Path, default=Path("bench_import.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--slack-ms", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {"python": sys.version.split()[0], "scenarios": {}}
+    problems: List[str] = []
+    for name in args.scenario:
+        stmt, heavy_ok = SCENARIOS[name]
+        r = results["scenarios"][name] = run_scenario(stmt, args.repeat)
+        print(f"{name:<10} {r['median_ms']:>8.1f} ms (min {r['min_ms']:.1f})  {', '.join(r['heavy']) or '-'}")
+        if r["heavy"] and not heavy_ok:
+            problems.append(f"{name}: lädt {', '.join(r['heavy'])}")
+
+    args.out.write_text(json.dumps(results, indent=2), "utf-8")
+    print(f"Ergebnisse: {args.out}")
+
+    if args.baseline:
+        problems += compare(results, json.loads(args.baseline.read_text("utf-8")), args.tolerance, args.slack_ms)
+    for p in problems:
+        print("REGRESSION:", p)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Speicher‑Benchmark: ``RecipeData`` (Dict + Listen) gegen kompaktes ``Recipe``.
+
+Erzeugt aus den Beispielrezepten einen synthetischen Korpus (Titel eindeutig,
+Zutaten und Schritte wiederholen sich wie in echten Sammlungen), parst jedes
+Rezept aus eigenem JSON‑Text – wie beim Laden vieler Dateien – und misst mit
+``tracemalloc``, wie viel Speicher der komplette Korpus in beiden Formen belegt.
+
+Beispiele::
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --count 100000 --out memory.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cocktail_pdf_generator.definition import Recipe, recipe_from_dict  # noqa: E402
+
+
+def corpus(count: int) -> List[str]:
+    """``count`` JSON‑Texte nach dem Muster von ``rezepte/``."""
+    samples = [json.loads(p.read_text("utf-8")) for p in sorted((ROOT / "rezepte").glob("*.json"))]
+    return [
+        json.dumps({**samples[i % len(samples)], "title": f"{samples[i % len(samples)]['title']} #{i}"}, ensure_ascii=False)
+        for i in range(count)
+    ]
+
+
+def measure(texts: List[str], build: Callable[[Dict[str, Any]], Any]) -> int:
+    """Belegter Speicher (Bytes) für alle Rezepte gleichzeitig."""
+    gc.collect()
+    tracemalloc.start()
+    recipes = [build(recipe_from_dict(json.loads(text), "bench")) for text in texts]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del recipes
+    return size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Anzahl Rezepte (Standard: 100000)")
+    parser.add_argument("--out", type=Path, help="Ergebnis als JSON speichern")
+    args = parser.parse_args()
+
+    texts = corpus(args.count)
+    results = {
+        "RecipeData": measure(texts, lambda rec: rec),
+        "Recipe": measure(texts, Recipe.from_data),
+    }
+    base = results["RecipeData"]
+    print(f"{args.count} Rezepte")
+    for name, size in results.items():
+        print(f"  {name:<11} {size / 2**20:8.1f} MiB  {size / args.count:6.0f} B/Rezept  {size / base:6.1%}")
+    if args.out:
+        args.out.write_text(json.dumps({"count": args.count, "bytes": results}, indent=2), "utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
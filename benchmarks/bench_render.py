@@ -0,0 +1,257 @@
+"""Durchsatz‑Benchmark für den Cocktail‑PDF‑Generator.
+
+Erzeugt synthetische Rezept‑Korpora (offline, reproduzierbar) und misst
+``create_cocktail_pdf``, ``generate_pdfs_from_folder``, ``generate_double_a4_sheet``
+und ``generate_quadruple_a4_sheet``: Rezepte/s, Spitzen‑RSS und Ausgabegröße.
+
+Beispiele::
+
+    python benchmarks/bench_render.py --sizes 100 10000 --out bench.json
+    python benchmarks/bench_render.py --sizes 100 --baseline bench.json
+
+Mit ``--baseline`` wird gegen eine gespeicherte Ergebnisdatei verglichen; bei
+einer Verschlechterung über ``--tolerance`` endet das Skript mit Exit‑Code 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+GLASSES = ("longdrink", "tumbler", "wine", "martini")
+SPIRITS = ("Gin", "Wodka", "Rum", "Bourbon", "Tequila", "Aperol", "Lillet", "Cachaça")
+EXTRAS = ("Limettensaft", "Zuckersirup", "Soda", "Ginger Beer", "Tonic Water", "Minze", "Eiswürfel")
+STEPS = (
+    "Alle Zutaten in einen Shaker mit Eis geben.",
+    "Kräftig schütteln und in ein gekühltes Glas abseihen.",
+    "Mit Eis auffüllen",
+    "Umrühren und mit einer Orangenschale garnieren",
+)
+PHOTO_COUNT = 8
+CREATE_SAMPLE = 200  # create_cocktail_pdf wird auf einer Stichprobe gemessen
+
+
+# ---------------------------------------------------------------------------
+# Synthetische Korpora
+# ---------------------------------------------------------------------------
+
+def _make_photos(dest: Path) -> List[Path]:
+    """Einige große „Handyfotos“ (JPEG, 3000×2000) als gemeinsame Bildquellen."""
+    from PIL import Image
+
+    photos = []
+    for i in range(PHOTO_COUNT):
+        path = dest / f"foto_{i}.jpg"
+        if not path.exists():
+            img = Image.effect_mandelbrot((3000, 2000), (-2.0 + i * 0.1, -1.2, 1.0, 1.2), 100).convert("RGB")
+            img.save(path, quality=90)
+        photos.append(path)
+    return photos
+
+
+def make_corpus(dest: Path, size: int, seed: int = 1) -> Path:
+    """Erzeugt ``size`` Rezepte unter ``dest/rezepte`` (wird wiederverwendet, falls vollständig).
+
+    Mischung: ~55 % Glasbild, ~20 % eigenes Foto (``image_path``), ~10 % gleichnamiges
+    Bild, ~15 % ohne Bild (Platzhalter); jedes zehnte Rezept hat eine lange Zutatenliste.
+    """
+    folder = dest / "rezepte"
+    marker = folder / ".complete"
+    if marker.exists():
+        return folder
+    shutil.rmtree(folder, ignore_errors=True)
+    folder.mkdir(parents=True)
+    photos = _make_photos(dest)
+    rng = random.Random(seed)
+
+    for i in range(size):
+        name = f"rezept-{i:06d}"
+        n_ing = rng.randint(14, 22) if i % 10 == 0 else rng.randint(3, 6)
+        recipe: Dict[str, Any] = {
+            "title": f"{rng.choice(SPIRITS)} {rng.choice(EXTRAS)} Nr. {i}",
+            "ingredients": [f"{rng.randint(1, 8)} cl {rng.choice(SPIRITS + EXTRAS)}" for _ in range(n_ing)],
+            "steps": rng.sample(STEPS, rng.randint(2, 4)),
+        }
+        kind = rng.random()
+        if kind < 0.55:
+            recipe["glass"] = rng.choice(GLASSES)
+        elif kind < 0.75:
+            recipe["image_path"] = str(rng.choice(photos))
+        elif kind < 0.85:
+            photo = rng.choice(photos)
+            try:
+                os.link(photo, folder / f"{name}.jpg")
+            except OSError:
+                shutil.copy(photo, folder / f"{name}.jpg")
+        (folder / f"{name}.json").write_text(json.dumps(recipe, ensure_ascii=False), "utf-8")
+    marker.touch()
+    return folder
+
+
+# ---------------------------------------------------------------------------
+# Messungen – jede in einem frischen Prozess (sauberes Spitzen‑RSS, kalte Caches)
+# ---------------------------------------------------------------------------
+
+def _dir_bytes(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.glob("*.pdf"))
+
+
+def _bench_create(corpus: Path, out: Path, glasses: Path) -> int:
+    from cocktail_pdf_generator import create_cocktail_pdf, load_recipe_json
+
+    files = sorted(corpus.glob("*.json"))[:CREATE_SAMPLE]
+    out.mkdir(parents=True, exist_ok=True)
+    for js in files:
+        rec = load_recipe_json(js)
+        create_cocktail_pdf(
+            title=rec["title"],
+            ingredients=rec["ingredients"],
+            steps=rec["steps"],
+            image_path=rec.get("image_path"),
+            glass=rec.get("glass"),
+            glasses_dir=glasses,
+            output_path=out / f"{js.stem}.pdf",
+        )
+    return len(files)
+
+
+def _bench_folder(corpus: Path, out: Path, glasses: Path) -> int:
+    from cocktail_pdf_generator import generate_pdfs_from_folder
+
+    return len(generate_pdfs_from_folder(corpus, out, glasses))
+
+
+def _bench_double(corpus: Path, out: Path, glasses: Path) -> int:
+    from cocktail_pdf_generator import generate_double_a4_sheet
+
+    generate_double_a4_sheet(corpus, out, glasses)
+    return sum(1 for _ in corpus.glob("*.json"))
+
+
+def _bench_quadruple(corpus: Path, out: Path, glasses: Path) -> int:
+    from cocktail_pdf_generator import generate_quadruple_a4_sheet
+
+    generate_quadruple_a4_sheet(corpus, out, glasses)
+    return sum(1 for _ in corpus.glob("*.json"))
+
+
+BENCHES: Dict[str, Callable[[Path, Path, Path], int]] = {
+    "create_cocktail_pdf": _bench_create,
+    "generate_pdfs_from_folder": _bench_folder,
+    "generate_double_a4_sheet": _bench_double,
+    "generate_quadruple_a4_sheet": _bench_quadruple,
+}
+OUTPUTS = {
+    "create_cocktail_pdf": "einzeln",
+    "generate_pdfs_from_folder": "ordner",
+    "generate_double_a4_sheet": "zwei_auf_a4.pdf",
+    "generate_quadruple_a4_sheet": "vier_auf_a4.pdf",
+}
+
+
+def _child(name: str, corpus: Path, out: Path, glasses: Path, queue: "mp.Queue[Dict[str, Any]]") -> None:
+    # Eigener, leerer Plattencache (skalierte Bilder, Preflight) – sonst misst jeder
+    # Lauf nach dem ersten mit warmem ``~/.cache`` und Baseline‑Vergleiche hinken
+    with tempfile.TemporaryDirectory(prefix="cocktail-bench-cache-") as cache:
+        os.environ["XDG_CACHE_HOME"] = cache
+        start = time.perf_counter()
+        recipes = BENCHES[name](corpus, out, glasses)
+        seconds = time.perf_counter() - start
+    queue.put({
+        "recipes": recipes,
+        "seconds": round(seconds, 4),
+        "recipes_per_s": round(recipes / seconds, 2) if seconds else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "output_bytes": _dir_bytes(out),
+    })
+
+
+def run_bench(name: str, corpus: Path, work: Path, glasses: Path) -> Dict[str, Any]:
+    out = work / OUTPUTS[name]
+    if out.is_dir():
+        shutil.rmtree(out)
+    elif out.exists():
+        out.unlink()
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, corpus, out, glasses, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Vergleich mit Baseline
+# ---------------------------------------------------------------------------
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Liste der Regressionen (Durchsatz runter bzw. RSS/Größe rauf um mehr als ``tolerance``)."""
+    problems = []
+    for size, benches in results["runs"].items():
+        for name, cur in benches.items():
+            old = baseline.get("runs", {}).get(size, {}).get(name)
+            if not old:
+                continue
+            if old["recipes_per_s"] and cur["recipes_per_s"] < old["recipes_per_s"] * (1 - tolerance):
+                problems.append(f"{size}/{name}: {cur['recipes_per_s']} statt {old['recipes_per_s']} Rezepte/s")
+            for key in ("peak_rss_mb", "output_bytes"):
+                if old[key] and cur[key] > old[key] * (1 + tolerance):
+                    problems.append(f"{size}/{name}: {key} {cur[key]} statt {old[key]}")
+    return problems
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100])
+    parser.add_argument("--bench", choices=sorted(BENCHES), nargs="+", default=list(BENCHES))
+    parser.add_argument("--corpus-dir", type=Path, default=Path(tempfile.gettempdir()) / "cocktail_bench")
+    parser.add_argument("--glasses", type=Path, default=ROOT / "glasses")
+    parser.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {"python": sys.version.split()[0], "cpus": os.cpu_count(), "runs": {}}
+    for size in args.sizes:
+        base = args.corpus_dir / str(size)
+        corpus = make_corpus(base, size)
+        work = base / "out"
+        work.mkdir(exist_ok=True)
+        runs = results["runs"][str(size)] = {}
+        for name in args.bench:
+            runs[name] = run_bench(name, corpus, work, args.glasses)
+            r = runs[name]
+            print(
+                f"{size:>7} {name:<28} {r['recipes_per_s']:>9} Rezepte/s "
+                f"{r['peak_rss_mb']:>8} MB RSS {r['output_bytes'] / 1e6:>9.2f} MB"
+            )
+
+    args.out.write_text(json.dumps(results, indent=2), "utf-8")
+    print(f"Ergebnisse: {args.out}")
+
+    if args.baseline:
+        problems = compare(results, json.loads(args.baseline.read_text("utf-8")), args.tolerance)
+        for p in problems:
+            print("REGRESSION:", p)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,97 @@
-from .recipe_loader import create_cocktail_pdf
-from .pdf_double_a4 import generate_double_a4_sheet
-from .recipe_loader import load_recipe_json, generate_pdfs_from_folder
-from .quadrupel_a4_sheet import generate_quadruple_a4_sheet
+from __future__ import annotations
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+# Öffentliche API – Untermodule werden erst beim ersten Zugriff importiert, damit
+# ``import cocktail_pdf_generator`` (und jeder frisch gestartete Worker) nicht
+# reportlab und Pillow laden muss, solange nichts gerendert wird.
+_EXPORTS = {
+    "create_cocktail_pdf": "recipe_loader",
+    "generate_double_a4_sheet": "pdf_double_a4",
+    "load_recipe_json": "recipe_loader",
+    "iter_recipes": "recipe_loader",
+    "generate_pdfs_from_folder": "recipe_loader",
+    "RecipeBatchError": "recipe_loader",
+    "generate_quadruple_a4_sheet": "quadrupel_a4_sheet",
+    "generate_collection_pdf": "pdf_collection",
+    "compile_catalogue": "catalogue",
+    "RecipeCatalogue": "catalogue",
+    "RenderStats": "stats",
+    "collect_stats": "stats",
+    "ImageCache": "image_utils",
+    "IMAGE_CACHE": "image_utils",
+    "watch_recipes": "watch",
+    "generate_layouts": "pdf_layouts",
+    "LayoutOutputs": "pdf_layouts",
+    "SizeBreakdown": "optimize",
+    "pdf_size_breakdown": "optimize",
+    "preflight_recipes": "preflight",
+    "PreflightReport": "preflight",
+    "RecipeIndex": "recipe_index",
+    "select_recipes": "recipe_index",
+    "Recipe": "definition",
+    "ProgressEvent": "progress",
+    "RenderCancelled": "progress",
+    "print_progress": "progress",
+}
+
+if TYPE_CHECKING:
+    from .recipe_loader import create_cocktail_pdf
+    from .pdf_double_a4 import generate_double_a4_sheet
+    from .recipe_loader import load_recipe_json, generate_pdfs_from_folder, RecipeBatchError, iter_recipes
+    from .quadrupel_a4_sheet import generate_quadruple_a4_sheet
+    from .pdf_collection import generate_collection_pdf
+    from .catalogue import RecipeCatalogue, compile_catalogue
+    from .stats import RenderStats, collect_stats
+    from .image_utils import IMAGE_CACHE, ImageCache
+    from .watch import watch_recipes
+    from .pdf_layouts import LayoutOutputs, generate_layouts
+    from .optimize import SizeBreakdown, pdf_size_breakdown
+    from .preflight import PreflightReport, preflight_recipes
+    from .recipe_index import RecipeIndex, select_recipes
+    from .definition import Recipe
+    from .progress import ProgressEvent, RenderCancelled, print_progress
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # nächster Zugriff ohne __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
 
 
 __all__ = [
     "create_cocktail_pdf",
     "generate_double_a4_sheet",
     "load_recipe_json",
+    "iter_recipes",
     "generate_pdfs_from_folder",
+    "RecipeBatchError",
     "generate_quadruple_a4_sheet",
-]
\ No newline at end of file
+    "generate_collection_pdf",
+    "compile_catalogue",
+    "RecipeCatalogue",
+    "RenderStats",
+    "collect_stats",
+    "ImageCache",
+    "IMAGE_CACHE",
+    "watch_recipes",
+    "generate_layouts",
+    "LayoutOutputs",
+    "SizeBreakdown",
+    "pdf_size_breakdown",
+    "preflight_recipes",
+    "PreflightReport",
+    "RecipeIndex",
+    "select_recipes",
+    "Recipe",
+    "ProgressEvent",
+    "RenderCancelled",
+    "print_progress",
+]
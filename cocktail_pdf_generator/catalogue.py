@@ -0,0 +1,124 @@
+from __future__ import annotations
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .definition import RecipeData, is_recipe_file, recipe_from_dict
+from .lookup import auto_same_name, refresh_directory_indexes
+from .stats import stage
+
+__all__ = ["compile_catalogue", "is_catalogue", "RecipeCatalogue"]
+
+_SQLITE_MAGIC = b"SQLite format 3\0"
+
+_SCHEMA = """
+CREATE TABLE recipes (
+    pos        INTEGER PRIMARY KEY,
+    name       TEXT    NOT NULL UNIQUE,
+    data       TEXT    NOT NULL,
+    auto_image TEXT
+)
+"""
+
+
+def is_catalogue(path: str | Path) -> bool:
+    """``True``, wenn ``path`` eine (SQLite‑)Katalogdatei statt eines Rezeptordners ist."""
+    path = Path(path).expanduser()
+    if not path.is_file():
+        return False
+    with path.open("rb") as fh:
+        return fh.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+
+
+# ---------------------------------------------------------------------------
+# Kompilieren: Ordner → eine Katalogdatei
+# ---------------------------------------------------------------------------
+
+def compile_catalogue(recipes_folder: str | Path, catalogue_path: str | Path) -> Path:
+    """Packt alle Rezept‑JSONs eines Ordners (alphabetisch) in eine SQLite‑Datei.
+
+    Jedes Rezept wird beim Kompilieren geprüft; gleichnamige Bilder
+    (``mojito.json`` → ``mojito.png``) werden als absoluter Pfad mit abgelegt.
+    Fehlerhafte Dateien brechen mit ``ValueError`` ab, bevor die Datei ersetzt wird.
+    """
+    recipes_folder = Path(recipes_folder).expanduser().resolve()
+    catalogue_path = Path(catalogue_path).expanduser().resolve()
+    tmp = catalogue_path.with_suffix(catalogue_path.suffix + ".tmp")
+    tmp.unlink(missing_ok=True)
+    refresh_directory_indexes()
+
+    con = sqlite3.connect(tmp)
+    try:
+        con.execute(_SCHEMA)
+        rows = []
+        for js in sorted(js for js in recipes_folder.glob("*.json") if is_recipe_file(js.name)):
+            text = js.read_text("utf-8")
+            recipe_from_dict(json.loads(text), js)
+            auto_img = auto_same_name(js)
+            rows.append((js.stem, text, str(auto_img) if auto_img else None))
+        con.executemany("INSERT INTO recipes (name, data, auto_image) VALUES (?, ?, ?)", rows)
+        con.commit()
+    finally:
+        con.close()
+    tmp.replace(catalogue_path)
+    return catalogue_path
+
+
+# ---------------------------------------------------------------------------
+# Lesen: iterieren oder gezielt per Name
+# ---------------------------------------------------------------------------
+
+class RecipeCatalogue:
+    """Nur‑lesender Zugriff auf eine mit ``compile_catalogue`` erzeugte Datei.
+
+    Beim Iterieren wird zeilenweise gelesen und nur das aktuelle Rezept
+    geparst; ``catalogue["mojito"]`` greift über den Index direkt zu.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser().resolve()
+        self._con = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True)
+
+    def __enter__(self) -> "RecipeCatalogue":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __len__(self) -> int:
+        return self._con.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def __contains__(self, name: object) -> bool:
+        return self._con.execute("SELECT 1 FROM recipes WHERE name = ?", (name,)).fetchone() is not None
+
+    def __getitem__(self, name: str) -> RecipeData:
+        row = self._con.execute("SELECT data FROM recipes WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return recipe_from_dict(json.loads(row[0]), f"{self.path.name}:{name}")
+
+    def names(self) -> List[str]:
+        return [row[0] for row in self._con.execute("SELECT name FROM recipes ORDER BY pos")]
+
+    def entries(self) -> Iterator[Tuple[str, RecipeData, Optional[str]]]:
+        """``(name, rezept, gleichnamiges_bild)`` in Katalogreihenfolge, Rezept unverändert."""
+        cursor = self._con.execute("SELECT name, data, auto_image FROM recipes ORDER BY pos")
+        for name, data, auto_image in cursor:
+            with stage("load"):
+                rec = recipe_from_dict(json.loads(data), f"{self.path.name}:{name}")
+            yield name, rec, auto_image
+
+    def items(self, same_name: bool = False) -> Iterator[Tuple[str, RecipeData]]:
+        """``(name, rezept)`` in Katalogreihenfolge; ``same_name`` setzt gleichnamige Bilder ein."""
+        for name, rec, auto_image in self.entries():
+            if same_name and not rec.get("image_path") and auto_image:
+                rec["image_path"] = auto_image
+            yield name, rec
+
+    def __iter__(self) -> Iterator[RecipeData]:
+        for _, rec in self.items():
+            yield rec
@@ -1,9 +1,141 @@
-from typing import List, TypedDict
+import sys
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Tuple, TypedDict
 
 
 class RecipeData(TypedDict, total=False):
     title: str
     ingredients: List[str]
     steps: List[str]
-    image_path: str | None
-    glass: str | None
\ No newline at end of file
+    image_path: str | bytes | None  # Pfad oder Bilddaten im Speicher
+    glass: str | None
+
+
+def recipe_from_dict(data: Any, source: object) -> RecipeData:
+    """Prüft Pflichtfelder eines geparsten Rezepts; ``source`` erscheint in der Fehlermeldung."""
+    if not {"title", "ingredients", "steps"}.issubset(data):
+        raise ValueError(f"JSON {source} fehlt Pflichtfelder (title, ingredients, steps)")
+    return RecipeData(
+        title=data["title"],
+        ingredients=data["ingredients"],
+        steps=data["steps"],
+        image_path=data.get("image_path"),
+        glass=data.get("glass"),
+    )
+
+
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def recipe_type_errors(data: Mapping[str, Any]) -> List[str]:
+    """Fehlende Pflichtfelder und falsche Typen eines geparsten Rezepts (leer = renderbar)."""
+    errors: List[str] = []
+    missing = [f for f in ("title", "ingredients", "steps") if f not in data]
+    if missing:
+        errors.append(f"Pflichtfelder fehlen: {', '.join(missing)}")
+    if "title" in data and not (isinstance(data["title"], str) and data["title"].strip()):
+        errors.append("title muss ein nicht‑leerer Text sein")
+    for field in ("ingredients", "steps"):
+        if field in data and not _is_str_list(data[field]):
+            errors.append(f"{field} muss eine Liste von Texten sein")
+    for field in ("glass", "image_path"):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            errors.append(f"{field} muss ein Text oder null sein")
+    return errors
+
+
+def is_recipe_file(name: str) -> bool:
+    """Rezept‑JSON nach Dateinamen; versteckte Dateien (Build‑Manifest, Caches) zählen nicht."""
+    return name.endswith(".json") and not name.startswith(".")
+
+
+# ---------------------------------------------------------------------------
+# Kompaktes, unveränderliches Rezept für große Korpora im Speicher
+# ---------------------------------------------------------------------------
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class Recipe(Mapping[str, Any]):
+    """Speichersparende Alternative zu ``RecipeData``: Slots statt Dict, Tupel statt Listen.
+
+    Zutaten, Schritte und Glas werden interniert – „Eiswürfel“ liegt dann für den
+    ganzen Korpus nur einmal im Speicher. Als read‑only ``Mapping`` ist ``Recipe``
+    überall verwendbar, wo ``RecipeData`` gelesen wird (``rec["title"]``,
+    ``rec.get("glass")``, ``{**rec}``). Änderungen gehen über ``replace``.
+    """
+
+    __slots__ = ("title", "ingredients", "steps", "image_path", "glass")
+
+    title: str
+    ingredients: Tuple[str, ...]
+    steps: Tuple[str, ...]
+    image_path: str | bytes | None
+    glass: Optional[str]
+
+    def __init__(
+        self,
+        title: str,
+        ingredients: Iterable[str],
+        steps: Iterable[str],
+        image_path: str | bytes | None = None,
+        glass: str | None = None,
+    ) -> None:
+        init = object.__setattr__
+        init(self, "title", title)
+        init(self, "ingredients", tuple(map(_intern, ingredients)))
+        init(self, "steps", tuple(map(_intern, steps)))
+        init(self, "image_path", image_path)
+        init(self, "glass", _intern(glass))
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any]) -> "Recipe":
+        """Aus ``RecipeData`` (oder einem anderen Rezept‑Mapping); ``Recipe`` bleibt, wie es ist."""
+        if isinstance(data, cls):
+            return data
+        return cls(data["title"], data["ingredients"], data["steps"], data.get("image_path"), data.get("glass"))
+
+    def to_data(self) -> RecipeData:
+        """Veränderbare ``RecipeData``‑Kopie (Listen statt Tupel)."""
+        return RecipeData(
+            title=self.title,
+            ingredients=list(self.ingredients),
+            steps=list(self.steps),
+            image_path=self.image_path,
+            glass=self.glass,
+        )
+
+    def replace(self, **changes: Any) -> "Recipe":
+        """Kopie mit geänderten Feldern, z. B. ``rec.replace(image_path=...)``."""
+        return Recipe(**{**self, **changes})
+
+    # -- Mapping ------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in Recipe.__slots__:
+            raise KeyError(key)
+        return object.__getattribute__(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(Recipe.__slots__)
+
+    def __len__(self) -> int:
+        return len(Recipe.__slots__)
+
+    # -- Unveränderlichkeit ---------------------------------------------------
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Recipe ist unveränderlich – replace() benutzen")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Recipe ist unveränderlich")
+
+    def __hash__(self) -> int:
+        return hash((self.title, self.ingredients, self.steps, self.image_path, self.glass))
+
+    def __reduce__(self) -> Tuple[Any, ...]:  # Pickle/Kopie (z. B. für Worker‑Prozesse)
+        return Recipe, (self.title, self.ingredients, self.steps, self.image_path, self.glass)
+
+    def __repr__(self) -> str:
+        return f"Recipe(title={self.title!r}, ingredients={len(self.ingredients)}, steps={len(self.steps)})"
@@ -1,19 +1,62 @@
 from __future__ import annotations
+import copy
+import hashlib
 import io
+import logging
+import math
+import os
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from threading import Event, Lock
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+from reportlab import rl_config
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfdoc
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
+from reportlab.lib.units import mm
+from .lookup import (
+    GLASS_EXT,
+    DirectoryIndex,
+    auto_same_name,
+    directory_index,
+    find_glass_image,
+    is_indexed_file,
+    refresh_directory_indexes,
+)
+from .stats import stage
 
 try:
     from PIL import Image
 except ModuleNotFoundError:
     Image = None
 
-__all__ = ["draw_bitmap", "draw_placeholder", "find_glass_image", "auto_same_name"]
+# Geteilte Bildströme nutzen reportlab‑Interna (``_digester``, ``c._doc``, ``c._code`` …).
+# Fehlen sie in einer anderen reportlab‑Version, wird jedes Bild über ``drawImage`` eingebettet.
+try:
+    from reportlab.pdfgen.canvas import _digester
+except ImportError:
+    _digester = None
+
+log = logging.getLogger(__name__)
 
-GLASS_EXT = (".png", ".jpg", ".jpeg", ".gif")
+__all__ = [
+    "draw_bitmap",
+    "draw_prepared",
+    "draw_placeholder",
+    "find_glass_image",
+    "auto_same_name",
+    "prepare_bitmap",
+    "prepare_asset",
+    "ImageCache",
+    "IMAGE_CACHE",
+    "embedded_images",
+    "DirectoryIndex",
+    "directory_index",
+    "refresh_directory_indexes",
+]
 
 
 # ---------------------------------------------------------------------------
@@ -32,53 +75,417 @@ def draw_placeholder(c: canvas.Canvas, x: float, y: float, w: float, h: float) -
     c.restoreState()
 
 # ---------------------------------------------------------------------------
-# Bild‑Loader (PNG‑Fix etc.)
+# Vorbereitete Bilder + prozessweiter LRU‑Cache
 # ---------------------------------------------------------------------------
 
-def auto_same_name(base: Path) -> Optional[Path]:
-    for ext in (".jpg", ".jpeg", ".png", ".gif"):
-        cand = base.with_suffix(ext)
-        if cand.is_file():
-            return cand
-    return None
+class PreparedImage(NamedTuple):
+    """Fertig einbettbares Bild: entweder geflachtes PNG (``ImageReader``) oder Originaldatei.
 
+    ``digest`` ist ein Hash über die einzubettenden Bytes, ``nbytes`` deren Länge.
+    """
 
-def find_glass_image(glass: str, gdir: Path) -> Optional[Path]:
-    for ext in (".png", ".jpg", ".jpeg", ".gif"):
-        img = gdir / f"{glass}{ext}"
-        if img.is_file():
-            return img
-    return None
+    source: Union[ImageReader, str]
+    mask: Optional[str]
+    width: int
+    height: int
+    digest: str
+    nbytes: int
+
+
+def _flattened(img) -> PreparedImage:
+    data = io.BytesIO()
+    img.save(data, format="PNG")
+    raw = data.getvalue()
+    data.seek(0)
+    return PreparedImage(ImageReader(data), None, img.size[0], img.size[1], hashlib.sha1(raw).hexdigest(), len(raw))
 
 
-def draw_bitmap(c: canvas.Canvas, path: Path, x: float, y: float, w: float, h: float) -> bool:
-    suffix = path.suffix.lower()
-    if suffix == ".png" and Image is not None:
+def prepare_bitmap(path: Path | bytes) -> Optional[PreparedImage]:
+    """Dekodiert ``path`` einmalig (PNG‑Alpha → weißer Hintergrund) – ``None`` wenn unlesbar.
+
+    Statt eines Pfads gehen auch die Bilddaten selbst (``bytes``).
+    """
+    in_memory = isinstance(path, bytes)
+
+    def source():
+        return io.BytesIO(path) if in_memory else path
+
+    is_png = path.startswith(b"\x89PNG") if in_memory else path.suffix.lower() == ".png"
+    if is_png and Image is not None:
         try:
-            img = Image.open(path)
+            img = Image.open(source())
             if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
                 bg = Image.new("RGB", img.size, (255, 255, 255))
                 bg.paste(img, mask=img.split()[-1])
-                bio = io.BytesIO()
-                bg.save(bio, format="PNG")
-                bio.seek(0)
-                c.drawImage(ImageReader(bio), x, y, w, h, preserveAspectRatio=True, anchor="c")
-                return True
+                return _flattened(bg)
         except Exception:
             pass
     try:
-        c.drawImage(str(path), x, y, w, h, preserveAspectRatio=True, anchor="c", mask="auto")
-        return True
+        reader = ImageReader(source() if in_memory else str(path))
+        width, height = reader.getSize()
+        raw = path if in_memory else path.read_bytes()
+        embed = reader if in_memory else str(path)
+        return PreparedImage(embed, "auto", width, height, hashlib.sha1(raw).hexdigest(), len(raw))
     except Exception:
         pass
     if Image is not None:
         try:
-            img = Image.open(path).convert("RGB")
-            bio = io.BytesIO()
-            img.save(bio, format="PNG")
-            bio.seek(0)
-            c.drawImage(ImageReader(bio), x, y, w, h, preserveAspectRatio=True, anchor="c")
-            return True
+            return _flattened(Image.open(source()).convert("RGB"))
         except Exception:
             pass
-    return False
\ No newline at end of file
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Asset‑Pipeline: auf Zielauflösung der Bildbox herunterrechnen
+# ---------------------------------------------------------------------------
+
+ASSET_REVISION = 1  # erhöhen, wenn sich Skalierung/Kodierung ändert (invalidiert den Plattencache)
+JPEG_QUALITY = 85
+# Erst ab deutlicher Überauflösung skalieren – knapp darüber spart kaum Bytes,
+# kostet aber Schärfe (und Strichgrafik komprimiert danach schlechter).
+OVERSIZE_FACTOR = 1.5
+
+
+def _encode_asset(raw: bytes, target_px: int) -> Optional[Tuple[bytes, str]]:
+    """Skaliert auf höchstens ``target_px`` und wählt die Kodierung.
+
+    Fotos → JPEG (DCT, wird unverändert eingebettet), Strichgrafik/Alpha → PNG (Flate).
+    """
+    try:
+        img = Image.open(io.BytesIO(raw))
+        img.load()
+    except Exception:
+        return None
+    source_format = img.format
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    if has_alpha:
+        rgba = img.convert("RGBA")
+        img = Image.new("RGB", rgba.size, (255, 255, 255))
+        img.paste(rgba, mask=rgba.split()[-1])
+    elif img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    resized = max(img.size) > target_px * OVERSIZE_FACTOR
+    if resized:
+        img.thumbnail((target_px, target_px), Image.LANCZOS)
+    if not resized and source_format == "JPEG" and img.mode in ("RGB", "L"):
+        return raw, "jpg"  # passt schon – nicht erneut verlustbehaftet kodieren
+
+    out = io.BytesIO()
+    if has_alpha or img.getcolors(256) is not None:
+        img.save(out, format="PNG")
+        return out.getvalue(), "png"
+    img.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue(), "jpg"
+
+
+def prepare_asset(path: Path | bytes, target_px: int, asset_dir: Path | None = None) -> Optional[PreparedImage]:
+    """Wie ``prepare_bitmap``, aber auf ``target_px`` skaliert; Ergebnis optional auf Platte gecacht.
+
+    Der Plattencache ist über den Hash der Quelldatei adressiert – umbenannte oder
+    kopierte Bilder werden also nicht erneut verarbeitet.
+    """
+    if isinstance(path, bytes):
+        raw = path
+    else:
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+    key = hashlib.sha1(raw + f":{target_px}:{ASSET_REVISION}".encode()).hexdigest()
+
+    data: Optional[bytes] = None
+    if asset_dir is not None:
+        for ext in ("jpg", "png"):
+            try:
+                data = (asset_dir / f"{key}.{ext}").read_bytes()
+                break
+            except OSError:
+                pass
+    if data is None:
+        encoded = _encode_asset(raw, target_px)
+        if encoded is None:
+            return None
+        data, ext = encoded
+        if asset_dir is not None:
+            try:
+                asset_dir.mkdir(parents=True, exist_ok=True)
+                tmp = asset_dir / f"{key}.{ext}.{os.getpid()}.tmp"
+                tmp.write_bytes(data)
+                tmp.replace(asset_dir / f"{key}.{ext}")
+            except OSError:
+                pass  # Cache ist optional
+
+    reader = ImageReader(io.BytesIO(data))
+    width, height = reader.getSize()
+    return PreparedImage(reader, None, width, height, hashlib.sha1(data).hexdigest(), len(data))
+
+
+def default_asset_dir() -> Path:
+    """``$XDG_CACHE_HOME/cocktail_pdf_generator/assets`` (Standard: ``~/.cache/...``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cocktail_pdf_generator" / "assets"
+
+
+CacheKey = Tuple[str, int, int]
+
+
+class ImageCache:
+    """Begrenzter LRU‑Cache für vorbereitete Bitmaps.
+
+    Schlüssel ist ``(Pfad, mtime, Größe)`` – wird eine Datei ersetzt, entsteht
+    automatisch ein neuer Eintrag. Bilddaten im Speicher (``bytes``) werden über
+    ihren Inhalts‑Hash geführt. Auch unlesbare Dateien werden (als ``None``)
+    gemerkt, damit sie nicht bei jeder Karte erneut geöffnet werden.
+
+    Mit ``target_dpi`` werden Bilder auf die Auflösung der Bildbox (``box_size``
+    in pt) heruntergerechnet und in ``asset_dir`` abgelegt (``None`` = nur im
+    Speicher). ``target_dpi=None`` bettet die Originale ein.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 64,
+        target_dpi: int | None = 300,
+        box_size: float = 40 * mm,  # = layout.BOX_SIZE
+        asset_dir: Path | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.target_dpi = target_dpi
+        self.box_size = box_size
+        self.asset_dir = asset_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, Optional[PreparedImage]] = OrderedDict()
+        self._loading: Dict[CacheKey, Event] = {}  # gerade in Arbeit (Vorausladen in Threads)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def settings_key(self) -> str:
+        """Einstellungen, die das Aussehen eingebetteter Bilder bestimmen – leer bei Standardwerten.
+
+        Geht in den Fingerabdruck inkrementeller Builds ein (``asset_dir`` ändert das Ergebnis nicht).
+        """
+        key = self._settings()
+        return "" if key == _DEFAULT_SETTINGS else key
+
+    def _settings(self) -> str:
+        return f"{self.target_dpi}:{self.box_size}:{JPEG_QUALITY}:{OVERSIZE_FACTOR}"
+
+    def get(self, path: Path | bytes) -> Optional[PreparedImage]:
+        if isinstance(path, bytes):
+            key = (f"sha1:{hashlib.sha1(path).hexdigest()}", 0, len(path))
+        else:
+            try:
+                st = path.stat()
+            except OSError:
+                return None
+            key = (str(path), st.st_mtime_ns, st.st_size)
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                loading = self._loading.get(key)
+                if loading is None:
+                    self._loading[key] = loading = Event()
+                    self.misses += 1
+                    break
+            loading.wait()  # ein anderer Thread bereitet dasselbe Bild vor
+        try:
+            prepared = None
+            if self.target_dpi and Image is not None:
+                prepared = prepare_asset(path, math.ceil(self.box_size / 72 * self.target_dpi), self.asset_dir)
+            if prepared is None:
+                prepared = prepare_bitmap(path)
+            with self._lock:
+                self._entries[key] = prepared
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+        return prepared
+
+    def clear(self) -> None:
+        """Leert den Cache und setzt die Zähler zurück."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_DEFAULT_SETTINGS = ImageCache()._settings()
+IMAGE_CACHE = ImageCache(asset_dir=default_asset_dir())
+
+
+# ---------------------------------------------------------------------------
+# Einbettung: jedes Bild nur einmal pro Canvas
+# ---------------------------------------------------------------------------
+
+class EmbeddedImages:
+    """Buchführung je Canvas: Inhalts‑Hash → Form‑XObject mit dem Bild."""
+
+    def __init__(self) -> None:
+        self.forms: Dict[str, str] = {}
+        self.embedded = 0
+        self.reused = 0
+        # Bilddaten, die bei Wiederverwendung nicht erneut gelesen/kodiert wurden. Keine
+        # Ersparnis im PDF: gleiche Image‑XObjects teilt reportlab ohnehin.
+        self.reused_bytes = 0
+
+
+_EMBEDDED: "WeakKeyDictionary[canvas.Canvas, EmbeddedImages]" = WeakKeyDictionary()
+
+
+def embedded_images(c: canvas.Canvas) -> EmbeddedImages:
+    """Liefert die Einbettungs‑Statistik von ``c`` (wird bei Bedarf angelegt)."""
+    try:
+        return _EMBEDDED[c]
+    except KeyError:
+        return _EMBEDDED.setdefault(c, EmbeddedImages())
+
+
+# Kodierte Bildströme über Canvas hinweg: ``PDFImageXObject`` (Pixel lesen, zlib,
+# ASCII85) kostet pro Dokument und Bild mehr als der ganze Rest der Karte. Jedes
+# Dokument bekommt eine flache Kopie (reportlab merkt sich darin den Objektnamen),
+# der kodierte Strom selbst wird geteilt.
+XOBJECT_CACHE_SIZE = 64
+_XOBJECTS: OrderedDict[Tuple[str, Optional[str], int], Optional[Tuple[str, pdfdoc.PDFImageXObject]]] = OrderedDict()
+_XOBJECTS_LOCK = Lock()
+
+
+def _image_xobject(prepared: PreparedImage) -> Optional[Tuple[str, pdfdoc.PDFImageXObject]]:
+    """``(name, xobject)`` wie von ``drawImage`` erzeugt – ``None``, wenn nicht teilbar (Softmask).
+
+    Ohne ASCII85 (Optimierungsmodus) wird der Flate‑Strom mit höchster Stufe neu komprimiert.
+    """
+    key = (prepared.digest, prepared.mask, rl_config.useA85)
+    with _XOBJECTS_LOCK:
+        if key in _XOBJECTS:
+            _XOBJECTS.move_to_end(key)
+            return _XOBJECTS[key]
+    source = prepared.source
+    if isinstance(source, ImageReader):
+        mdata = str(prepared.mask).encode("utf8")
+        if prepared.mask == "auto" and source._dataA:
+            mdata = source._dataA.getRGBData()
+        name = _digester(source.getRGBData() + mdata)
+    else:
+        # Nach Inhalt statt Pfad benennen (drawImage nimmt den Pfad): eine am selben Ort
+        # ersetzte Datei darf beim Zusammenfügen nicht mit der alten verwechselt werden
+        name = _digester(f"{prepared.digest}{prepared.mask}".encode("utf-8"))
+    xobject = pdfdoc.PDFImageXObject(name, source, mask=prepared.mask)
+    xobject.name = name
+    if tuple(xobject._filters) == ("FlateDecode",):
+        xobject.streamContent = zlib.compress(zlib.decompress(xobject.streamContent), 9)
+    # Softmasks hängt drawImage beim ersten Dokument um – solche Bilder nicht teilen
+    result = None if getattr(xobject, "_smask", None) else (name, xobject)
+    with _XOBJECTS_LOCK:
+        _XOBJECTS[key] = result
+        while len(_XOBJECTS) > XOBJECT_CACHE_SIZE:
+            _XOBJECTS.popitem(last=False)
+    return result
+
+
+def _draw_xobject(c: canvas.Canvas, name: str, xobject: pdfdoc.PDFImageXObject, w: float, h: float) -> None:
+    """Entspricht ``c.drawImage(...)`` bei (0, 0), aber mit fertig kodiertem Bild."""
+    # Alle Interna vorab lesen: fehlt eines, ist am Canvas noch nichts verändert
+    doc, code, forms_in_use = c._doc, c._code, c._formsinuse
+    reg_name = doc.getXObjectName(name)
+    if reg_name not in doc.idToObject:
+        xobject = copy.copy(xobject)
+        doc.Reference(xobject, reg_name)
+        doc.addForm(name, xobject)
+    c._currentPageHasImages = 1
+    c.saveState()
+    c.scale(w, h)
+    code.append(f"/{reg_name} Do")
+    c.restoreState()
+    forms_in_use.append(name)
+
+
+_SHARED_XOBJECTS = _digester is not None
+
+
+def _draw_shared(c: canvas.Canvas, prepared: PreparedImage) -> bool:
+    """Zeichnet ``prepared`` mit geteiltem Bildstrom – ``False``, wenn das nicht geht."""
+    global _SHARED_XOBJECTS
+    if not _SHARED_XOBJECTS:
+        return False
+    try:
+        xobject = _image_xobject(prepared)
+        if xobject is None:
+            return False
+        _draw_xobject(c, *xobject, prepared.width, prepared.height)
+    except AttributeError as exc:
+        _SHARED_XOBJECTS = False
+        log.warning("reportlab‑Interna nicht verfügbar (%s) – Bilder werden per drawImage eingebettet", exc)
+        return False
+    return True
+
+
+def _image_form(c: canvas.Canvas, prepared: PreparedImage) -> Optional[str]:
+    """Name des Forms mit ``prepared`` – beim ersten Auftreten wird es angelegt."""
+    registry = embedded_images(c)
+    name = registry.forms.get(prepared.digest)
+    if name is not None:
+        registry.reused += 1
+        registry.reused_bytes += prepared.nbytes
+        return name
+    name = f"img_{prepared.digest[:16]}"
+    c.beginForm(name, 0, 0, prepared.width, prepared.height)
+    try:
+        if not _draw_shared(c, prepared):
+            c.drawImage(prepared.source, 0, 0, prepared.width, prepared.height, mask=prepared.mask)
+    except Exception:
+        return None
+    finally:
+        c.endForm()
+    registry.forms[prepared.digest] = name
+    registry.embedded += 1
+    return name
+
+
+def draw_prepared(
+    c: canvas.Canvas,
+    prepared: PreparedImage,
+    x: float,
+    y: float,
+    w: float,
+    h: float,
+) -> bool:
+    """Setzt ein bereits vorbereitetes Bild in die Box – ``False``, wenn es sich nicht einbetten lässt."""
+    with stage("image-embed"):
+        name = _image_form(c, prepared)
+        if name is None:
+            return False
+        # Seitenverhältnis erhalten, zentriert in der Box (wie drawImage mit anchor="c")
+        scale = min(w / prepared.width, h / prepared.height)
+        c.saveState()
+        c.translate(x + (w - prepared.width * scale) / 2, y + (h - prepared.height * scale) / 2)
+        c.scale(scale, scale)
+        c.doForm(name)
+        c.restoreState()
+        return True
+
+
+def draw_bitmap(
+    c: canvas.Canvas,
+    path: Path | bytes,
+    x: float,
+    y: float,
+    w: float,
+    h: float,
+    cache: ImageCache | None = None,
+) -> bool:
+    with stage("image-prepare"):
+        prepared = (cache if cache is not None else IMAGE_CACHE).get(path)
+    if prepared is None:
+        return False
+    return draw_prepared(c, prepared, x, y, w, h)
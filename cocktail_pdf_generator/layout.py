@@ -1,10 +1,24 @@
 from __future__ import annotations
+import logging
 from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
 from reportlab.lib.pagesizes import A5
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
-from .image_utils import draw_bitmap, draw_placeholder, find_glass_image
-from .definition import RecipeData
+from .image_utils import (
+    IMAGE_CACHE,
+    ImageCache,
+    PreparedImage,
+    draw_placeholder,
+    draw_prepared,
+    find_glass_image,
+    is_indexed_file,
+)
+from .definition import Recipe, RecipeData
+from .stats import stage
+from .text_utils import fit_text, string_width, wrap_text
+
+log = logging.getLogger(__name__)
 
 MARGIN   = 12 * mm
 BOX_SIZE = 40 * mm
@@ -12,62 +26,237 @@ PAGE_W, PAGE_H = A5
 
 
 # ---------------------------------------------------------------------------
-# Gemeinsamer Drawer für DIN A5‑Fläche (wird von beiden Generatoren genutzt)
+# Statische Kartenteile – einmal pro Dokument als Form‑XObject
 # ---------------------------------------------------------------------------
 
-def draw_recipe_area(
-    c: canvas.Canvas,
-    area_x: float,
-    area_y: float,
-    recipe: RecipeData,
-    glasses_dir: Path,
-) -> None:
-    """Zeichnet ein Rezept in einen A5‑großen Rechteckbereich (oben‑links = area_x/area_y)."""
+HEADING_FONT = ("Helvetica-Bold", 12)
+
+
+def _heading_form(c: canvas.Canvas, text: str) -> str:
+    """Überschrift als Form (Grundlinie im Ursprung); wird pro Dokument einmal angelegt."""
+    name = f"h_{text}"
+    if not c.hasForm(name):
+        c.beginForm(name, 0, -HEADING_FONT[1], PAGE_W, 2 * HEADING_FONT[1])
+        c.setFont(*HEADING_FONT)
+        c.drawString(0, 0, text)
+        c.endForm()
+    return name
+
+
+def _placeholder_form(c: canvas.Canvas) -> str:
+    """Platzhalter (Rahmen + Kreuz + „Bild fehlt“) in Größe der Bildbox."""
+    name = "placeholder"
+    if not c.hasForm(name):
+        c.beginForm(name, -2, -2, BOX_SIZE + 2, BOX_SIZE + 2)
+        draw_placeholder(c, 0, 0, BOX_SIZE, BOX_SIZE)
+        c.endForm()
+    return name
+
+
+def _place_form(c: canvas.Canvas, name: str, x: float, y: float) -> None:
+    c.saveState()
+    c.translate(x, y)
+    c.doForm(name)
+    c.restoreState()
+
+
+# ---------------------------------------------------------------------------
+# Kartenlayout: einmal berechnen, auf beliebig viele Canvas zeichnen
+# ---------------------------------------------------------------------------
+
+class TextLine(NamedTuple):
+    font: str
+    size: float
+    x: float
+    y: float
+    text: str
+
+
+class TextBlock(NamedTuple):
+    heading: str  # Überschrift (als Form), Grundlinie bei (x, y)
+    x: float
+    y: float
+    lines: Tuple[TextLine, ...]
+
+
+class CardLayout(NamedTuple):
+    """Fertig berechnete Karte, Koordinaten relativ zur linken unteren Ecke der A5‑Fläche.
+
+    ``images`` sind die vorbereiteten Bildkandidaten in Reihenfolge (eigenes Bild,
+    dann Glas); gezeichnet wird der erste, der sich einbetten lässt, sonst der Platzhalter.
+    """
+
+    title: Tuple[TextLine, ...]
+    images: Tuple[PreparedImage, ...]
+    blocks: Tuple[TextBlock, ...]
+
+
+# ---------------------------------------------------------------------------
+# Textsatz: umbrechen und bei Bedarf verkleinern
+# ---------------------------------------------------------------------------
+
+TITLE_FONT = ("Helvetica-Bold", 16)
+TITLE_MIN_SIZE = 11
+BODY_FONT = ("Helvetica", 9)
+BODY_MIN_SIZE = 6
+LEADING = 1.2       # Zeilenabstand umbrochener Zeilen, relativ zur Schriftgröße
+TEXT_GAP = 2 * mm   # Mindestabstand zwischen Text und Bildbox
+
+
+def _text_width(x: float, y: float, size: float) -> float:
+    """Verfügbare Breite ab ``x`` für eine Zeile mit Grundlinie ``y`` – neben der Bildbox schmaler."""
+    box_y = PAGE_H - MARGIN - BOX_SIZE + 3
+    right = PAGE_W - MARGIN - BOX_SIZE - TEXT_GAP if y + size > box_y else PAGE_W - MARGIN
+    return right - x
+
 
-    # Layout für den Bereich (identisch zu create_cocktail_pdf, aber relativ)
-    margin = 12 * mm
-    box_size = 40 * mm
+def _item_lines(
+    items: Sequence[str],
+    prefix: Callable[[int], str],
+    top: float,
+    pitch: float,
+    size: float,
+) -> Tuple[List[TextLine], float]:
+    """Setzt eine Aufzählung unter ``top``; liefert die Zeilen und die letzte Grundlinie.
+
+    Jeder Punkt beginnt ``pitch`` unter dem vorherigen, Folgezeilen hängen hinter dem Präfix.
+    """
+    font = BODY_FONT[0]
+    x = MARGIN + 4 * mm
+    y = top
+    lines: List[TextLine] = []
+    for idx, item in enumerate(items, 1):
+        y -= pitch
+        head = prefix(idx)
+        indent = string_width(font, size, head)
+        wrapped = wrap_text(font, size, f"{head}{item}", _text_width(x, y, size), indent)
+        lines.append(TextLine(font, size, x, y, wrapped[0]))
+        for cont in wrapped[1:]:
+            y -= size * LEADING
+            lines.append(TextLine(font, size, x + indent, y, cont))
+    return lines, y
+
+
+def _body_blocks(recipe: RecipeData | Recipe, top_ing: float) -> Tuple[TextBlock, TextBlock]:
+    """Zutaten und Zubereitung; die Schrift schrumpft, bis alles über den unteren Rand passt."""
+    size = BODY_FONT[1]
+    while True:
+        scale = size / BODY_FONT[1]
+        ingredients, last = _item_lines(recipe["ingredients"], lambda _: "• ", top_ing, 7 * mm * scale, size)
+        top_steps = last - 7 * mm * scale
+        steps, bottom = _item_lines(recipe["steps"], lambda idx: f"{idx}. ", top_steps, 6 * mm * scale, size)
+        if bottom >= MARGIN or size <= BODY_MIN_SIZE:
+            break
+        size = max(BODY_MIN_SIZE, size - 0.5)
+    return (
+        TextBlock("Zutaten", MARGIN, top_ing, tuple(ingredients)),
+        TextBlock("Zubereitung", MARGIN, top_steps, tuple(steps)),
+    )
+
+
+def text_layout(recipe: RecipeData | Recipe) -> Tuple[Tuple[TextLine, ...], Tuple[TextBlock, ...]]:
+    """Titelzeilen und Textblöcke einer Karte – ohne Bilder, daher auch für die Vorabprüfung."""
+    margin = MARGIN
     page_w, page_h = A5
 
-    # Koordinaten relativ zum Bereich
-    def rx(val: float) -> float:  # X-Wert innerhalb der A5‑Fläche
-        return area_x + val
+    font, size = TITLE_FONT
+    size, title_lines = fit_text(
+        font, size, recipe["title"], _text_width(margin, page_h - margin, size), TITLE_MIN_SIZE
+    )
+    title = tuple(
+        TextLine(font, size, margin, page_h - margin - i * size * LEADING, text)
+        for i, text in enumerate(title_lines)
+    )
+    # Zutaten und Zubereitung – ein mehrzeiliger Titel schiebt beides nach unten
+    top_ing = title[-1].y - 12 * mm
+    return title, _body_blocks(recipe, top_ing)
 
-    def ry(val: float) -> float:  # Y-Wert innerhalb der A5‑Fläche
-        return area_y + val
 
-    # Titel
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(rx(margin), ry(page_h - margin), recipe["title"])
+def overflows(blocks: Sequence[TextBlock]) -> bool:
+    """``True``, wenn Text auch in kleinster Schrift über den unteren Rand läuft."""
+    return any(line.y < MARGIN for block in blocks for line in block.lines)
 
-    # Bildbox
-    box_x = rx(page_w - margin - box_size)
-    box_y = ry(page_h - margin - box_size + 3)
-    drawn = False
-    if recipe.get("image_path") and Path(recipe["image_path"]).is_file():
-        drawn = draw_bitmap(c, Path(recipe["image_path"]), box_x, box_y, box_size, box_size)
-    if not drawn and recipe.get("glass"):
+
+def card_layout(recipe: RecipeData | Recipe, glasses_dir: Path, image_cache: ImageCache | None = None) -> CardLayout:
+    """Löst Bilder auf und setzt alle Textzeilen einer Karte – ohne Canvas."""
+    cache = image_cache if image_cache is not None else IMAGE_CACHE
+    title, blocks = text_layout(recipe)
+    if overflows(blocks):
+        log.warning("„%s“ passt auch mit %s pt nicht auf die Karte", recipe["title"], BODY_MIN_SIZE)
+
+    images: List[PreparedImage] = []
+    image = recipe.get("image_path")
+    source: Path | bytes | None = None
+    if isinstance(image, (bytes, bytearray, memoryview)):  # Bilddaten statt Pfad
+        source = bytes(image)
+    elif image and is_indexed_file(Path(image)):
+        source = Path(image)
+    if source is not None:
+        with stage("image-prepare"):
+            prepared = cache.get(source)
+        if prepared is not None:
+            images.append(prepared)
+    if recipe.get("glass"):
         gimg = find_glass_image(recipe["glass"], glasses_dir)
         if gimg:
-            drawn = draw_bitmap(c, gimg, box_x, box_y, box_size, box_size)
-    if not drawn:
-        draw_placeholder(c, box_x, box_y, box_size, box_size)
-
-
-    # Zutaten
-    top_ing = ry(page_h - margin - 12 * mm)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(rx(margin), top_ing, "Zutaten")
-    c.setFont("Helvetica", 9)
-    lh = 7 * mm
-    for i, ing in enumerate(recipe["ingredients"], 1):
-        c.drawString(rx(margin + 4 * mm), top_ing - i * lh, f"• {ing}")
-
-    # Zubereitung
-    top_steps = top_ing - (len(recipe["ingredients"])+1) * lh
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(rx(margin), top_steps, "Zubereitung")
-    c.setFont("Helvetica", 9)
-    sh = 6 * mm
-    for idx, step in enumerate(recipe["steps"], 1):
-        c.drawString(rx(margin + 4 * mm), top_steps - idx * sh, f"{idx}. {step}")
\ No newline at end of file
+            with stage("image-prepare"):
+                prepared = cache.get(gimg)
+            if prepared is not None:
+                images.append(prepared)
+
+    return CardLayout(title, tuple(images), blocks)
+
+
+def draw_card(c: canvas.Canvas, card: CardLayout, area_x: float = 0, area_y: float = 0) -> None:
+    """Zeichnet ein vorab berechnetes ``CardLayout`` (linke untere Ecke = area_x/area_y)."""
+    with stage("text"):
+        font = _draw_lines(c, card.title, None, area_x, area_y)
+
+    # Bildbox
+    box_x = area_x + PAGE_W - MARGIN - BOX_SIZE
+    box_y = area_y + PAGE_H - MARGIN - BOX_SIZE + 3
+    if not any(draw_prepared(c, img, box_x, box_y, BOX_SIZE, BOX_SIZE) for img in card.images):
+        _place_form(c, _placeholder_form(c), box_x, box_y)
+
+    with stage("text"):
+        # Überschriften stecken in Forms und ändern die Schrift des Canvas nicht
+        for block in card.blocks:
+            _place_form(c, _heading_form(c, block.heading), area_x + block.x, area_y + block.y)
+            font = _draw_lines(c, block.lines, font, area_x, area_y)
+
+
+def _draw_lines(
+    c: canvas.Canvas,
+    lines: Sequence[TextLine],
+    font: Optional[Tuple[str, float]],
+    area_x: float,
+    area_y: float,
+) -> Optional[Tuple[str, float]]:
+    """Zeichnet Textzeilen; die Schrift wird nur bei Wechsel gesetzt. Liefert die aktuelle Schrift."""
+    for line in lines:
+        if (line.font, line.size) != font:
+            font = (line.font, line.size)
+            c.setFont(*font)
+        c.drawString(area_x + line.x, area_y + line.y, line.text)
+    return font
+
+
+# ---------------------------------------------------------------------------
+# Gemeinsamer Drawer für DIN A5‑Fläche (wird von beiden Generatoren genutzt)
+# ---------------------------------------------------------------------------
+
+def draw_recipe_area(
+    c: canvas.Canvas,
+    area_x: float,
+    area_y: float,
+    recipe: RecipeData | Recipe | CardLayout,
+    glasses_dir: Path,
+    image_cache: ImageCache | None = None,
+) -> None:
+    """Zeichnet ein Rezept in einen A5‑großen Rechteckbereich (unten‑links = area_x/area_y).
+
+    Bilder kommen aus ``image_cache`` (Standard: prozessweiter ``IMAGE_CACHE``).
+    Ein bereits berechnetes ``CardLayout`` wird direkt gezeichnet.
+    """
+    card = recipe if isinstance(recipe, CardLayout) else card_layout(recipe, glasses_dir, image_cache)
+    draw_card(c, card, area_x, area_y)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import os
+import sys
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from .stats import stage
+
+# Nur Standardbibliothek: Katalog, Manifest und Vorab‑Prüfungen finden Bilder,
+# ohne reportlab oder Pillow zu laden.
+
+__all__ = [
+    "DirectoryIndex",
+    "directory_index",
+    "refresh_directory_indexes",
+    "is_indexed_file",
+    "auto_same_name",
+    "find_glass_image",
+    "resolve_glasses_dir",
+]
+
+GLASS_EXT = (".png", ".jpg", ".jpeg", ".gif")
+
+
+def _normcase(name: str) -> str:
+    """Schlüssel für Dateinamen, wie das Dateisystem sie vergleicht.
+
+    Windows und macOS unterscheiden standardmäßig nicht zwischen Groß‑ und
+    Kleinschreibung – „Tumbler“ findet dort ``tumbler.png`` wie früher ``is_file()``.
+    """
+    return name.lower() if sys.platform == "darwin" else os.path.normcase(name)
+
+
+# ---------------------------------------------------------------------------
+# Verzeichnis‑Index: ein scandir pro Ordner statt einem stat pro Kandidat
+# ---------------------------------------------------------------------------
+
+class DirectoryIndex:
+    """Dateinamen eines Ordners, einmalig per ``os.scandir`` eingelesen.
+
+    Fehlt der Ordner, ist der Index leer. ``refresh()`` liest ihn neu ein.
+    Namen werden wie vom Betriebssystem verglichen (``_normcase``).
+
+    Treffer kosten keinen Systemaufruf. Bei einem Fehltreffer wird die ``mtime`` des
+    Ordners geprüft (ein ``stat``) und der Index bei Änderung neu eingelesen – so
+    finden auch langlebige Prozesse Dateien, die nach dem ersten Zugriff angelegt wurden.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._names: Optional[Dict[str, str]] = None  # normalisiert → Name auf der Platte
+        self._mtime: Optional[int] = None
+
+    def refresh(self) -> None:
+        try:
+            self._mtime = os.stat(self.directory).st_mtime_ns
+            with os.scandir(self.directory) as entries:
+                self._names = {_normcase(e.name): e.name for e in entries if e.is_file()}
+        except OSError:
+            self._mtime = None
+            self._names = {}
+
+    def _stale(self) -> bool:
+        """Hat sich der Ordner seit dem Einlesen geändert?"""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return self._mtime is not None
+        return mtime != self._mtime
+
+    def _lookup(self, *names: str) -> Optional[str]:
+        if self._names is None:
+            self.refresh()
+        for retry in (False, True):
+            for name in names:
+                found = self._names.get(_normcase(name))
+                if found is not None:
+                    return found
+            if retry or not self._stale():
+                return None
+            self.refresh()
+        return None
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._lookup(name) is not None
+
+    def find(self, stem: str, extensions: Tuple[str, ...]) -> Optional[Path]:
+        """Erste vorhandene Datei ``stem + ext`` in der Reihenfolge von ``extensions``."""
+        name = self._lookup(*(f"{stem}{ext}" for ext in extensions))
+        return self.directory / name if name is not None else None
+
+
+_INDEXES: Dict[str, DirectoryIndex] = {}
+_INDEX_LOCK = Lock()
+
+
+def directory_index(directory: Path) -> DirectoryIndex:
+    """Prozessweiter Index für ``directory`` – wird beim ersten Zugriff aufgebaut."""
+    key = os.path.abspath(directory)
+    with _INDEX_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = DirectoryIndex(Path(key))
+        return index
+
+
+def refresh_directory_indexes() -> None:
+    """Verwirft alle Indizes; sie werden beim nächsten Zugriff neu eingelesen.
+
+    Die Generatoren rufen das zu Beginn jedes Laufs auf – langlebige Prozesse,
+    die ``find_glass_image`` & Co. direkt nutzen, sollten es nach Änderungen tun.
+    """
+    with _INDEX_LOCK:
+        _INDEXES.clear()
+
+
+def is_indexed_file(path: Path) -> bool:
+    """``path.is_file()`` über den Index des Elternordners."""
+    return path.name in directory_index(path.parent)
+
+
+# ---------------------------------------------------------------------------
+# Bildsuche: gleichnamiges Bild bzw. Glasbild
+# ---------------------------------------------------------------------------
+
+SAME_NAME_EXT = (".jpg", ".jpeg", ".png", ".gif")
+
+
+def auto_same_name(base: Path) -> Optional[Path]:
+    with stage("lookup"):
+        return directory_index(base.parent).find(base.stem, SAME_NAME_EXT)
+
+
+def resolve_glasses_dir(glasses_dir: str | Path | None) -> Path:
+    """``glasses_dir`` oder – ohne Angabe – der mitgelieferte ``glasses``‑Ordner neben dem Paket."""
+    return Path(glasses_dir) if glasses_dir else Path(__file__).resolve().parent.parent / "glasses"
+
+
+def find_glass_image(glass: str, gdir: Path) -> Optional[Path]:
+    with stage("lookup"):
+        return directory_index(gdir).find(glass, GLASS_EXT)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from .lookup import auto_same_name, find_glass_image
+
+if TYPE_CHECKING:
+    from .image_utils import ImageCache
+
+MANIFEST_NAME = ".cocktail-manifest.json"
+MANIFEST_VERSION = 1
+
+# Module, deren Quelltext das Aussehen einer Karte bestimmt
+_LAYOUT_MODULES = (
+    "layout.py",
+    "image_utils.py",
+    "lookup.py",
+    "text_utils.py",
+    "recipe_loader.py",
+    "pdf_double_a4.py",
+    "quadrupel_a4_sheet.py",
+)
+
+_layout_signature: Optional[str] = None
+
+
+def layout_signature() -> str:
+    """Hash über alle Layout‑Parameter (Quelltext der Zeichenmodule) – einmal pro Prozess."""
+    global _layout_signature
+    if _layout_signature is None:
+        h = hashlib.sha1()
+        pkg = Path(__file__).resolve().parent
+        for name in _LAYOUT_MODULES:
+            h.update((pkg / name).read_bytes())
+        _layout_signature = h.hexdigest()
+    return _layout_signature
+
+
+def image_settings(image_cache: ImageCache | None = None) -> str:
+    """Bildeinstellungen (Ziel‑DPI, Boxgröße, Kodierung) von ``image_cache`` bzw. ``IMAGE_CACHE``.
+
+    Leer bei Standardwerten – die stehen im Quelltext und damit schon in der
+    ``layout_signature``. Ist ``image_utils`` noch nicht geladen, kann niemand die
+    Werte geändert haben; so bleibt ein Lauf ohne Änderungen ohne reportlab‑Import.
+    """
+    if image_cache is None:
+        utils = sys.modules.get(f"{__package__}.image_utils")
+        if utils is None:
+            return ""
+        image_cache = utils.IMAGE_CACHE
+    return image_cache.settings_key()
+
+
+# ---------------------------------------------------------------------------
+# Manifest im Ausgabeordner
+# ---------------------------------------------------------------------------
+
+class BuildManifest:
+    """Merkt sich pro Ausgabedatei einen Fingerabdruck aller Eingaben.
+
+    Dateihashes werden über ``(mtime, Größe)`` zwischengespeichert, damit ein
+    Lauf ohne Änderungen nur ``stat``‑Aufrufe kostet und nichts neu einliest.
+    """
+
+    def __init__(self, out_dir: Path, data: Dict[str, Any] | None = None) -> None:
+        self.out_dir = out_dir
+        self.path = out_dir / MANIFEST_NAME
+        data = data if data and data.get("version") == MANIFEST_VERSION else {}
+        self.outputs: Dict[str, Dict[str, Any]] = data.get("outputs", {})
+        self.files: Dict[str, Dict[str, Any]] = data.get("files", {})
+
+    @classmethod
+    def load(cls, out_dir: str | Path) -> "BuildManifest":
+        out_dir = Path(out_dir)
+        try:
+            data = json.loads((out_dir / MANIFEST_NAME).read_text("utf-8"))
+        except (OSError, ValueError):
+            data = None
+        return cls(out_dir, data)
+
+    def save(self) -> None:
+        data = {"version": MANIFEST_VERSION, "outputs": self.outputs, "files": self.files}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, sort_keys=True), "utf-8")
+        tmp.replace(self.path)
+
+    # -- Dateihashes --------------------------------------------------------
+
+    def _file_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        entry = self.files.get(key)
+        if entry is None or entry["stat"] != [st.st_mtime_ns, st.st_size]:
+            data = path.read_bytes()
+            entry = {"stat": [st.st_mtime_ns, st.st_size], "sha": hashlib.sha1(data).hexdigest()}
+            if path.suffix == ".json":
+                # Bildangaben merken, damit unveränderte JSONs nicht geparst werden müssen
+                try:
+                    parsed = json.loads(data.decode("utf-8"))
+                    entry["image_path"] = parsed.get("image_path")
+                    entry["glass"] = parsed.get("glass")
+                except (ValueError, AttributeError):
+                    pass
+            self.files[key] = entry
+        return entry
+
+    def file_hash(self, path: Path) -> Optional[str]:
+        entry = self._file_entry(path)
+        return entry["sha"] if entry else None
+
+    # -- Fingerabdrücke -----------------------------------------------------
+
+    def recipe_fingerprint(
+        self,
+        js: Path,
+        glasses_dir: Path,
+        same_name: bool = True,
+        image_cache: ImageCache | None = None,
+    ) -> str:
+        """Fingerabdruck aus JSON, aufgelösten Bild‑/Glasdateien, Layout‑Signatur und Bildeinstellungen."""
+        entry = self._file_entry(js)
+        h = hashlib.sha1(layout_signature().encode())
+        settings = image_settings(image_cache)
+        if settings:
+            h.update(settings.encode())
+        h.update(str(js).encode())
+        if entry is None:
+            return h.hexdigest()
+        h.update(entry["sha"].encode())
+        assets: List[Path] = []
+        image_path = entry.get("image_path")
+        if image_path:
+            assets.append(Path(image_path))
+        elif same_name:
+            auto_img = auto_same_name(js)
+            if auto_img:
+                assets.append(auto_img)
+        if entry.get("glass"):
+            gimg = find_glass_image(entry["glass"], glasses_dir)
+            if gimg:
+                assets.append(gimg)
+        for asset in assets:
+            h.update(f"{asset}:{self.file_hash(asset)}".encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def combine(*parts: str) -> str:
+        return hashlib.sha1("\0".join(parts).encode()).hexdigest()
+
+    # -- Ausgaben -----------------------------------------------------------
+
+    def is_current(self, output: Path, fingerprint: str) -> bool:
+        entry = self.outputs.get(output.name)
+        return bool(entry) and entry["fingerprint"] == fingerprint and output.is_file()
+
+    def record(self, output: Path, fingerprint: str, source: Path | None = None) -> None:
+        self.outputs[output.name] = {"fingerprint": fingerprint, "source": str(source) if source else None}
+
+    def prune(self, recipes_folder: Path, keep: Iterable[Path]) -> List[Path]:
+        """Löscht Ausgaben, deren Quell‑JSON aus ``recipes_folder`` verschwunden ist."""
+        keep_names = {p.name for p in keep}
+        removed: List[Path] = []
+        for name, entry in list(self.outputs.items()):
+            source = entry.get("source")
+            if not source or Path(source).parent != recipes_folder or name in keep_names:
+                continue
+            if Path(source).exists():
+                continue
+            out = self.out_dir / name
+            out.unlink(missing_ok=True)
+            del self.outputs[name]
+            self.files.pop(source, None)
+            removed.append(out)
+        return removed
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import io
+import logging
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional
+
+__all__ = ["SizeBreakdown", "optimized_output", "pdf_size_breakdown", "log_size_breakdown"]
+
+log = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Optimierungsmodus
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def optimized_output(enabled: bool = True) -> Iterator[None]:
+    """Binäre Streams statt ASCII85 für alles, was im Block gezeichnet und gespeichert wird.
+
+    ASCII85 macht jeden Bild‑ und Seitenstrom 25 % größer. reportlab liest
+    ``rl_config.useA85`` global beim Anlegen der Bilder und beim Speichern – die
+    Einstellung gilt daher prozessweit für die Dauer des Blocks (andere Canvas
+    werden dadurch nur kleiner, nie ungültig). Bilder werden zusätzlich mit
+    maximaler Flate‑Stufe kodiert (siehe ``image_utils``).
+    """
+    if not enabled:
+        yield
+        return
+    from reportlab import rl_config
+
+    previous = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = previous
+
+
+# ---------------------------------------------------------------------------
+# Größenaufschlüsselung
+# ---------------------------------------------------------------------------
+
+class SizeBreakdown(NamedTuple):
+    images: int = 0    # Bild‑XObjects
+    fonts: int = 0     # Schriftobjekte und eingebettete Schriftdateien
+    content: int = 0   # Seiten‑ und Form‑Inhaltsströme
+    overhead: int = 0  # Seitenbaum, Metadaten, xref, Trailer …
+
+    @property
+    def total(self) -> int:
+        return self.images + self.fonts + self.content + self.overhead
+
+    def __add__(self, other: object) -> "SizeBreakdown":
+        if not isinstance(other, SizeBreakdown):
+            return NotImplemented
+        return SizeBreakdown(*(a + b for a, b in zip(self, other)))
+
+    def report(self) -> str:
+        total = self.total or 1
+        parts = ", ".join(
+            f"{label} {value / 1024:.1f} KB ({value * 100 / total:.0f} %)"
+            for label, value in zip(("Bilder", "Schriften", "Inhalt", "Overhead"), self)
+        )
+        return f"{self.total / 1024:.1f} KB – {parts}"
+
+
+_OBJECT = re.compile(rb"\d+ \d+ obj\b(.*?)endobj", re.S)
+_IMAGE = re.compile(rb"/Subtype\s*/Image\b")
+_FONT = re.compile(rb"/Type\s*/(?:Font|FontDescriptor)\b|/FontFile[23]?\b")
+
+
+def pdf_size_breakdown(data: bytes) -> SizeBreakdown:
+    """Ordnet die Bytes eines PDFs den Kategorien zu (alles Übrige zählt als Overhead).
+
+    Genügt für die hier erzeugten PDFs ohne Object‑Streams; Objekte in einem
+    Object‑Stream würden dem Inhalt zugerechnet.
+    """
+    images = fonts = content = 0
+    for match in _OBJECT.finditer(data):
+        size = match.end() - match.start()
+        body = match.group(1)
+        head = body.split(b"stream", 1)[0]
+        if _IMAGE.search(head):
+            images += size
+        elif _FONT.search(head):
+            fonts += size
+        elif b"stream" in body:
+            content += size
+    return SizeBreakdown(images, fonts, content, len(data) - images - fonts - content)
+
+
+def _read_back(target: Path | BinaryIO) -> Optional[bytes]:
+    if isinstance(target, Path):
+        return target.read_bytes()
+    if isinstance(target, io.BytesIO):
+        return target.getvalue()
+    return None  # fremder Stream – nicht zurücklesbar
+
+
+def log_size_breakdown(label: str, targets: Iterable[Path | BinaryIO]) -> Optional[SizeBreakdown]:
+    """Schreibt die (summierte) Aufschlüsselung der fertigen PDFs ins Log und gibt sie zurück."""
+    total: Optional[SizeBreakdown] = None
+    count = 0
+    for target in targets:
+        data = _read_back(target)
+        if data is None:
+            continue
+        part = pdf_size_breakdown(data)
+        total = part if total is None else total + part
+        count += 1
+    if total is not None:
+        suffix = f" ({count} PDFs)" if count > 1 else ""
+        log.info("%s%s: %s", label, suffix, total.report())
+    return total
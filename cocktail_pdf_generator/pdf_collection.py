@@ -0,0 +1,166 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+from .catalogue import RecipeCatalogue, is_catalogue
+from .definition import RecipeData
+from .lookup import auto_same_name, refresh_directory_indexes, resolve_glasses_dir
+from .manifest import BuildManifest
+from .progress import DRAWN, FAILED, LOADED, PAGE, SAVED, Progress, ProgressCallback, RenderCancelled
+from .recipe_loader import RecipeBatchError, load_recipe_json, recipe_files
+from .stats import stage
+
+if TYPE_CHECKING:
+    from threading import Event
+    from .image_utils import ImageCache
+
+
+# ---------------------------------------------------------------------------
+# Sammel‑PDF: jedes Rezept als eigene A5‑Seite, in einem Durchgang
+# ---------------------------------------------------------------------------
+
+def generate_collection_pdf(
+    recipes_folder: str | Path,
+    output_path: str | Path,
+    glasses_dir: str | Path | None = None,
+    split_dir: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    incremental: bool = False,
+    query: str | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> Path:
+    """Schreibt alle Rezepte (alphabetisch) als A5‑Seiten in **ein** PDF.
+
+    ``recipes_folder`` darf auch eine Katalogdatei (``compile_catalogue``) sein.
+
+    Mit ``split_dir`` entsteht im selben Durchgang zusätzlich ein Einzel‑PDF pro
+    Rezept: JSON und Bild werden nur einmal geladen, die Karte einmal berechnet und
+    auf beide Canvas gezeichnet. Mit ``incremental`` wird das Sammel‑PDF bei jeder
+    Änderung neu geschrieben, unveränderte Einzel‑PDFs bleiben dagegen liegen.
+    Das ersetzt das nachträgliche Zusammenfügen der Einzel‑PDFs mit PyPDF2.
+    Fehlerhafte Rezepte werden übersprungen und am Ende per ``RecipeBatchError`` gemeldet.
+    ``query`` beschränkt die Sammlung auf passende Rezepte (siehe ``RecipeIndex.query``).
+
+    ``progress`` erhält ``ProgressEvent``s je Karte und Datei. Wird ``cancel`` gesetzt,
+    endet der Lauf nach der aktuellen Karte mit ``RenderCancelled``: Das Sammel‑PDF
+    wird nicht geschrieben, bereits erzeugte Einzel‑PDFs bleiben (und im Manifest).
+    """
+
+    recipes_folder = Path(recipes_folder).expanduser().resolve()
+    output_path = Path(output_path).expanduser().resolve()
+    split_path = Path(split_dir).expanduser().resolve() if split_dir else None
+    if split_path is not None:
+        split_path.mkdir(parents=True, exist_ok=True)
+    glasses_dir_path = resolve_glasses_dir(glasses_dir)
+    refresh_directory_indexes()
+
+    from_catalogue = is_catalogue(recipes_folder)
+    if from_catalogue and incremental:
+        raise ValueError("incremental=True benötigt einen Rezeptordner")
+    if from_catalogue and query is not None:
+        raise ValueError("query benötigt einen Rezeptordner")
+    jsons = [] if from_catalogue else recipe_files(recipes_folder, query)
+    targets = [split_path / f"{js.stem}.pdf" for js in jsons] if split_path else []
+
+    manifest = BuildManifest.load(output_path.parent) if incremental else None
+    split_manifest = None
+    if manifest is not None and split_path is not None:
+        split_manifest = manifest if split_path == output_path.parent else BuildManifest.load(split_path)
+    if manifest is not None:
+        fingerprints = [manifest.recipe_fingerprint(js, glasses_dir_path, image_cache=image_cache) for js in jsons]
+        fingerprint = manifest.combine("collection", *fingerprints)
+        if manifest.is_current(output_path, fingerprint) and (
+            split_manifest is None
+            or all(split_manifest.is_current(t, fp) for t, fp in zip(targets, fingerprints))
+        ):
+            return output_path
+
+    def entries() -> Iterator[Tuple[Path, RecipeData | Exception]]:
+        if from_catalogue:
+            with RecipeCatalogue(recipes_folder) as catalogue:
+                for name, rec in catalogue.items(same_name=True):
+                    yield Path(f"{name}.json"), rec
+            return
+        for js in jsons:
+            try:
+                rec = load_recipe_json(js)
+            except Exception as exc:
+                yield js, exc
+                continue
+            auto_img = auto_same_name(js)
+            if not rec.get("image_path") and auto_img:
+                rec["image_path"] = str(auto_img)
+            yield js, rec
+
+    # Zeichenmodule erst laden, wenn wirklich gerendert wird
+    from reportlab.lib.pagesizes import A5
+    from reportlab.pdfgen import canvas
+    from .layout import card_layout, draw_card
+
+    if from_catalogue:
+        with RecipeCatalogue(recipes_folder) as catalogue:
+            total = len(catalogue)
+    else:
+        total = len(jsons)
+    tracker = Progress(progress, cancel, total)
+
+    c = canvas.Canvas(str(output_path), pagesize=A5)
+    failures: List[Tuple[Path, BaseException]] = []
+    written: List[Path] = []
+    pages = 0
+    cancelled = False
+    for idx, (js, rec) in enumerate(entries()):
+        if tracker.cancelled:
+            cancelled = True
+            break
+        if isinstance(rec, Exception):
+            failures.append((js, rec))
+            tracker.emit(FAILED, js)
+            continue
+        try:
+            card = card_layout(rec, glasses_dir_path, image_cache)
+        except Exception as exc:
+            failures.append((js, exc))
+            tracker.emit(FAILED, None if from_catalogue else js)
+            continue
+        tracker.emit(LOADED, None if from_catalogue else js)
+
+        if pages:
+            c.showPage()
+        draw_card(c, card)
+        pages += 1
+        tracker.emit(DRAWN)
+        tracker.emit(PAGE)
+
+        if split_path is not None:
+            target = split_path / f"{js.stem}.pdf"
+            if split_manifest is not None and split_manifest.is_current(target, fingerprints[idx]):
+                written.append(target)  # unverändert – vorhandenes Einzel‑PDF behalten
+                continue
+            single = canvas.Canvas(str(target), pagesize=A5)
+            draw_card(single, card)
+            with stage("save"):
+                single.save()
+            written.append(target)
+            tracker.emit(SAVED, target)
+            if split_manifest is not None:
+                split_manifest.record(target, fingerprints[idx], js)
+    if cancelled:
+        if split_manifest is not None:
+            split_manifest.save()
+        raise RenderCancelled(written)
+    with stage("save"):
+        c.save()
+    tracker.emit(SAVED, output_path)
+
+    if manifest is not None and not failures:
+        manifest.record(output_path, fingerprint)
+    if split_manifest is not None:
+        split_manifest.prune(recipes_folder, targets)
+        if split_manifest is not manifest:
+            split_manifest.save()
+    if manifest is not None:
+        manifest.save()
+    if failures:
+        raise RecipeBatchError(failures, [output_path, *written])
+    return output_path
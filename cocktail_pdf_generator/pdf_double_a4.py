@@ -1,44 +1,48 @@
 from __future__ import annotations
 from pathlib import Path
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4, A5
-from reportlab.lib.units import mm
-from .layout import draw_recipe_area
-from .recipe_loader import load_recipe_json, RecipeData
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Sequence
+from .definition import Recipe
+from .recipe_loader import PdfOutput, RecipeData
 
-MARGIN_H = 10 * mm
-MARGIN_V = 10 * mm
-GAP      = 8 * mm
+if TYPE_CHECKING:
+    from threading import Event
+    from reportlab.pdfgen import canvas
+    from .image_utils import ImageCache
+    from .layout import CardLayout
+    from .progress import ProgressCallback
+
+_MM = 72 / 25.4  # pt je mm (= reportlab.lib.units.mm) – reportlab erst beim Zeichnen laden
+
+MARGIN_H = 10 * _MM
+MARGIN_V = 10 * _MM
+GAP      = 8 * _MM
 
 
 def _compute_scale(page_w: float) -> float:
     """Skalierung, damit gedrehte A5‑Breite (210 mm) in A4‑Breite passt."""
+    from reportlab.lib.pagesizes import A5
+
     return (page_w - 2 * MARGIN_H) / A5[1]
 
 
 # ---------------------------------------------------------------------------
-# Neue Funktion: alle Rezepte paarweise auf DIN A4
+# Eine A4‑Seite: bis zu zwei gedrehte A5‑Blöcke übereinander
 # ---------------------------------------------------------------------------
 
-def generate_double_a4_sheet(
-    recipes_folder: str | Path,
-    output_path: str | Path,
-    glasses_dir: str | Path | None = None,
-) -> Path:
-    """DIN-A4-PDF mit **zwei quer liegenden A5-Rezepten**, jetzt wirklich volle Breite.
-
-    • Dreht den A5-Block um **+90 °** (Uhrzeigersinn) – Breite = 210 mm.
-    • Skalierung wird nur von der **Breite** bestimmt (10 mm Seitenrand). 
-    • Blöcke werden linksbündig gesetzt; nichts ragt mehr aus der Seite.
-    """
+RECIPES_PER_PAGE = 2
 
-    recipes_folder = Path(recipes_folder).expanduser().resolve()
-    output_path = Path(output_path).expanduser().resolve()
-    glasses_dir_path = Path(glasses_dir) if glasses_dir else Path(__file__).resolve().parent.parent / "glasses"
 
-    recipes = [load_recipe_json(j) for j in sorted(recipes_folder.glob("*.json"))]
+def draw_double_a4_page(
+    c: canvas.Canvas,
+    recipes: Sequence[RecipeData | Recipe | CardLayout],
+    glasses_dir: Path,
+    image_cache: ImageCache | None = None,
+) -> None:
+    """Zeichnet bis zu ``RECIPES_PER_PAGE`` Rezepte auf die aktuelle Seite (oben, unten)."""
+    from .layout import draw_recipe_area
+    from reportlab.lib.pagesizes import A4, A5
+    from reportlab.lib.units import mm
 
-    c = canvas.Canvas(str(output_path), pagesize=A4)
     page_w, page_h = A4  # ~595 × 842 pt
 
     margin_h = 10 * mm
@@ -61,11 +65,7 @@ def generate_double_a4_sheet(
     y_top  = page_h - margin_v - block_h
     y_bottom = margin_v
 
-    for idx, rec in enumerate(recipes):
-        slot = idx % 2  # 0 oben, 1 unten
-        if slot == 0 and idx > 0:
-            c.showPage()
-
+    for slot, rec in enumerate(recipes):  # 0 oben, 1 unten
         y_off = y_top if slot == 0 else y_bottom
 
         c.saveState()
@@ -75,8 +75,39 @@ def generate_double_a4_sheet(
         c.scale(scale, scale)
         # Nach Drehung liegt Ursprungs-(0,0) links-unten; wir brauchen links-oben
         c.translate(0, -A5[1])
-        draw_recipe_area(c, 0, 0, rec, glasses_dir_path)
+        draw_recipe_area(c, 0, 0, rec, glasses_dir, image_cache)
         c.restoreState()
 
-    c.save()
-    return output_path
\ No newline at end of file
+
+# ---------------------------------------------------------------------------
+# Neue Funktion: alle Rezepte paarweise auf DIN A4
+# ---------------------------------------------------------------------------
+
+def generate_double_a4_sheet(
+    recipes_folder: str | Path | Iterable[RecipeData | Recipe],
+    output_path: PdfOutput,
+    glasses_dir: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    incremental: bool = False,
+    optimize: bool = False,
+    query: str | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+    workers: int | None = None,
+) -> Path | BinaryIO | bytes:
+    """DIN-A4-PDF mit **zwei quer liegenden A5-Rezepten**, jetzt wirklich volle Breite.
+
+    • Dreht den A5-Block um **+90 °** (Uhrzeigersinn) – Breite = 210 mm.
+    • Skalierung wird nur von der **Breite** bestimmt (10 mm Seitenrand). 
+    • Blöcke werden linksbündig gesetzt; nichts ragt mehr aus der Seite.
+
+    Eingaben und Optionen (Katalog/Iterable, Stream‑Ausgabe, ``incremental``,
+    ``optimize``, ``query``, ``progress``/``cancel``, ``workers``) wie bei
+    ``pdf_parts._generate_sheet``.
+    """
+    from .pdf_parts import _generate_sheet  # pdf_parts importiert dieses Modul
+
+    return _generate_sheet(
+        "double", recipes_folder, output_path, glasses_dir, image_cache,
+        incremental, optimize, query, progress, cancel, workers,
+    )
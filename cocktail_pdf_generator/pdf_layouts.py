@@ -0,0 +1,173 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Optional, Tuple
+from .catalogue import RecipeCatalogue, is_catalogue
+from .definition import RecipeData
+from .lookup import auto_same_name, refresh_directory_indexes, resolve_glasses_dir
+from .recipe_loader import RecipeBatchError, load_recipe_json, recipe_files
+from .stats import stage
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+    from .image_utils import ImageCache
+    from .layout import CardLayout
+    from .pdf_parts import SheetKind
+
+__all__ = ["LayoutOutputs", "generate_layouts"]
+
+
+class LayoutOutputs(NamedTuple):
+    singles: List[Path]            # ein A5‑PDF pro Rezept (leer, wenn nicht angefordert)
+    collection: Optional[Path]     # alle Rezepte als A5‑Seiten
+    double: Optional[Path]         # 2 Rezepte quer pro A4‑Seite
+    quadruple: Optional[Path]      # 4 Rezepte im 2×2‑Raster pro A4‑Seite
+
+
+# ---------------------------------------------------------------------------
+# Ein Bogen‑PDF, das Karte für Karte befüllt wird
+# ---------------------------------------------------------------------------
+
+class _SheetWriter:
+    """Sammelt Karten bis eine A4‑Seite voll ist und zeichnet sie dann."""
+
+    def __init__(self, kind: SheetKind, path: Path, glasses_dir: Path) -> None:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        self.kind = kind
+        self.path = path
+        self.glasses_dir = glasses_dir
+        self.canvas: canvas.Canvas = canvas.Canvas(str(path), pagesize=A4)
+        self.pending: List[CardLayout] = []
+        self.pages = 0
+
+    def add(self, card: CardLayout) -> None:
+        self.pending.append(card)
+        if len(self.pending) == self.kind.per_page:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        if self.pages:
+            self.canvas.showPage()
+        self.kind.draw_page(self.canvas, self.pending, self.glasses_dir)
+        self.pages += 1
+        self.pending = []
+
+    def save(self) -> Path:
+        self.flush()
+        with stage("save"):
+            self.canvas.save()
+        return self.path
+
+
+# ---------------------------------------------------------------------------
+# Alle Layouts in einem Durchgang
+# ---------------------------------------------------------------------------
+
+def generate_layouts(
+    recipes_folder: str | Path,
+    glasses_dir: str | Path | None = None,
+    singles_dir: str | Path | None = None,
+    collection_path: str | Path | None = None,
+    double_path: str | Path | None = None,
+    quadruple_path: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    query: str | None = None,
+) -> LayoutOutputs:
+    """Erzeugt beliebige Kombinationen aus Einzel‑PDFs, Sammel‑PDF, 2er‑ und 4er‑Bogen.
+
+    Jedes Rezept wird genau einmal geladen und als ``CardLayout`` berechnet (Bilder
+    aufgelöst und vorbereitet, Textzeilen gesetzt); diese Karte wird dann in alle
+    angeforderten Ausgaben platziert. Das Ergebnis ist identisch mit den einzelnen
+    Generatoren – auch bei der Bildwahl: Einzel‑ und Sammel‑PDF nutzen gleichnamige
+    Bilder, die Bögen nicht.
+
+    ``recipes_folder`` darf auch eine Katalogdatei (``compile_catalogue``) sein, ``query``
+    beschränkt einen Ordner auf passende Rezepte (siehe ``RecipeIndex.query``).
+    Fehlerhafte Rezepte werden übersprungen und am Ende per ``RecipeBatchError`` gemeldet.
+    """
+    recipes_folder = Path(recipes_folder).expanduser().resolve()
+    glasses_dir_path = resolve_glasses_dir(glasses_dir)
+    split_path = Path(singles_dir).expanduser().resolve() if singles_dir else None
+    if split_path is not None:
+        split_path.mkdir(parents=True, exist_ok=True)
+    refresh_directory_indexes()
+    if query is not None and is_catalogue(recipes_folder):
+        raise ValueError("query benötigt einen Rezeptordner")
+
+    def entries() -> Iterator[Tuple[Path, RecipeData | Exception, Optional[str]]]:
+        if is_catalogue(recipes_folder):
+            with RecipeCatalogue(recipes_folder) as catalogue:
+                for name, rec, auto_image in catalogue.entries():
+                    yield Path(f"{name}.json"), rec, auto_image
+            return
+        for js in recipe_files(recipes_folder, query):
+            try:
+                rec = load_recipe_json(js)
+            except Exception as exc:
+                yield js, exc, None
+                continue
+            auto_img = auto_same_name(js)
+            yield js, rec, str(auto_img) if auto_img else None
+
+    # Zeichenmodule erst laden, wenn wirklich gerendert wird
+    from reportlab.lib.pagesizes import A5
+    from reportlab.pdfgen import canvas
+    from .layout import card_layout, draw_card
+    from .pdf_parts import SHEET_KINDS
+
+    def out(path: str | Path | None) -> Optional[Path]:
+        return Path(path).expanduser().resolve() if path else None
+
+    collection = None
+    if collection_path:
+        collection = canvas.Canvas(str(out(collection_path)), pagesize=A5)
+    sheets = {
+        kind: _SheetWriter(SHEET_KINDS[kind], path, glasses_dir_path)
+        for kind, path in (("double", out(double_path)), ("quadruple", out(quadruple_path)))
+        if path is not None
+    }
+    wants_a5 = split_path is not None or collection is not None
+
+    failures: List[Tuple[Path, BaseException]] = []
+    singles: List[Path] = []
+    pages = 0
+    for js, rec, auto_image in entries():
+        if isinstance(rec, Exception):
+            failures.append((js, rec))
+            continue
+        try:
+            card = card_layout(rec, glasses_dir_path, image_cache)
+            a5_card = card
+            if wants_a5 and auto_image and not rec.get("image_path"):
+                # Nur die Bildwahl unterscheidet sich; vorbereitete Bilder kommen aus dem Cache
+                a5_card = card_layout({**rec, "image_path": auto_image}, glasses_dir_path, image_cache)
+        except Exception as exc:
+            failures.append((js, exc))
+            continue
+
+        if collection is not None:
+            if pages:
+                collection.showPage()
+            draw_card(collection, a5_card)
+            pages += 1
+        if split_path is not None:
+            target = split_path / f"{js.stem}.pdf"
+            single = canvas.Canvas(str(target), pagesize=A5)
+            draw_card(single, a5_card)
+            with stage("save"):
+                single.save()
+            singles.append(target)
+        for sheet in sheets.values():
+            sheet.add(card)
+
+    if collection is not None:
+        with stage("save"):
+            collection.save()
+    written = {kind: sheet.save() for kind, sheet in sheets.items()}
+    result = LayoutOutputs(singles, out(collection_path), written.get("double"), written.get("quadruple"))
+    if failures:
+        raise RecipeBatchError(failures, [*singles, *(p for p in result[1:] if p is not None)])
+    return result
@@ -0,0 +1,338 @@
+from __future__ import annotations
+import logging
+from collections import deque
+from importlib.util import find_spec
+from itertools import islice
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, BinaryIO, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Sized, Tuple
+from .catalogue import RecipeCatalogue, is_catalogue
+from .definition import Recipe, RecipeData
+from .lookup import refresh_directory_indexes, resolve_glasses_dir
+from .manifest import BuildManifest
+from .optimize import log_size_breakdown, optimized_output
+from .pdf_double_a4 import RECIPES_PER_PAGE as DOUBLE_PER_PAGE, draw_double_a4_page
+from .progress import DRAWN, LOADED, PAGE, SAVED, Progress, ProgressCallback
+from .quadrupel_a4_sheet import RECIPES_PER_PAGE as QUADRUPLE_PER_PAGE, draw_quadruple_a4_page
+from .recipe_loader import PdfOutput, iter_recipes, pdf_result, pdf_target, recipe_files
+from .stats import stage
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from threading import Event
+    from PyPDF2.generic import IndirectObject
+    from .image_utils import ImageCache
+
+__all__ = ["CHUNK_PAGES", "SheetKind", "SHEET_KINDS", "can_stitch", "render_sheet_part", "render_sheet_parallel", "stitch_pdfs"]
+
+log = logging.getLogger(__name__)
+
+CHUNK_PAGES = 200  # höchstens so viele Bogenseiten je Teil‑PDF beim parallelen Rendern
+
+
+# ---------------------------------------------------------------------------
+# Bogenarten: wie viele Rezepte pro A4‑Seite und wer sie zeichnet
+# ---------------------------------------------------------------------------
+
+class SheetKind(NamedTuple):
+    per_page: int
+    draw_page: Callable[..., None]
+
+
+SHEET_KINDS: Dict[str, SheetKind] = {
+    "double": SheetKind(DOUBLE_PER_PAGE, draw_double_a4_page),
+    "quadruple": SheetKind(QUADRUPLE_PER_PAGE, draw_quadruple_a4_page),
+}
+
+
+def render_sheet_part(
+    kind: str,
+    recipes: Sequence[RecipeData | Recipe],
+    output_path: Path,
+    glasses_dir: Path,
+    image_cache: ImageCache | None = None,
+) -> Path:
+    """Rendert **eine** Bogenseite als eigenes PDF (atomar über eine Temp‑Datei)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    tmp = output_path.with_suffix(".tmp")
+    c = canvas.Canvas(str(tmp), pagesize=A4)
+    SHEET_KINDS[kind].draw_page(c, recipes, glasses_dir, image_cache)
+    with stage("save"):
+        c.save()
+    tmp.replace(output_path)
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Zusammenfügen – PyPDF2 ist optional und wird erst hier geladen (~50 ms Import)
+# ---------------------------------------------------------------------------
+
+def can_stitch() -> bool:
+    return find_spec("PyPDF2") is not None
+
+
+def stitch_pdfs(parts: Sequence[Path], output_path: Path | BinaryIO, share_forms: bool = True) -> Path | BinaryIO:
+    """Hängt die Seiten von ``parts`` in Reihenfolge aneinander (Ziel: Pfad oder Binär‑Stream).
+
+    Seiteninhalte werden unverändert übernommen (kein erneutes Rendern). Mit
+    ``share_forms`` landet jedes Form‑XObject der Seitenebene nur einmal im Ergebnis
+    (gleicher Name → erstes Vorkommen). Die Formulare dieses Pakets sind nach dem
+    benannt, was sie zeichnen: ``img_<sha1 der Bildbytes>``, ``h_<Text>`` und der
+    Platzhalter. Bei Überschriften und Platzhalter gilt das nur für Teile aus
+    demselben Layout; Teile verschiedener Layout‑Versionen oder fremde PDFs mit
+    ``share_forms=False`` zusammenfügen.
+    """
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+        from PyPDF2.generic import NameObject
+    except ModuleNotFoundError:
+        raise RuntimeError("Zum Zusammenfügen von Teil‑PDFs wird PyPDF2 benötigt (pip install PyPDF2)") from None
+    writer = PdfWriter()
+    forms: Dict[str, IndirectObject] = {}
+    # Reader bis zum Schreiben behalten: PyPDF2 ordnet geklonte Objekte über
+    # id(reader) zu, ein wiederverwendetes id() würde fremde Objekte liefern
+    readers = [PdfReader(str(part)) for part in parts]
+    for reader in readers:
+        for page in reader.pages:
+            xobjects = page["/Resources"].get("/XObject") if share_forms else None
+            if xobjects is not None:
+                xobjects = xobjects.get_object()
+                for name in list(xobjects):
+                    if name in forms:
+                        xobjects[NameObject(name)] = forms[name]
+            added = writer.add_page(page)
+            if xobjects is not None:
+                for name, ref in added["/Resources"]["/XObject"].get_object().items():
+                    forms.setdefault(name, ref)
+    if not isinstance(output_path, Path):
+        with stage("save"):
+            writer.write(output_path)
+        return output_path
+    tmp = output_path.with_suffix(".tmp")
+    with stage("save"), tmp.open("wb") as fh:
+        writer.write(fh)
+    tmp.replace(output_path)
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Große Bögen parallel: seitenbündige Blöcke je Prozess, danach zusammenfügen
+# ---------------------------------------------------------------------------
+
+def _chunk_pages(total: Optional[int], per_page: int, workers: int) -> int:
+    """Seiten je Block: ~4 Blöcke pro Worker für gleichmäßige Last, höchstens ``CHUNK_PAGES``."""
+    if total is None:
+        return CHUNK_PAGES
+    pages = -(-total // per_page)
+    return max(1, min(CHUNK_PAGES, -(-pages // (workers * 4))))
+
+
+def _render_chunk(
+    kind: str,
+    sources: List[Path | RecipeData | Recipe],
+    part: Path,
+    glasses_dir: Path,
+    optimize: bool,
+) -> int:
+    """Worker: rendert einen Block ganzer Bogenseiten als Teil‑PDF; liefert die Seitenzahl."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from .optimize import optimized_output
+    from .prefetch import prefetch_cards
+
+    sheet = SHEET_KINDS[kind]
+    cards = list(prefetch_cards(sources, glasses_dir))
+    with optimized_output(optimize):
+        c = canvas.Canvas(str(part), pagesize=A4, pageCompression=1 if optimize else None)
+        pages = [cards[i:i + sheet.per_page] for i in range(0, len(cards), sheet.per_page)]
+        for page_no, page in enumerate(pages):
+            if page_no:
+                c.showPage()
+            sheet.draw_page(c, page, glasses_dir)
+        with stage("save"):
+            c.save()
+    return len(pages)
+
+
+def render_sheet_parallel(
+    kind: str,
+    recipes: Iterable[Path | RecipeData | Recipe],
+    output_path: Path | BinaryIO,
+    glasses_dir: Path,
+    workers: int,
+    optimize: bool = False,
+    total: int | None = None,
+    tracker: Progress | None = None,
+) -> int:
+    """Rendert einen Bogen in seitenbündigen Blöcken auf ``workers`` Prozessen; liefert die Anzahl Teile.
+
+    Jeder Block umfasst ein Vielfaches von ``per_page`` Rezepten, die Plätze auf den
+    Seiten sind also dieselben wie beim Rendern in einem Stück. ``recipes`` wird
+    blockweise verbraucht (höchstens ``2 × workers`` Blöcke gleichzeitig unterwegs);
+    die Teil‑PDFs werden mit ``stitch_pdfs`` ohne erneutes Rendern aneinandergehängt.
+    Worker nutzen ihren eigenen ``IMAGE_CACHE``.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    sheet = SHEET_KINDS[kind]
+    size = sheet.per_page * _chunk_pages(total, sheet.per_page, workers)
+    it = iter(recipes)
+    chunks = iter(lambda: list(islice(it, size)), [])
+    parts: List[Path] = []
+    with TemporaryDirectory(prefix="cocktail-sheet-") as tmp:
+        pending: Deque[Tuple[int, Future[int]]] = deque()
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+        def submit() -> None:
+            for sources in islice(chunks, 1):
+                part = Path(tmp) / f"{len(parts):05d}.pdf"
+                parts.append(part)
+                pending.append((len(sources), pool.submit(_render_chunk, kind, sources, part, glasses_dir, optimize)))
+
+        try:
+            for _ in range(2 * workers):
+                submit()
+            while pending:
+                count, future = pending.popleft()
+                pages = future.result()
+                submit()
+                if tracker is not None:
+                    for kind_ in (LOADED, DRAWN):
+                        for _ in range(count):
+                            tracker.emit(kind_)
+                    for _ in range(pages):
+                        tracker.emit(PAGE)
+                    tracker.check()
+        finally:
+            for _, future in pending:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+        if parts:
+            stitch_pdfs(parts, output_path)
+    return len(parts)
+
+
+# ---------------------------------------------------------------------------
+# Ganzer Bogen aus Ordner, Katalog oder Iterable – gemeinsam für 2er‑ und 4er‑Bogen
+# ---------------------------------------------------------------------------
+
+def _generate_sheet(
+    kind: str,
+    recipes_folder: str | Path | Iterable[RecipeData | Recipe],
+    output_path: PdfOutput,
+    glasses_dir: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    incremental: bool = False,
+    optimize: bool = False,
+    query: str | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+    workers: int | None = None,
+) -> Path | BinaryIO | bytes:
+    """Schreibt alle Rezepte als Bogen der Art ``kind`` (siehe ``SHEET_KINDS``).
+
+    Statt eines Ordners sind auch eine Katalogdatei (``compile_catalogue``) oder ein
+    beliebiges Iterable von ``RecipeData``/``Recipe`` erlaubt (z. B. ``iter_recipes(...)``) –
+    es wird Seite für Seite verbraucht.
+
+    ``output_path`` darf auch ein beschreibbarer Binär‑Stream sein; bei ``None``
+    werden die PDF‑Bytes zurückgegeben (beides nicht mit ``incremental``).
+
+    ``optimize=True`` schreibt ein möglichst kleines PDF und loggt dessen Größenaufschlüsselung.
+
+    ``query`` druckt nur die passenden Rezepte eines Ordners (siehe ``RecipeIndex.query``).
+
+    ``progress`` erhält ``ProgressEvent``s je Karte, Seite und am Ende für die Datei.
+    Wird ``cancel`` gesetzt, endet der Lauf vor der nächsten Seite mit
+    ``RenderCancelled`` – ohne ein halbes PDF zu schreiben.
+
+    Mit ``workers > 1`` werden seitenbündige Blöcke auf einem Prozess‑Pool gerendert
+    und danach ohne erneutes Rendern zu einem PDF zusammengefügt (benötigt PyPDF2,
+    sonst wird in einem Prozess gerendert). Jeder Worker nutzt dabei seinen eigenen Bild‑Cache.
+    """
+    sheet = SHEET_KINDS[kind]
+    target = pdf_target(output_path)
+    if incremental and not isinstance(target, Path):
+        raise ValueError("incremental=True benötigt einen Ausgabepfad")
+    glasses_dir_path = resolve_glasses_dir(glasses_dir)
+    refresh_directory_indexes()
+
+    manifest = None
+    if isinstance(recipes_folder, (str, Path)) and not is_catalogue(recipes_folder):
+        jsons = recipe_files(recipes_folder, query)
+        recipes: Iterable[Path | RecipeData | Recipe] = jsons  # geladen wird beim Vorausladen
+        total: Optional[int] = len(jsons)
+
+        # Inkrementell: unveränderte Eingaben → vorhandenes PDF behalten
+        manifest = BuildManifest.load(target.parent) if incremental else None
+        if manifest is not None:
+            fingerprint = manifest.combine(
+                f"{kind}-optimize" if optimize else kind, *(manifest.recipe_fingerprint(j, glasses_dir_path, False, image_cache) for j in jsons)
+            )
+            if manifest.is_current(target, fingerprint):
+                return target
+    elif incremental:
+        raise ValueError("incremental=True benötigt einen Rezeptordner")
+    elif query is not None:
+        raise ValueError("query benötigt einen Rezeptordner")
+    elif isinstance(recipes_folder, (str, Path)):
+        recipes = iter_recipes(recipes_folder)
+        with RecipeCatalogue(recipes_folder) as catalogue:
+            total = len(catalogue)
+    else:
+        recipes = recipes_folder
+        total = len(recipes) if isinstance(recipes, Sized) else None
+    tracker = Progress(progress, cancel, total)
+
+    parallel = bool(workers and workers > 1)
+    if parallel and not can_stitch():
+        log.warning("workers=%d benötigt PyPDF2 zum Zusammenfügen – rendere in einem Prozess", workers)
+        parallel = False
+
+    if parallel:
+        parts = render_sheet_parallel(kind, recipes, target, glasses_dir_path, workers, optimize, total, tracker)
+        log.info("%s: aus %d Teil‑PDF(s) zusammengefügt", getattr(target, "name", "PDF"), parts)
+    else:
+        # Zeichenmodule erst laden, wenn wirklich gerendert wird
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        from .image_utils import embedded_images
+        from .prefetch import prefetch_cards
+
+        with optimized_output(optimize):
+            c = canvas.Canvas(
+                str(target) if isinstance(target, Path) else target,
+                pagesize=A4,
+                pageCompression=1 if optimize else None,
+            )
+            # Laden und Bildvorbereitung der nächsten Karten laufen dem Zeichnen voraus
+            cards = prefetch_cards(recipes, glasses_dir_path, image_cache)
+            try:
+                it = tracker.loaded(cards)
+                for page_no, page in enumerate(iter(lambda: list(islice(it, sheet.per_page)), [])):
+                    tracker.check()
+                    if page_no:
+                        c.showPage()
+                    sheet.draw_page(c, page, glasses_dir_path, image_cache)
+                    for _ in page:
+                        tracker.emit(DRAWN)
+                    tracker.emit(PAGE)
+            finally:
+                cards.close()  # auch bei Abbruch: Vorausladen beenden
+
+            with stage("save"):
+                c.save()
+        images = embedded_images(c)
+        log.info(
+            "%s: %d Bild(er) eingebettet, %d× wiederverwendet, %d Bytes Bilddaten nicht erneut kodiert",
+            getattr(target, "name", "PDF"), images.embedded, images.reused, images.reused_bytes,
+        )
+    tracker.emit(SAVED, target if isinstance(target, Path) else None)
+    if manifest is not None:
+        manifest.record(target, fingerprint)
+        manifest.save()
+    if optimize:
+        log_size_breakdown(getattr(target, "name", "PDF"), [target])
+    return pdf_result(target, output_path)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Deque, Iterable, Iterator, TypeVar
+
+from .definition import Recipe, RecipeData
+from .lookup import auto_same_name
+from .recipe_loader import load_recipe_json
+
+if TYPE_CHECKING:
+    from .image_utils import ImageCache
+    from .layout import CardLayout
+
+__all__ = ["PREFETCH_DEPTH", "prefetch", "load_card", "prefetch_cards"]
+
+# Wie viele Karten höchstens im Voraus geladen werden. Begrenzt den Speicher und
+# muss deutlich unter ``ImageCache.maxsize`` bleiben, sonst werden vorbereitete
+# Bilder verdrängt, bevor sie gezeichnet sind. 0 = kein Vorausladen.
+PREFETCH_DEPTH = 8
+PREFETCH_WORKERS = 4  # Threads – sie warten fast nur auf I/O
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# ---------------------------------------------------------------------------
+# Vorausladen mit begrenzter Tiefe, Ergebnisse in Eingabereihenfolge
+# ---------------------------------------------------------------------------
+
+def prefetch(items: Iterable[T], load: Callable[[T], R], depth: int | None = None) -> Iterator[R]:
+    """Wendet ``load`` auf einem Thread‑Pool bis zu ``depth`` Elemente im Voraus an.
+
+    Die Ergebnisse kommen in der Reihenfolge von ``items``; wirft ``load``, wird der
+    Fehler an der Stelle seines Elements geworfen. ``items`` selbst wird nur im
+    aufrufenden Thread gelesen (z. B. ein ``RecipeCatalogue``‑Cursor). Bricht der
+    Verbraucher ab, werden noch nicht begonnene Aufträge verworfen.
+    ``depth=None`` nimmt ``PREFETCH_DEPTH`` (zur Laufzeit gelesen, also global einstellbar).
+    """
+    depth = PREFETCH_DEPTH if depth is None else depth
+    if depth < 1:
+        yield from map(load, items)
+        return
+    it = iter(items)
+    pending: Deque[Future[R]] = deque()
+    pool = ThreadPoolExecutor(max_workers=min(depth, PREFETCH_WORKERS), thread_name_prefix="prefetch")
+    try:
+        pending.extend(pool.submit(load, item) for item in islice(it, depth))
+        while pending:
+            future = pending.popleft()
+            pending.extend(pool.submit(load, item) for item in islice(it, 1))  # Tiefe halten
+            yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+# ---------------------------------------------------------------------------
+# Karten: JSON lesen, Bilder suchen und vorbereiten – alles außer Zeichnen
+# ---------------------------------------------------------------------------
+
+def load_card(
+    source: Path | RecipeData | Recipe,
+    glasses_dir: Path,
+    image_cache: ImageCache | None = None,
+    same_name: bool = False,
+) -> CardLayout:
+    """``CardLayout`` für eine JSON‑Datei oder ein geladenes Rezept.
+
+    ``same_name`` übernimmt wie beim A5‑Export ein gleichnamiges Bild neben der JSON.
+    """
+    from .layout import card_layout
+
+    if isinstance(source, Path):
+        rec = load_recipe_json(source)
+        if same_name and not rec.get("image_path"):
+            auto_img = auto_same_name(source)
+            if auto_img:
+                rec["image_path"] = str(auto_img)
+    else:
+        rec = source
+    return card_layout(rec, glasses_dir, image_cache)
+
+
+def prefetch_cards(
+    sources: Iterable[Path | RecipeData | Recipe],
+    glasses_dir: Path,
+    image_cache: ImageCache | None = None,
+    same_name: bool = False,
+    depth: int | None = None,
+) -> Iterator[CardLayout]:
+    """Karten zu ``sources`` in Reihenfolge; Datei‑ und Bildzugriffe laufen dem Zeichnen voraus.
+
+    Auf Netzlaufwerken überlappt so die Latenz der nächsten Dateien mit dem Rendern
+    der aktuellen Karte, statt sich zu ihr zu addieren.
+    """
+    return prefetch(sources, lambda source: load_card(source, glasses_dir, image_cache, same_name), depth)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .definition import recipe_type_errors
+from .lookup import find_glass_image, is_indexed_file, refresh_directory_indexes, resolve_glasses_dir
+from .manifest import layout_signature
+from .recipe_loader import RecipeBatchError, recipe_files
+
+__all__ = ["PreflightIssue", "PreflightReport", "preflight_recipes"]
+
+PREFLIGHT_VERSION = 1  # erhöhen, wenn sich die Prüfungen ändern (verwirft den Cache)
+PARALLEL_THRESHOLD = 200  # darunter lohnt der Start eines Prozess‑Pools nicht
+
+ERROR = "error"      # Rezept kann nicht gerendert werden
+WARNING = "warning"  # wird gerendert, aber fehlerhaft (Platzhalter, abgeschnittener Text)
+
+
+class PreflightIssue(NamedTuple):
+    file: Path
+    level: str
+    message: str
+
+
+class PreflightReport:
+    """Ergebnis von ``preflight_recipes``: alle Befunde des Korpus plus Cache‑Statistik."""
+
+    def __init__(self, issues: List[PreflightIssue], checked: int, cached: int) -> None:
+        self.issues = issues
+        self.checked = checked  # geprüfte Dateien insgesamt
+        self.cached = cached    # davon ohne erneutes Parsen aus dem Cache
+
+    @property
+    def errors(self) -> List[PreflightIssue]:
+        return [i for i in self.issues if i.level == ERROR]
+
+    @property
+    def warnings(self) -> List[PreflightIssue]:
+        return [i for i in self.issues if i.level == WARNING]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self, strict: bool = False) -> None:
+        """Wirft ``RecipeBatchError`` mit allen Fehlern (mit ``strict`` auch allen Warnungen)."""
+        failing = self.issues if strict else self.errors
+        if failing:
+            raise RecipeBatchError([(i.file, ValueError(i.message)) for i in failing], [])
+
+    def __str__(self) -> str:
+        lines = [f"{self.checked} Rezept(e) geprüft ({self.cached} aus dem Cache), "
+                 f"{len(self.errors)} Fehler, {len(self.warnings)} Warnung(en)"]
+        lines += [f"  • {i.file.name}: [{i.level}] {i.message}" for i in self.issues]
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Inhaltliche Prüfung einer Datei (läuft ggf. im Worker‑Prozess)
+# ---------------------------------------------------------------------------
+
+def _content_issues(data: Any) -> List[Tuple[str, str]]:
+    """Pflichtfelder, Typen und Textsatz – alles, was nur vom Dateiinhalt abhängt."""
+    if not isinstance(data, dict):
+        return [(ERROR, "kein JSON‑Objekt")]
+    issues: List[Tuple[str, str]] = [(ERROR, msg) for msg in recipe_type_errors(data)]
+    for field in ("ingredients", "steps"):
+        if data.get(field) == []:
+            issues.append((WARNING, f"{field} ist leer"))
+    if any(level == ERROR for level, _ in issues):
+        return issues
+
+    from .layout import BODY_MIN_SIZE, overflows, text_layout
+
+    _, blocks = text_layout(data)
+    if overflows(blocks):
+        issues.append((WARNING, f"Text passt auch mit {BODY_MIN_SIZE} pt nicht auf die Karte"))
+    return issues
+
+
+def _check_file(js: Path, known_sha: Optional[str] = None) -> Dict[str, Any]:
+    """Cache‑Eintrag für ``js``; ist der Inhalt unverändert (``known_sha``), entfällt die Prüfung.
+
+    Ist die Datei inzwischen verschwunden oder nicht lesbar, wird das als Fehler
+    dieser Datei gemeldet (ohne ``stat`` – sie wird beim nächsten Lauf neu geprüft).
+    """
+    try:
+        st = js.stat()
+        raw = js.read_bytes()
+    except OSError as exc:
+        return {"stat": None, "sha": None, "issues": [(ERROR, f"nicht lesbar: {exc.strerror or exc}")]}
+    entry: Dict[str, Any] = {"stat": [st.st_mtime_ns, st.st_size], "sha": hashlib.sha1(raw).hexdigest()}
+    if entry["sha"] == known_sha:
+        entry["unchanged"] = True
+        return entry
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as exc:
+        entry["issues"] = [(ERROR, f"JSON ungültig: {exc}")]
+        return entry
+    entry["issues"] = _content_issues(data)
+    if isinstance(data, dict):
+        # Für die Asset‑Prüfung, die bei jedem Lauf frisch erfolgt
+        entry["glass"] = data.get("glass") if isinstance(data.get("glass"), str) else None
+        entry["image_path"] = data.get("image_path") if isinstance(data.get("image_path"), str) else None
+    return entry
+
+
+def _check_task(task: Tuple[Path, Optional[str]]) -> Dict[str, Any]:
+    return _check_file(*task)
+
+
+# ---------------------------------------------------------------------------
+# Ergebnis‑Cache je Rezeptordner
+# ---------------------------------------------------------------------------
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/cocktail_pdf_generator/preflight`` (Standard: ``~/.cache/...``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cocktail_pdf_generator" / "preflight"
+
+
+def _signature() -> str:
+    return f"{PREFLIGHT_VERSION}:{layout_signature()}"
+
+
+def _cache_file(cache_dir: Path, recipes_folder: Path) -> Path:
+    return cache_dir / f"{hashlib.sha1(str(recipes_folder).encode()).hexdigest()}.json"
+
+
+def _load_cache(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("signature") == _signature() else {}
+
+
+def _save_cache(path: Path, files: Dict[str, Dict[str, Any]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"signature": _signature(), "files": files}, ensure_ascii=False), "utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass  # Cache ist optional
+
+
+# ---------------------------------------------------------------------------
+# Vorabprüfung des ganzen Korpus
+# ---------------------------------------------------------------------------
+
+def preflight_recipes(
+    recipes_folder: str | Path,
+    glasses_dir: str | Path | None = None,
+    workers: int | None = None,
+    cache_dir: str | Path | None = None,
+    use_cache: bool = True,
+    query: str | None = None,
+) -> PreflightReport:
+    """Prüft alle Rezept‑JSONs eines Ordners, bevor gerendert wird, und sammelt **alle** Befunde.
+
+    Geprüft werden Pflichtfelder und Typen, ob ``glass`` und ``image_path`` auf
+    vorhandene Dateien zeigen und ob der Text auf die Karte passt. Inhaltliche
+    Ergebnisse werden je Datei‑Hash gecacht (``cache_dir``, Standard:
+    ``default_cache_dir()``); unveränderte Dateien kosten nur einen ``stat``.
+    Größere Korpora werden mit ``workers`` Prozessen geprüft (Standard: CPU‑Anzahl),
+    mit ``query`` nur die passenden Rezepte (siehe ``RecipeIndex.query``).
+    """
+    recipes_folder = Path(recipes_folder).expanduser().resolve()
+    glasses_dir_path = resolve_glasses_dir(glasses_dir)
+    refresh_directory_indexes()
+    cache_path = _cache_file(Path(cache_dir) if cache_dir else default_cache_dir(), recipes_folder)
+    cached = _load_cache(cache_path) if use_cache else {}
+
+    jsons = recipe_files(recipes_folder, query)
+    entries: Dict[str, Dict[str, Any]] = {}
+    todo: List[Tuple[Path, Optional[str]]] = []
+    for js in jsons:
+        old = cached.get(js.name)
+        try:
+            st = js.stat()
+        except OSError:
+            old = None
+        else:
+            if old is not None and old["stat"] == [st.st_mtime_ns, st.st_size]:
+                entries[js.name] = old
+                continue
+        todo.append((js, old["sha"] if old else None))
+
+    workers = workers or os.cpu_count() or 1
+    results: Iterator[Dict[str, Any]]
+    if workers > 1 and len(todo) >= PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = iter(list(pool.map(_check_task, todo, chunksize=max(1, len(todo) // (workers * 4)))))
+    else:
+        results = (_check_task(task) for task in todo)
+
+    hits = len(entries)
+    for (js, _), entry in zip(todo, results):
+        if entry.pop("unchanged", False):
+            entry = {**cached[js.name], "stat": entry["stat"]}
+            hits += 1
+        entries[js.name] = entry
+    if use_cache and todo:
+        # Teilmenge (query): Einträge der übrigen Rezepte im Cache behalten
+        _save_cache(cache_path, entries if query is None else {**cached, **entries})
+
+    issues: List[PreflightIssue] = []
+    for js in jsons:
+        entry = entries[js.name]
+        issues += [PreflightIssue(js, level, message) for level, message in entry["issues"]]
+        # Assets bei jedem Lauf frisch prüfen – über den Verzeichnisindex nur Lookups
+        glass = entry.get("glass")
+        if glass and find_glass_image(glass, glasses_dir_path) is None:
+            issues.append(PreflightIssue(js, WARNING, f"kein Glasbild für „{glass}“ in {glasses_dir_path}"))
+        image_path = entry.get("image_path")
+        if image_path and not is_indexed_file(Path(image_path)):
+            issues.append(PreflightIssue(js, WARNING, f"image_path nicht gefunden: {image_path}"))
+    return PreflightReport(issues, len(jsons), hits)
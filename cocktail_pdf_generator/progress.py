@@ -0,0 +1,100 @@
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, NamedTuple, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from threading import Event
+
+__all__ = ["ProgressEvent", "ProgressCallback", "RenderCancelled", "Progress", "print_progress"]
+
+# Ereignisarten
+LOADED = "loaded"  # Rezept geladen, Bilder vorbereitet – bereit zum Zeichnen
+DRAWN = "drawn"    # Karte gezeichnet
+FAILED = "failed"  # Karte nicht renderbar (wird am Ende per RecipeBatchError gemeldet)
+PAGE = "page"      # Seite abgeschlossen
+SAVED = "saved"    # Datei geschrieben
+
+
+class ProgressEvent(NamedTuple):
+    kind: str               # LOADED, DRAWN, PAGE oder SAVED
+    done: int               # bisher erledigte Karten (gezeichnet oder fehlgeschlagen)
+    total: Optional[int]    # Karten insgesamt (None, wenn unbekannt – z. B. bei Iterables)
+    elapsed: float          # Sekunden seit Start
+    rate: float             # Karten/s seit Start
+    eta: Optional[float]    # geschätzte Restdauer in s (None ohne ``total`` oder Messwert)
+    path: Optional[Path]    # LOADED/FAILED: Quell‑JSON (falls bekannt), SAVED: geschriebene Datei
+    failed: int = 0         # davon fehlgeschlagen
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+T = TypeVar("T")
+
+
+class RenderCancelled(Exception):
+    """Lauf wurde über ``cancel`` abgebrochen; ``pdfs`` enthält alles bereits Geschriebene."""
+
+    def __init__(self, pdfs: List[Path]) -> None:
+        self.pdfs = pdfs
+        super().__init__(f"Abgebrochen nach {len(pdfs)} geschriebenen PDF(s)")
+
+
+# ---------------------------------------------------------------------------
+# Buchführung je Lauf
+# ---------------------------------------------------------------------------
+
+class Progress:
+    """Zählt Karten, meldet Ereignisse an ``callback`` und prüft ``cancel``.
+
+    Ereignisse kommen immer aus dem aufrufenden Thread, auch wenn vorausgeladen
+    wird. Ohne ``callback`` und ``cancel`` kostet das nur ein paar Vergleiche.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback | None = None,
+        cancel: Event | None = None,
+        total: int | None = None,
+    ) -> None:
+        self.callback = callback
+        self.cancel = cancel
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def check(self, pdfs: List[Path] | None = None) -> None:
+        """Wirft ``RenderCancelled``, sobald ``cancel`` gesetzt ist."""
+        if self.cancelled:
+            raise RenderCancelled(list(pdfs or []))
+
+    def loaded(self, items: Iterable[T]) -> Iterator[T]:
+        """Reicht ``items`` durch und meldet für jedes ``LOADED``."""
+        for item in items:
+            self.emit(LOADED)
+            yield item
+
+    def emit(self, kind: str, path: Path | None = None) -> None:
+        if kind == FAILED:
+            self.failed += 1
+        if kind in (DRAWN, FAILED):
+            self.done += 1
+        if self.callback is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if self.total is not None and rate > 0 else None
+        self.callback(ProgressEvent(kind, self.done, self.total, elapsed, rate, eta, path, self.failed))
+
+
+def print_progress(event: ProgressEvent) -> None:
+    """Einfache Fortschrittszeile für die Konsole (als ``progress=`` übergeben)."""
+    if event.kind != PAGE:
+        return
+    total = f"/{event.total}" if event.total is not None else ""
+    eta = f", noch ~{event.eta:.0f} s" if event.eta is not None else ""
+    print(f"\r{event.done}{total} Karten, {event.rate:.1f}/s{eta}   ", end="", flush=True)
@@ -1,25 +1,35 @@
 from __future__ import annotations
 from pathlib import Path
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4, A5
-from reportlab.lib.units import mm
-from .layout import draw_recipe_area
-from .recipe_loader import load_recipe_json, RecipeData
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Sequence
+from .definition import Recipe
+from .recipe_loader import PdfOutput, RecipeData
 
-def generate_quadruple_a4_sheet(
-    recipes_folder: str | Path,
-    output_path: str | Path,
-    glasses_dir: str | Path | None = None,
-) -> Path:
-    """Erzeugt ein A4‑PDF mit **vier hochkant platzierten A5‑Rezepten** (2×2‑Raster)."""
+if TYPE_CHECKING:
+    from threading import Event
+    from reportlab.pdfgen import canvas
+    from .image_utils import ImageCache
+    from .layout import CardLayout
+    from .progress import ProgressCallback
+
+
+# ---------------------------------------------------------------------------
+# Eine A4‑Seite: bis zu vier A5‑Blöcke im 2×2‑Raster
+# ---------------------------------------------------------------------------
+
+RECIPES_PER_PAGE = 4
 
-    recipes_folder = Path(recipes_folder).expanduser().resolve()
-    output_path = Path(output_path).expanduser().resolve()
-    glasses_dir_path = Path(glasses_dir) if glasses_dir else Path(__file__).resolve().parent.parent / "glasses"
 
-    recipes = [load_recipe_json(j) for j in sorted(recipes_folder.glob("*.json"))]
+def draw_quadruple_a4_page(
+    c: canvas.Canvas,
+    recipes: Sequence[RecipeData | Recipe | CardLayout],
+    glasses_dir: Path,
+    image_cache: ImageCache | None = None,
+) -> None:
+    """Zeichnet bis zu ``RECIPES_PER_PAGE`` Rezepte auf die aktuelle Seite (zeilenweise)."""
+    from .layout import draw_recipe_area
+    from reportlab.lib.pagesizes import A4, A5
+    from reportlab.lib.units import mm
 
-    c = canvas.Canvas(str(output_path), pagesize=A4)
     page_w, page_h = A4
 
     margin_h = 10 * mm
@@ -41,20 +51,39 @@ def generate_quadruple_a4_sheet(
         (margin_h + block_w + gap_x, margin_v),               # unten rechts
     ]
 
-    for idx, rec in enumerate(recipes):
-        slot = idx % 4
-        if slot == 0 and idx > 0:
-            c.showPage()
-
-        x_off, y_off = positions[slot]
+    for (x_off, y_off), rec in zip(positions, recipes):
         c.saveState()
         c.translate(x_off, y_off)
         c.scale(scale, scale)
-        draw_recipe_area(c, 0, 0, rec, glasses_dir_path)
+        draw_recipe_area(c, 0, 0, rec, glasses_dir, image_cache)
         c.restoreState()
 
-    c.save()
-    return output_path
 
+# ---------------------------------------------------------------------------
+# Alle Rezepte zu viert auf DIN A4
+# ---------------------------------------------------------------------------
+
+def generate_quadruple_a4_sheet(
+    recipes_folder: str | Path | Iterable[RecipeData | Recipe],
+    output_path: PdfOutput,
+    glasses_dir: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    incremental: bool = False,
+    optimize: bool = False,
+    query: str | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+    workers: int | None = None,
+) -> Path | BinaryIO | bytes:
+    """Erzeugt ein A4‑PDF mit **vier hochkant platzierten A5‑Rezepten** (2×2‑Raster).
 
+    Eingaben und Optionen (Katalog/Iterable, Stream‑Ausgabe, ``incremental``,
+    ``optimize``, ``query``, ``progress``/``cancel``, ``workers``) wie bei
+    ``pdf_parts._generate_sheet``.
+    """
+    from .pdf_parts import _generate_sheet  # pdf_parts importiert dieses Modul
 
+    return _generate_sheet(
+        "quadruple", recipes_folder, output_path, glasses_dir, image_cache,
+        incremental, optimize, query, progress, cancel, workers,
+    )
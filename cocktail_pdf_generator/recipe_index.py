@@ -0,0 +1,285 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import shlex
+import sqlite3
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .definition import is_recipe_file
+from .stats import stage
+
+__all__ = ["IndexUpdate", "RecipeIndex", "default_index_path", "normalize_tokens", "select_recipes"]
+
+INDEX_VERSION = 1  # erhöhen, wenn sich Schema oder Normalisierung ändern (baut neu auf)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    name     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    title    TEXT,
+    glass    TEXT
+);
+CREATE INDEX IF NOT EXISTS files_glass ON files (glass);
+CREATE TABLE IF NOT EXISTS tokens (
+    token TEXT NOT NULL,
+    field TEXT NOT NULL,
+    name  TEXT NOT NULL,
+    PRIMARY KEY (token, field, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tokens_name ON tokens (name);
+"""
+
+# Mengenangaben tragen bei der Suche nach Zutaten nichts bei („4 cl Gin“ → „gin“)
+_UNITS = frozenset("cl ml l tl el bl g kg stk stuck spritzer dash dashes scheibe scheiben".split())
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize_tokens(text: str, drop_units: bool = False) -> List[str]:
+    """Suchwörter: klein, ohne Akzente („Weißer“ → „weisser“), ohne reine Zahlen."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return [t for t in _WORD.findall(text) if not t.isdigit() and not (drop_units and t in _UNITS)]
+
+
+def _normalize_glass(glass: object) -> Optional[str]:
+    """„Old-Fashioned“ und „old fashioned“ sind dasselbe Glas."""
+    return " ".join(normalize_tokens(glass)) or None if isinstance(glass, str) else None
+
+
+def default_index_path(recipes_folder: Path) -> Path:
+    """``$XDG_CACHE_HOME/cocktail_pdf_generator/index/<sha1 des Ordnerpfads>.sqlite``.
+
+    Der Index liegt im Benutzer‑Cache statt im Rezeptordner – der darf schreibgeschützt sein.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    digest = hashlib.sha1(str(recipes_folder).encode()).hexdigest()
+    return Path(base) / "cocktail_pdf_generator" / "index" / f"{digest}.sqlite"
+
+
+class IndexUpdate(NamedTuple):
+    added: int
+    changed: int
+    removed: int
+
+
+# ---------------------------------------------------------------------------
+# Index über einen Rezeptordner
+# ---------------------------------------------------------------------------
+
+class RecipeIndex:
+    """Persistenter invertierter Index (SQLite) über Glas, Zutaten‑Wörter und Titel.
+
+    ``update()`` gleicht ihn inkrementell mit dem Ordner ab – geparst werden nur
+    neue oder geänderte JSONs (erkannt an ``mtime``/Größe). Abfragen lesen danach
+    nur den Index, keine einzige Rezeptdatei.
+
+    Ohne ``index_path`` liegt der Index unter ``default_index_path()``. Ist dort
+    nichts beschreibbar, lebt er nur im Speicher (und wird je Aufruf neu aufgebaut).
+    """
+
+    def __init__(self, recipes_folder: str | Path, index_path: str | Path | None = None) -> None:
+        self.recipes_folder = Path(recipes_folder).expanduser().resolve()
+        self.path = Path(index_path) if index_path else default_index_path(self.recipes_folder)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._con = self._open(str(self.path))
+        except (OSError, sqlite3.Error):
+            self._con = self._open(":memory:")
+
+    @staticmethod
+    def _open(database: str) -> sqlite3.Connection:
+        con = sqlite3.connect(database)
+        try:
+            # Journal liegen lassen statt es je Schreibvorgang anzulegen und zu löschen – liegt
+            # der Index im Rezeptordner, änderte sonst jede Aktualisierung dessen mtime
+            con.execute("PRAGMA journal_mode = PERSIST")
+            con.executescript(_SCHEMA)
+            row = con.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(INDEX_VERSION):
+                with con:
+                    con.execute("DELETE FROM files")
+                    con.execute("DELETE FROM tokens")
+                    con.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+        except sqlite3.Error:
+            con.close()
+            raise
+        return con
+
+    def __enter__(self) -> "RecipeIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __len__(self) -> int:
+        return self._con.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # -- Abgleich mit dem Ordner ----------------------------------------------
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, full: bool = True) -> IndexUpdate:
+        """Nimmt neue/geänderte JSONs auf und entfernt gelöschte.
+
+        Mit ``full=False`` wird nur neu gescannt, wenn sich die ``mtime`` des Ordners
+        geändert hat (neue, gelöschte, umbenannte oder per Umbenennen gespeicherte
+        Dateien) – statt eines ``stat`` pro Datei kostet das einen einzigen.
+        """
+        folder_mtime = str(os.stat(self.recipes_folder).st_mtime_ns)  # vor dem Scan lesen
+        if not full and self._meta("folder_mtime") == folder_mtime:
+            return IndexUpdate(0, 0, 0)
+        with stage("lookup"):
+            on_disk = {}
+            with os.scandir(self.recipes_folder) as it:
+                for entry in it:
+                    if is_recipe_file(entry.name) and entry.is_file():
+                        st = entry.stat()
+                        on_disk[entry.name] = (st.st_mtime_ns, st.st_size)
+            known = {name: (mtime, size) for name, mtime, size in self._con.execute(
+                "SELECT name, mtime_ns, size FROM files")}
+        result = self._apply(on_disk, known)
+        with self._con:
+            self._con.execute("INSERT OR REPLACE INTO meta VALUES ('folder_mtime', ?)", (folder_mtime,))
+        return result
+
+    def refresh(self, paths: List[Path]) -> IndexUpdate:
+        """Gleicht nur ``paths`` ab (z. B. die Treffer einer Abfrage) – ein ``stat`` je Datei."""
+        on_disk = {}
+        known: Dict[str, Tuple[int, int]] = {}
+        with stage("lookup"):
+            names = [path.name for path in paths]
+            for i in range(0, len(names), 500):  # SQLite begrenzt die Zahl der Parameter
+                chunk = names[i:i + 500]
+                known.update((name, (mtime, size)) for name, mtime, size in self._con.execute(
+                    f"SELECT name, mtime_ns, size FROM files WHERE name IN ({', '.join('?' * len(chunk))})", chunk))
+            for path in paths:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                on_disk[path.name] = (st.st_mtime_ns, st.st_size)
+        return self._apply(on_disk, known)
+
+    def _apply(self, on_disk: Dict[str, Tuple[int, int]], known: Dict[str, Tuple[int, int]]) -> IndexUpdate:
+        todo = [name for name, stat in on_disk.items() if known.get(name) != stat]
+        removed = [name for name in known if name not in on_disk]
+        if not todo and not removed:
+            return IndexUpdate(0, 0, 0)
+
+        rows: List[Tuple[str, int, int, Optional[str], Optional[str]]] = []
+        tokens: List[Tuple[str, str, str]] = []
+        for name in todo:
+            title, glass, words = self._read(self.recipes_folder / name)
+            rows.append((name, *on_disk[name], title, glass))
+            tokens += [(token, field, name) for field, token in words]
+        with self._con:
+            stale = [(name,) for name in (*todo, *removed)]
+            self._con.executemany("DELETE FROM tokens WHERE name = ?", stale)
+            self._con.executemany("DELETE FROM files WHERE name = ?", [(name,) for name in removed])
+            self._con.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows)
+            self._con.executemany("INSERT OR IGNORE INTO tokens VALUES (?, ?, ?)", tokens)
+        changed = sum(1 for name in todo if name in known)
+        return IndexUpdate(len(todo) - changed, changed, len(removed))
+
+    @staticmethod
+    def _read(js: Path) -> Tuple[Optional[str], Optional[str], Set[Tuple[str, str]]]:
+        """Titel, Glas und ``(Feld, Wort)``‑Paare einer Datei; unlesbare Dateien bleiben leer."""
+        try:
+            with stage("load"):
+                data = json.loads(js.read_text("utf-8"))
+        except (OSError, ValueError):
+            return None, None, set()
+        if not isinstance(data, dict):
+            return None, None, set()
+        title = data.get("title") if isinstance(data.get("title"), str) else None
+        words = {("title", t) for t in normalize_tokens(title or "")}
+        ingredients = data.get("ingredients")
+        if isinstance(ingredients, list):
+            for ing in ingredients:
+                if isinstance(ing, str):
+                    words.update(("ingredient", t) for t in normalize_tokens(ing, drop_units=True))
+        return title, _normalize_glass(data.get("glass")), words
+
+    # -- Abfragen -------------------------------------------------------------
+
+    @staticmethod
+    def _term_sql(field: str, value: str) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Teilabfragen für einen Suchbegriff; ``*`` am Ende sucht nach Wortanfängen.
+
+        Leer, wenn vom Begriff nach dem Normalisieren nichts übrig bleibt („4 cl“).
+        """
+        prefix = value.endswith("*")
+        value = value.rstrip("*")
+        if field == "glass":
+            glass = _normalize_glass(value)
+            if glass is None:
+                return []
+            if prefix:
+                return [("SELECT name FROM files WHERE glass >= ? AND glass < ?", (glass, glass + "\uffff"))]
+            return [("SELECT name FROM files WHERE glass = ?", (glass,))]
+
+        fields = ("ingredient", "title") if field == "any" else (field,)
+        marks = ", ".join("?" * len(fields))
+        parts = []
+        for token in normalize_tokens(value, drop_units=field != "title"):
+            if prefix:
+                sql = f"SELECT DISTINCT name FROM tokens WHERE token >= ? AND token < ? AND field IN ({marks})"
+                parts.append((sql, (token, token + "\uffff", *fields)))
+            else:
+                parts.append((f"SELECT DISTINCT name FROM tokens WHERE token = ? AND field IN ({marks})", (token, *fields)))
+        return parts
+
+    def query(self, query: str) -> List[Path]:
+        """Passende JSONs (alphabetisch) zu einer Abfrage wie ``glass:tumbler ingredient:gin``.
+
+        Begriffe werden UND‑verknüpft. Felder: ``glass``, ``ingredient``, ``title``;
+        ohne Feld wird in Zutaten und Titel gesucht. Mehrwortige Werte in
+        Anführungszeichen (``ingredient:"weißer rum"``), ``gin*`` für Wortanfänge.
+        Eine leere Abfrage liefert alle Rezepte.
+        """
+        parts: List[Tuple[str, Tuple[str, ...]]] = []
+        for term in shlex.split(query):
+            field, sep, value = term.partition(":")
+            if not sep:
+                field, value = "any", term
+            elif field not in ("glass", "ingredient", "title"):
+                raise ValueError(f"Unbekanntes Suchfeld „{field}“ (glass, ingredient, title)")
+            parts += self._term_sql(field, value)
+        if not parts:
+            parts = [("SELECT name FROM files", ())]
+        sql = " INTERSECT ".join(part for part, _ in parts) + " ORDER BY name"
+        args = [arg for _, part_args in parts for arg in part_args]
+        return [self.recipes_folder / row[0] for row in self._con.execute(sql, args)]
+
+
+def select_recipes(
+    recipes_folder: str | Path,
+    query: str,
+    index_path: str | Path | None = None,
+    full: bool = False,
+) -> List[Path]:
+    """Liefert die JSONs von ``recipes_folder`` zu ``query`` und hält den Index dabei aktuell.
+
+    Neu gescannt wird nur bei geänderter Ordner‑``mtime`` (neue, gelöschte oder per
+    Umbenennen gespeicherte Dateien); sonst werden nur die Treffer per ``stat``
+    abgeglichen. Eine *in place* gespeicherte Datei, die erst durch diese Änderung
+    passt, fehlt dann bis zum nächsten Scan – ``full=True`` prüft jede Datei
+    (ca. 330 ms je 50 000 Dateien) und findet auch sie.
+    """
+    with RecipeIndex(recipes_folder, index_path) as index:
+        index.update(full=full)
+        matches = index.query(query)
+        if index.refresh(matches) != (0, 0, 0):
+            matches = index.query(query)
+        return matches
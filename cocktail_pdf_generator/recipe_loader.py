@@ -1,77 +1,362 @@
 from __future__ import annotations
+import io
 import json
+import logging
+from itertools import repeat
 from pathlib import Path
-from typing import TypedDict, List, Any
-from pathlib import Path
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A5
-from .layout import draw_recipe_area
-from .definition import RecipeData
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from cocktail_pdf_generator.lookup import auto_same_name, refresh_directory_indexes, resolve_glasses_dir
+from cocktail_pdf_generator.definition import Recipe, RecipeData, is_recipe_file, recipe_from_dict
+from cocktail_pdf_generator.manifest import BuildManifest
+from cocktail_pdf_generator.catalogue import RecipeCatalogue, is_catalogue
+from cocktail_pdf_generator.optimize import log_size_breakdown, optimized_output
+from cocktail_pdf_generator.progress import DRAWN, FAILED, LOADED, PAGE, SAVED, Progress, ProgressCallback, RenderCancelled
+from cocktail_pdf_generator.stats import stage
 
-from cocktail_pdf_generator.image_utils import auto_same_name
-from cocktail_pdf_generator.definition import RecipeData
+# reportlab, Pillow und die Zeichenmodule werden erst beim Rendern geladen
+if TYPE_CHECKING:
+    from threading import Event
+    from cocktail_pdf_generator.image_utils import ImageCache
+    from cocktail_pdf_generator.layout import CardLayout
+
+log = logging.getLogger(__name__)
 
 REQ = {"title", "ingredients", "steps"}
 
+# Wohin ein PDF geschrieben wird: Pfad, beschreibbarer Binär‑Stream oder ``None`` (→ ``bytes``)
+PdfOutput = Union[str, Path, BinaryIO, None]
+
+
+def pdf_target(output_path: PdfOutput) -> Path | BinaryIO:
+    """Ziel für ``canvas.Canvas``: aufgelöster Pfad, der Stream selbst oder ein neuer Puffer."""
+    if output_path is None:
+        return io.BytesIO()
+    if hasattr(output_path, "write"):
+        return output_path
+    return Path(output_path).expanduser().resolve()
+
+
+def pdf_result(target: Path | BinaryIO, output_path: PdfOutput) -> Path | BinaryIO | bytes:
+    """Rückgabewert der Generatoren: ``Path`` bzw. der übergebene Stream, bei ``None`` die Bytes."""
+    return target.getvalue() if output_path is None else target
+
 # ---------------------------------------------------------------------------
 # Batch‑Generator (unverändert)
 # ---------------------------------------------------------------------------
 
 def load_recipe_json(json_file: str | Path) -> RecipeData:
-    data: Any = json.loads(Path(json_file).read_text("utf-8"))
-    if not {"title", "ingredients", "steps"}.issubset(data):
-        raise ValueError(f"JSON {json_file} fehlt Pflichtfelder (title, ingredients, steps)")
-    return RecipeData(
-        title=data["title"],
-        ingredients=data["ingredients"],
-        steps=data["steps"],
-        image_path=data.get("image_path"),
-        glass=data.get("glass"),
-    )
+    with stage("load"):
+        data: Any = json.loads(Path(json_file).read_text("utf-8"))
+        return recipe_from_dict(data, json_file)
+
+
+def recipe_files(recipes_folder: str | Path, query: str | None = None) -> List[Path]:
+    """Alle Rezept‑JSONs eines Ordners in stabiler, alphabetischer Reihenfolge.
+
+    Mit ``query`` (z. B. ``"glass:tumbler ingredient:gin"``) nur die passenden – die
+    Auswahl läuft über den persistenten ``RecipeIndex`` des Ordners.
+    """
+    if query is not None:
+        from .recipe_index import select_recipes
+
+        return select_recipes(recipes_folder, query)
+    folder = Path(recipes_folder).expanduser().resolve()
+    return sorted(js for js in folder.glob("*.json") if is_recipe_file(js.name))
+
+
+def iter_recipes(source: str | Path | Iterable[str | Path], compact: bool = False) -> Iterator[RecipeData | Recipe]:
+    """Lädt Rezepte lazy – aus einem Ordner (alphabetisch), einer Katalogdatei
+    (siehe ``compile_catalogue``) oder einer Liste von JSON‑Dateien.
+
+    Es wird immer nur das gerade benötigte Rezept geparst; der Speicherbedarf
+    hängt daher nicht von der Größe des Korpus ab. Mit ``compact=True`` kommen
+    unveränderliche ``Recipe``‑Objekte statt Dicts – sinnvoll, wenn viele Rezepte
+    gleichzeitig im Speicher gehalten werden (``list(iter_recipes(..., compact=True))``).
+    """
+    if isinstance(source, (str, Path)) and is_catalogue(source):
+        with RecipeCatalogue(source) as catalogue:
+            yield from map(Recipe.from_data, catalogue) if compact else catalogue
+        return
+    files = recipe_files(source) if isinstance(source, (str, Path)) else source
+    for js in files:
+        rec = load_recipe_json(js)
+        yield Recipe.from_data(rec) if compact else rec
+
 
 def create_cocktail_pdf(
     *,
     title: str,
     ingredients: List[str],
     steps: List[str],
-    output_path: str | Path,
-    image_path: str | Path | None = None,
+    output_path: PdfOutput = None,
+    image_path: str | Path | bytes | None = None,
     glass: str | None = None,
     glasses_dir: str | Path | None = None,
-) -> Path:
-    output_path = Path(output_path).expanduser().resolve()
-    c = canvas.Canvas(str(output_path), pagesize=A5)
+    image_cache: ImageCache | None = None,
+    optimize: bool = False,
+) -> Path | BinaryIO | bytes:
+    """Rendert ein Rezept als A5‑PDF.
+
+    ``output_path`` darf ein Pfad, ein beschreibbarer Binär‑Stream oder ``None`` sein –
+    dann werden die PDF‑Bytes zurückgegeben. ``image_path`` darf statt eines Pfads
+    die Bilddaten selbst enthalten; so läuft alles ohne Dateizugriff.
+
+    ``optimize=True`` schreibt ein möglichst kleines PDF (siehe ``optimized_output``).
+    """
     recipe_data: RecipeData = {
         "title": title,
         "ingredients": ingredients,
         "steps": steps,
-        "image_path": str(image_path) if image_path else None,
+        "image_path": image_path if isinstance(image_path, bytes) else str(image_path) if image_path else None,
         "glass": glass,
     }
-    draw_recipe_area(c, 0, 0, recipe_data, Path(glasses_dir) if glasses_dir else Path(__file__).resolve().parent.parent / "glasses")
-    c.save()
-    return output_path
+    gdir = resolve_glasses_dir(glasses_dir)
+    return _write_a5(recipe_data, output_path, gdir, image_cache, optimize)
+
+
+def _write_a5(
+    recipe: RecipeData | Recipe | CardLayout,
+    output_path: PdfOutput,
+    glasses_dir: Path,
+    image_cache: ImageCache | None,
+    optimize: bool,
+) -> Path | BinaryIO | bytes:
+    from reportlab.lib.pagesizes import A5
+    from reportlab.pdfgen import canvas
+    from .layout import draw_recipe_area
+
+    target = pdf_target(output_path)
+    with optimized_output(optimize):
+        c = canvas.Canvas(
+            str(target) if isinstance(target, Path) else target,
+            pagesize=A5,
+            pageCompression=1 if optimize else None,
+        )
+        draw_recipe_area(c, 0, 0, recipe, glasses_dir, image_cache)
+        with stage("save"):
+            c.save()
+    return pdf_result(target, output_path)
+
+
+class RecipeBatchError(Exception):
+    """Mindestens ein Rezept eines Batch‑Laufs ist fehlgeschlagen.
+
+    ``failures`` enthält ``(json_datei, fehler)``, ``pdfs`` alle trotzdem erzeugten PDFs.
+    """
+
+    def __init__(self, failures: List[Tuple[Path, BaseException]], pdfs: List[Path]) -> None:
+        self.failures = failures
+        self.pdfs = pdfs
+        lines = "\n".join(f"  • {js.name}: {err}" for js, err in failures)
+        super().__init__(f"{len(failures)} Rezept(e) fehlgeschlagen:\n{lines}")
 
 
-def generate_pdfs_from_folder(recipes_folder: str | Path, output_dir: str | Path | None = None, glasses_dir: str | Path | None = None):
+def _render_json(
+    js: Path | RecipeData | Recipe,
+    output_path: Path,
+    glasses_dir: str | Path | None,
+    image_cache: ImageCache | None = None,
+    optimize: bool = False,
+) -> Tuple[Optional[Path], Optional[BaseException]]:
+    """Rendert eine JSON‑Datei (oder ein bereits geladenes Rezept).
+
+    Fehler werden zurückgegeben statt geworfen – auch aus einem Worker‑Prozess.
+    """
+    try:
+        if isinstance(js, Path):
+            rec = load_recipe_json(js)
+            auto_img = auto_same_name(js)
+            if not rec.get("image_path") and auto_img:
+                rec["image_path"] = str(auto_img)
+        else:
+            rec = js
+        pdf = create_cocktail_pdf(
+            title=rec["title"],
+            ingredients=rec["ingredients"],
+            steps=rec["steps"],
+            image_path=rec.get("image_path"),
+            glass=rec.get("glass"),
+            glasses_dir=glasses_dir,
+            image_cache=image_cache,
+            output_path=output_path,
+            optimize=optimize,
+        )
+        return pdf, None
+    except Exception as exc:
+        return None, exc
+
+
+def _render_card(
+    card: CardLayout | BaseException,
+    output_path: Path,
+    glasses_dir: Path,
+    optimize: bool = False,
+) -> Tuple[Optional[Path], Optional[BaseException]]:
+    """Wie ``_render_json`` für eine vorausgeladene Karte (oder den Fehler beim Laden)."""
+    if isinstance(card, BaseException):
+        return None, card
+    try:
+        return _write_a5(card, output_path, glasses_dir, None, optimize), None
+    except Exception as exc:
+        return None, exc
+
+
+def generate_pdfs_from_folder(
+    recipes_folder: str | Path,
+    output_dir: str | Path | None = None,
+    glasses_dir: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    workers: int | None = None,
+    incremental: bool = False,
+    optimize: bool = False,
+    preflight: bool = False,
+    query: str | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> List[Path]:
+    """Erzeugt ein A5‑PDF pro JSON (alphabetisch) bzw. pro Eintrag einer Katalogdatei.
+
+    Mit ``workers > 1`` wird auf einem Prozess‑Pool gerendert; die Reihenfolge
+    des Ergebnisses bleibt gleich. Sonst laufen Datei‑ und Bildzugriffe der nächsten
+    Karten in Threads dem Zeichnen voraus (siehe ``prefetch_cards``). Fehlerhafte
+    Rezepte brechen den Lauf nicht ab – am Ende wird ``RecipeBatchError`` mit allen
+    Fehlern geworfen.
+
+    ``incremental=True`` führt ein Manifest im Ausgabeordner: Karten mit
+    unveränderten Eingaben werden übersprungen, PDFs gelöschter JSONs entfernt.
+
+    ``optimize=True`` schreibt möglichst kleine PDFs und loggt am Ende, wie sich
+    die Bytes auf Bilder, Schriften, Inhalt und Overhead verteilen.
+
+    ``preflight=True`` prüft vorab den ganzen Ordner (siehe ``preflight_recipes``) und bricht
+    mit ``RecipeBatchError`` über alle Fehler ab, bevor irgendetwas gerendert wird.
+
+    ``query`` beschränkt den Lauf auf passende Rezepte (siehe ``RecipeIndex.query``);
+    PDFs der übrigen bleiben auch mit ``incremental`` liegen.
+
+    ``progress`` erhält ``ProgressEvent``s (geladen, gezeichnet, Seite, gespeichert) mit
+    Karten/s und Restdauer. Wird ``cancel`` gesetzt, endet der Lauf nach der aktuellen
+    Karte mit ``RenderCancelled``; fertige PDFs bleiben (mit ``incremental`` auch im
+    Manifest), ein erneuter Lauf setzt also dort fort. Mit ``workers`` werden bereits
+    laufende Pakete noch zu Ende geschrieben, aber nicht mehr gemeldet.
+    """
     recipes_folder = Path(recipes_folder).expanduser().resolve()
-    out_dir = Path(output_dir).expanduser().resolve() if output_dir else recipes_folder
+    from_catalogue = is_catalogue(recipes_folder)
+    refresh_directory_indexes()
+    if preflight and not from_catalogue:  # Kataloge wurden beim Kompilieren geprüft
+        from .preflight import preflight_recipes
+
+        report = preflight_recipes(recipes_folder, glasses_dir, workers, query=query)
+        for issue in report.warnings:
+            log.warning("%s: %s", issue.file.name, issue.message)
+        report.raise_for_errors()
+    default_out = recipes_folder.parent if from_catalogue else recipes_folder
+    out_dir = Path(output_dir).expanduser().resolve() if output_dir else default_out
     out_dir.mkdir(parents=True, exist_ok=True)
-    pdfs: List[Path] = []
-    for js in recipes_folder.glob("*.json"):
-        rec = load_recipe_json(js)
-        auto_img = auto_same_name(js)
-        if not rec.get("image_path") and auto_img:
-            rec["image_path"] = str(auto_img)
-        pdfs.append(
-            create_cocktail_pdf(
-                title=rec["title"],
-                ingredients=rec["ingredients"],
-                steps=rec["steps"],
-                image_path=rec.get("image_path"),
-                glass=rec.get("glass"),
-                glasses_dir=glasses_dir,
-                output_path=out_dir / f"{js.stem}.pdf",
+    gdir = resolve_glasses_dir(glasses_dir)
+    sources: List[Path | RecipeData]
+    if from_catalogue:
+        if incremental:
+            raise ValueError("incremental=True benötigt einen Rezeptordner")
+        if query is not None:
+            raise ValueError("query benötigt einen Rezeptordner")
+        with RecipeCatalogue(recipes_folder) as catalogue:
+            entries = list(catalogue.items(same_name=True))
+        # Namen wie die ursprünglichen JSON‑Dateien (für Ausgabe und Fehlermeldungen)
+        jsons = [Path(f"{name}.json") for name, _ in entries]
+        sources = [rec for _, rec in entries]
+    else:
+        jsons = recipe_files(recipes_folder, query)
+        sources = list(jsons)
+    targets = [out_dir / f"{js.stem}.pdf" for js in jsons]
+
+    todo = list(range(len(jsons)))
+    manifest: Optional[BuildManifest] = None
+    fingerprints: List[str] = []
+    if incremental:
+        manifest = BuildManifest.load(out_dir)
+        fingerprints = [manifest.recipe_fingerprint(js, gdir, image_cache=image_cache) for js in jsons]
+        if optimize:
+            fingerprints = [manifest.combine(fp, "optimize") for fp in fingerprints]
+        todo = [i for i in todo if not manifest.is_current(targets[i], fingerprints[i])]
+
+    todo_jsons = [sources[i] for i in todo]
+    todo_targets = [targets[i] for i in todo]
+    tracker = Progress(progress, cancel, total=len(todo))
+    results: Dict[int, Tuple[Optional[Path], Optional[BaseException]]] = {}
+
+    def finished(i: int, result: Tuple[Optional[Path], Optional[BaseException]]) -> None:
+        results[i] = result
+        if result[0] is None:
+            tracker.emit(FAILED, sources[i] if isinstance(sources[i], Path) else None)
+            return
+        tracker.emit(DRAWN)
+        tracker.emit(PAGE)
+        tracker.emit(SAVED, result[0])
+
+    cancelled = False
+    if workers and workers > 1 and len(todo) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Worker nutzen jeweils ihren eigenen prozessweiten IMAGE_CACHE
+        chunksize = max(1, len(todo) // (workers * 4))
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            rendered = pool.map(
+                _render_json, todo_jsons, todo_targets, repeat(glasses_dir), repeat(None), repeat(optimize),
+                chunksize=chunksize,
             )
-        )
-    return pdfs
\ No newline at end of file
+            for i, result in zip(todo, rendered):
+                # Geladen wurde im Worker – gemeldet wird, sobald das Ergebnis da ist
+                tracker.emit(LOADED, sources[i] if isinstance(sources[i], Path) else None)
+                finished(i, result)
+                if tracker.cancelled:
+                    cancelled = True
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    else:
+        from .prefetch import load_card, prefetch
+
+        def load(source: Path | RecipeData) -> CardLayout | BaseException:
+            try:
+                return load_card(source, gdir, image_cache, same_name=True)
+            except Exception as exc:  # wird wie ein Renderfehler gemeldet
+                return exc
+
+        cards = prefetch(todo_jsons, load)
+        try:
+            for i, source, out in zip(todo, todo_jsons, todo_targets):
+                if tracker.cancelled:
+                    cancelled = True
+                    break
+                card = next(cards)
+                tracker.emit(LOADED, source if isinstance(source, Path) else None)
+                finished(i, _render_card(card, out, gdir, optimize))
+        finally:
+            cards.close()  # verwirft noch nicht begonnenes Vorausladen
+
+    pdfs: List[Path] = []
+    failures: List[Tuple[Path, BaseException]] = []
+    skipped = set(todo) - results.keys()  # nach Abbruch nicht mehr gerendert
+    for i, js in enumerate(jsons):
+        if i in skipped:
+            continue
+        pdf, err = results.get(i, (targets[i], None))
+        if err is not None:
+            failures.append((js, err))
+            continue
+        pdfs.append(pdf)
+        if manifest is not None and i in results:
+            manifest.record(targets[i], fingerprints[i], js)
+    if manifest is not None:
+        manifest.prune(recipes_folder, targets)
+        manifest.save()
+    if cancelled:
+        raise RenderCancelled(pdfs)
+    if optimize:
+        log_size_breakdown(out_dir.name, pdfs)
+    if failures:
+        raise RecipeBatchError(failures, pdfs)
+    return pdfs
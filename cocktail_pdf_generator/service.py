@@ -0,0 +1,376 @@
+"""Lokaler HTTP‑Renderdienst (nur Standardbibliothek).
+
+Endpunkte::
+
+    POST /render/single      Rezept‑JSON (Objekt)            → A5‑PDF
+    POST /render/double      Liste von Rezepten              → 2 Rezepte je A4‑Seite
+    POST /render/quadruple   Liste von Rezepten              → 4 Rezepte je A4‑Seite
+    GET  /metrics            Zähler und Latenzen (JSON)
+    GET  /health
+
+Start::
+
+    python -m cocktail_pdf_generator.service --port 8750 --workers 4
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .definition import RecipeData, recipe_from_dict, recipe_type_errors
+from .lookup import resolve_glasses_dir
+
+__all__ = ["RenderService", "run_service"]
+
+log = logging.getLogger(__name__)
+
+KINDS = ("single", "double", "quadruple")
+MAX_BODY = 1024 * 1024
+LATENCY_WINDOW = 1000  # letzte N Anfragen je Art für die Perzentile
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+# ---------------------------------------------------------------------------
+# Worker‑Prozesse: einmal aufwärmen, dann nur noch rendern
+# ---------------------------------------------------------------------------
+
+def _warm_worker(glasses_dir: str) -> None:
+    """Initializer: Zeichenmodule importieren und die Glasbilder vorbereiten."""
+    from . import layout  # noqa: F401 – lädt reportlab, Pillow und die Schriftmetriken
+    from .image_utils import IMAGE_CACHE
+    from .lookup import GLASS_EXT
+
+    for path in Path(glasses_dir).glob("*"):
+        if path.suffix.lower() in GLASS_EXT:
+            IMAGE_CACHE.get(path)
+
+
+def _render_job(kind: str, recipes: List[RecipeData], glasses_dir: str) -> bytes:
+    """Rendert komplett im Speicher und liefert die PDF‑Bytes."""
+    if kind == "single":
+        from .recipe_loader import create_cocktail_pdf
+
+        rec = recipes[0]
+        return create_cocktail_pdf(
+            title=rec["title"],
+            ingredients=rec["ingredients"],
+            steps=rec["steps"],
+            image_path=rec.get("image_path"),
+            glass=rec.get("glass"),
+            glasses_dir=glasses_dir,
+        )
+    if kind == "double":
+        from .pdf_double_a4 import generate_double_a4_sheet
+
+        return generate_double_a4_sheet(recipes, None, glasses_dir)
+    from .quadrupel_a4_sheet import generate_quadruple_a4_sheet
+
+    return generate_quadruple_a4_sheet(recipes, None, glasses_dir)
+
+
+# ---------------------------------------------------------------------------
+# Kennzahlen
+# ---------------------------------------------------------------------------
+
+class ServiceMetrics:
+    def __init__(self) -> None:
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rejected = 0
+        self.in_flight = 0
+        self.latency: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.queue_wait: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+    @staticmethod
+    def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+        return {"p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99), "max_ms": pct(1.0)}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "latency": {k: self._percentiles(v) for k, v in self.latency.items()},
+            "queue_wait": {k: self._percentiles(v) for k, v in self.queue_wait.items()},
+        }
+
+
+# ---------------------------------------------------------------------------
+# HTTP‑Dienst
+# ---------------------------------------------------------------------------
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    """asyncio‑Server vor einem vorgestarteten Prozess‑Pool.
+
+    Höchstens ``max_concurrency`` Aufträge rendern gleichzeitig (Standard: ``workers``),
+    höchstens ``max_pending`` warten insgesamt (Standard: 4 × ``max_concurrency``);
+    darüber hinaus antwortet der Dienst sofort mit ``503`` und ``Retry-After``.
+    ``image_path`` aus Anfragen wird nur für Dateien unterhalb von ``image_root``
+    beachtet – ohne ``image_root`` gar nicht.
+    """
+
+    def __init__(
+        self,
+        glasses_dir: str | Path | None = None,
+        workers: int | None = None,
+        max_concurrency: int | None = None,
+        max_pending: int | None = None,
+        image_root: str | Path | None = None,
+    ) -> None:
+        self.glasses_dir = str(resolve_glasses_dir(glasses_dir).expanduser().resolve())
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self.max_pending = max_pending or 4 * self.max_concurrency
+        self.image_root = Path(image_root).expanduser().resolve() if image_root else None
+        self.metrics = ServiceMetrics()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -- Lebenszyklus --------------------------------------------------------
+
+    async def _start_pool(self) -> None:
+        """Neuer Worker‑Pool; ein Auftrag je Worker, damit alle Prozesse jetzt (und nicht
+        bei der ersten Anfrage) starten und aufgewärmt sind."""
+        pool = self._pool = ProcessPoolExecutor(self.workers, initializer=_warm_worker, initargs=(self.glasses_dir,))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, os.getpid) for _ in range(self.workers)))
+
+    async def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Ersetzt einen abgestürzten Pool – nur einmal, auch wenn mehrere Anfragen scheitern."""
+        if self._pool is not broken:
+            return
+        log.error("Worker‑Pool abgestürzt – wird neu gestartet")
+        broken.shutdown(wait=False, cancel_futures=True)
+        await self._start_pool()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8750) -> Tuple[str, int]:
+        """Startet und wärmt alle Worker, dann den Server. Liefert ``(host, port)``."""
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        await self._start_pool()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        addr = self._server.sockets[0].getsockname()
+        log.info("Renderdienst auf http://%s:%d (%d Worker)", addr[0], addr[1], self.workers)
+        return addr[0], addr[1]
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None, "erst start() aufrufen"
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    # -- Anfragen ------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _HTTPError as exc:
+                    await self._respond(writer, exc.status, json.dumps({"error": str(exc)}).encode(), close=True)
+                    return
+                if request is None:
+                    return
+                method, path, body, keep_alive = request
+                status, payload, content_type, headers = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, content_type, headers, close=not keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes, bool]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as exc:
+            if not exc.partial:
+                return None  # Verbindung sauber geschlossen
+            raise
+        except asyncio.LimitOverrunError:
+            raise _HTTPError(413, "Header zu groß")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise _HTTPError(400, "ungültige Anfragezeile")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise _HTTPError(400, "ungültige Content-Length")
+        if length > MAX_BODY:
+            raise _HTTPError(413, f"Anfrage größer als {MAX_BODY} Bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+        return method, path.split("?", 1)[0], body, keep_alive
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: bytes,
+        content_type: str = "application/json",
+        headers: Dict[str, str] | None = None,
+        close: bool = False,
+    ) -> None:
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                f"Content-Length: {len(payload)}", f"Connection: {'close' if close else 'keep-alive'}"]
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        # PDF in Blöcken schreiben; drain() bremst, wenn der Client langsam liest
+        for start in range(0, len(payload), 64 * 1024):
+            writer.write(payload[start:start + 64 * 1024])
+            await writer.drain()
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, bytes, str, Dict[str, str]]:
+        if path == "/health":
+            return 200, b'{"status": "ok"}', "application/json", {}
+        if path == "/metrics":
+            return 200, json.dumps(self.metrics.as_dict()).encode(), "application/json", {}
+        kind = path[len("/render/"):] if path.startswith("/render/") else None
+        if kind not in KINDS:
+            return 404, b'{"error": "unbekannter Pfad"}', "application/json", {}
+        if method != "POST":
+            return 405, b'{"error": "nur POST"}', "application/json", {"Allow": "POST"}
+        try:
+            recipes = self._parse_recipes(kind, body)
+        except ValueError as exc:
+            return 400, json.dumps({"error": str(exc)}).encode(), "application/json", {}
+        return await self._render(kind, recipes)
+
+    def _parse_recipes(self, kind: str, body: bytes) -> List[RecipeData]:
+        data = json.loads(body.decode("utf-8"))
+        items = [data] if kind == "single" and isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            raise ValueError("erwartet ein Rezept‑Objekt bzw. eine nicht leere Liste von Rezepten")
+        if kind == "single" and len(items) != 1:
+            raise ValueError("/render/single erwartet genau ein Rezept")
+        recipes = []
+        for idx, item in enumerate(items):
+            if not isinstance(item, dict):
+                raise ValueError(f"Rezept {idx} ist kein Objekt")
+            errors = recipe_type_errors(item)
+            if errors:
+                raise ValueError(f"Rezept {idx}: {'; '.join(errors)}")
+            rec = recipe_from_dict(item, f"Rezept {idx}")
+            rec["image_path"] = self._allowed_image(rec.get("image_path"))
+            recipes.append(rec)
+        return recipes
+
+    def _allowed_image(self, image_path: Any) -> Optional[str]:
+        if not image_path or self.image_root is None:
+            return None
+        path = (self.image_root / str(image_path)).resolve()
+        return str(path) if path.is_relative_to(self.image_root) else None
+
+    async def _render(self, kind: str, recipes: List[RecipeData]) -> Tuple[int, bytes, str, Dict[str, str]]:
+        assert self._pool is not None and self._slots is not None, "erst start() aufrufen"
+        m = self.metrics
+        m.requests[kind] += 1
+        if self._pending >= self.max_pending:
+            m.rejected += 1
+            return 503, b'{"error": "ausgelastet"}', "application/json", {"Retry-After": "1"}
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            async with self._slots:
+                m.queue_wait[kind].append(time.perf_counter() - start)
+                m.in_flight += 1
+                pool = self._pool
+                try:
+                    loop = asyncio.get_running_loop()
+                    pdf = await loop.run_in_executor(pool, _render_job, kind, recipes, self.glasses_dir)
+                finally:
+                    m.in_flight -= 1
+        except BrokenProcessPool:
+            await self._restart_pool(pool)
+            m.errors[kind] += 1
+            return 500, b'{"error": "Worker abgestuerzt"}', "application/json", {}
+        except Exception as exc:
+            m.errors[kind] += 1
+            return 500, json.dumps({"error": str(exc)}).encode(), "application/json", {}
+        finally:
+            self._pending -= 1
+        m.latency[kind].append(time.perf_counter() - start)
+        headers = {"Content-Disposition": f'inline; filename="{kind}.pdf"'}
+        return 200, pdf, "application/pdf", headers
+
+
+# ---------------------------------------------------------------------------
+# Start als Prozess
+# ---------------------------------------------------------------------------
+
+def run_service(host: str = "127.0.0.1", port: int = 8750, **kwargs: Any) -> None:
+    """Blockierend: startet ``RenderService(**kwargs)`` und bedient Anfragen bis Strg+C."""
+
+    async def main() -> None:
+        service = RenderService(**kwargs)
+        await service.start(host, port)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8750)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument("--max-pending", type=int)
+    parser.add_argument("--glasses", type=Path)
+    parser.add_argument("--image-root", type=Path)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run_service(
+        args.host, args.port, glasses_dir=args.glasses, workers=args.workers,
+        max_concurrency=args.max_concurrency, max_pending=args.max_pending, image_root=args.image_root,
+    )
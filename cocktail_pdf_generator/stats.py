@@ -0,0 +1,101 @@
+from __future__ import annotations
+import cProfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from threading import Lock
+from typing import Callable, ContextManager, Dict, Iterator, Optional
+
+__all__ = ["RenderStats", "collect_stats", "stage"]
+
+StageCallback = Callable[[str, float], None]
+
+
+class RenderStats:
+    """Zähler und aufsummierte Dauer je Pipeline‑Stufe.
+
+    Stufen: ``load`` (JSON), ``lookup`` (Bildsuche im Dateisystem), ``image-prepare``
+    (Bitmap dekodieren/skalieren bzw. aus dem Cache holen), ``image-embed`` (Bild in die
+    Seite setzen), ``text`` (Text der Karte), ``save`` (``canvas.save()``). Jede Stufe
+    zählt einmal je Bild bzw. Karte.
+    ``on_stage`` wird – falls gesetzt – nach jeder Stufe mit ``(stufe, sekunden)`` aufgerufen.
+
+    Beim Vorausladen laufen ``load``, ``lookup`` und ``image-prepare`` parallel zum Zeichnen;
+    die Summe der Stufen kann dann die Laufzeit übersteigen.
+    """
+
+    def __init__(self, on_stage: StageCallback | None = None) -> None:
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.on_stage = on_stage
+        self._lock = Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.counts[name] += 1
+            self.seconds[name] += seconds
+        if self.on_stage is not None:
+            self.on_stage(name, seconds)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: {"count": self.counts[name], "seconds": self.seconds[name]} for name in self.counts}
+
+    def report(self) -> str:
+        total = sum(self.seconds.values()) or 1.0
+        lines = [f"{'Stufe':<13} {'Anzahl':>8} {'Sekunden':>10} {'Anteil':>7}"]
+        for name in sorted(self.seconds, key=self.seconds.get, reverse=True):
+            secs = self.seconds[name]
+            lines.append(f"{name:<13} {self.counts[name]:>8} {secs:>10.3f} {secs / total:>6.1%}")
+        return "\n".join(lines)
+
+
+_active: Optional[RenderStats] = None
+_DISABLED: ContextManager[None] = nullcontext()
+
+
+class _Timed:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: RenderStats, name: str) -> None:
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stats.add(self.name, time.perf_counter() - self.start)
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Misst eine Pipeline‑Stufe – ohne aktive Sammlung ein geteilter No‑Op‑Kontext."""
+    if _active is None:
+        return _DISABLED
+    return _Timed(_active, name)
+
+
+@contextmanager
+def collect_stats(
+    stats: RenderStats | None = None,
+    profile_to: str | Path | None = None,
+) -> Iterator[RenderStats]:
+    """Sammelt Stufen‑Statistiken für alles, was im ``with``‑Block gerendert wird.
+
+    Mit ``profile_to`` läuft zusätzlich cProfile; die Daten landen dort
+    (auswertbar mit ``python -m pstats``). Worker‑Prozesse (``workers=``) werden
+    nicht erfasst.
+    """
+    global _active
+    stats = stats if stats is not None else RenderStats()
+    previous, _active = _active, stats
+    profiler = cProfile.Profile() if profile_to else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield stats
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(str(profile_to))
+        _active = previous
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import List, Tuple
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+__all__ = ["string_width", "wrap_text", "fit_text", "clear_text_caches"]
+
+# Viele Karten teilen identische Zeilen („• Eiswürfel“) – Messen und Umbrechen
+# werden deshalb prozessweit gemerkt.
+WIDTH_CACHE_SIZE = 1 << 16
+WRAP_CACHE_SIZE = 1 << 14
+SIZE_STEP = 0.5  # Schrittweite beim Verkleinern (pt)
+
+
+# ---------------------------------------------------------------------------
+# Messen
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def string_width(font: str, size: float, text: str) -> float:
+    """Breite von ``text`` in pt – gemerkt je ``(Schrift, Größe, Text)``."""
+    return stringWidth(text, font, size)
+
+
+# ---------------------------------------------------------------------------
+# Umbrechen und Einpassen
+# ---------------------------------------------------------------------------
+
+def _split_word(word: str, font: str, size: float, width: float) -> List[str]:
+    """Zerlegt ein Wort, das allein breiter als ``width`` ist, zeichenweise."""
+    parts: List[str] = []
+    current = ""
+    for ch in word:
+        if current and string_width(font, size, current + ch) > width:
+            parts.append(current)
+            current = ch
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_text(font: str, size: float, text: str, width: float, indent: float = 0.0) -> Tuple[str, ...]:
+    """Bricht ``text`` an Leerzeichen auf Zeilen von höchstens ``width`` pt um.
+
+    Folgezeilen werden um ``indent`` eingerückt (hängender Einzug für „• “ und „1. “)
+    und sind entsprechend schmaler. Passt der Text, kommt er unverändert zurück.
+    """
+    if string_width(font, size, text) <= width:
+        return (text,)
+    lines: List[str] = []
+    current = ""
+    for word in text.split():
+        limit = width if not lines else width - indent
+        candidate = f"{current} {word}" if current else word
+        if string_width(font, size, candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+            limit = width - indent
+        pieces = _split_word(word, font, size, limit) if string_width(font, size, word) > limit else [word]
+        lines.extend(pieces[:-1])
+        current = pieces[-1]
+    if current:
+        lines.append(current)
+    return tuple(lines)
+
+
+def fit_text(font: str, size: float, text: str, width: float, min_size: float) -> Tuple[float, Tuple[str, ...]]:
+    """Größte Schriftgröße zwischen ``size`` und ``min_size``, bei der ``text`` einzeilig passt.
+
+    Reicht auch ``min_size`` nicht, wird bei ``min_size`` umgebrochen.
+    """
+    current = size
+    while current > min_size and string_width(font, current, text) > width:
+        current = max(min_size, current - SIZE_STEP)
+    return current, wrap_text(font, current, text, width)
+
+
+def clear_text_caches() -> None:
+    """Leert die Mess‑ und Umbruch‑Caches (z. B. nach dem Registrieren neuer Schriften)."""
+    string_width.cache_clear()
+    wrap_text.cache_clear()
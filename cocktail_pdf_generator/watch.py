@@ -0,0 +1,334 @@
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from .definition import RecipeData
+from .lookup import GLASS_EXT, refresh_directory_indexes, resolve_glasses_dir
+from .manifest import BuildManifest
+from .pdf_collection import generate_collection_pdf
+from .pdf_double_a4 import generate_double_a4_sheet
+from .pdf_parts import SHEET_KINDS, can_stitch, render_sheet_part, stitch_pdfs
+from .quadrupel_a4_sheet import generate_quadruple_a4_sheet
+from .recipe_loader import RecipeBatchError, generate_pdfs_from_folder, load_recipe_json, recipe_files
+
+if TYPE_CHECKING:
+    from .image_utils import ImageCache
+
+__all__ = ["BuildResult", "WatchBuilder", "watch_recipes"]
+
+log = logging.getLogger(__name__)
+
+# Nur Änderungen an Rezepten und Bildern lösen einen Build aus (nicht die eigenen PDFs)
+WATCH_SUFFIXES = frozenset((".json", *GLASS_EXT))
+PARTS_DIR = ".cocktail-parts"
+
+
+def _relevant(name: str) -> bool:
+    # Versteckte Dateien sind eigene Buchführung (Manifest, Suchindex) – keine Eingaben
+    return not name.startswith(".") and os.path.splitext(name)[1].lower() in WATCH_SUFFIXES
+
+
+# ---------------------------------------------------------------------------
+# Dateisystem beobachten: inotify (Linux, per ctypes) oder Polling
+# ---------------------------------------------------------------------------
+
+# IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_IN_MASK = 0x002 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+_IN_EVENT = struct.Struct("iIII")
+
+
+class _InotifyWatcher:
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.fd = fd
+        self._dirs: Set[str] = set()
+
+    def watch(self, dirs: Iterable[Path]) -> None:
+        for d in map(str, dirs):
+            if d in self._dirs or not os.path.isdir(d):
+                continue
+            if self._libc.inotify_add_watch(self.fd, os.fsencode(d), _IN_MASK) < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch {d}")
+            self._dirs.add(d)
+
+    def _drain(self) -> bool:
+        relevant = False
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            pos = 0
+            while pos < len(buf):
+                _wd, _mask, _cookie, length = _IN_EVENT.unpack_from(buf, pos)
+                pos += _IN_EVENT.size
+                name = buf[pos:pos + length].rstrip(b"\0")
+                pos += length
+                relevant = relevant or _relevant(os.fsdecode(name))
+
+    def wait(self, timeout: float) -> bool:
+        """``True``, sobald innerhalb von ``timeout`` Sekunden eine relevante Änderung kam."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain():
+                return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _PollWatcher:
+    """Fallback ohne inotify: vergleicht ``(mtime, Größe)`` aller relevanten Dateien."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._dirs: List[str] = []
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+
+    def watch(self, dirs: Iterable[Path]) -> None:
+        new = [d for d in map(str, dirs) if d not in self._dirs]
+        if new:
+            self._dirs += new
+            self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for d in self._dirs:
+            try:
+                with os.scandir(d) as entries:
+                    for e in entries:
+                        if _relevant(e.name) and e.is_file():
+                            st = e.stat()
+                            snapshot[e.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def _open_watcher(use_inotify: bool, poll_interval: float) -> _InotifyWatcher | _PollWatcher:
+    if use_inotify:
+        try:
+            return _InotifyWatcher()
+        except (OSError, AttributeError) as exc:  # kein Linux / keine libc mit inotify
+            log.info("inotify nicht verfügbar (%s) – beobachte per Polling", exc)
+    return _PollWatcher(poll_interval)
+
+
+# ---------------------------------------------------------------------------
+# Builds mit warmen Caches: nur geänderte Karten und Bogenseiten
+# ---------------------------------------------------------------------------
+
+class BuildResult(NamedTuple):
+    cards: List[str]              # neu gerenderte Einzel‑PDFs
+    pages: Dict[str, List[int]]   # neu gerenderte Seiten (0‑basiert) je Bogenart
+
+
+class WatchBuilder:
+    """Baut Einzelkarten, Sammel‑PDF und 2er/4er‑Bögen eines Rezeptordners inkrementell.
+
+    Einzelkarten laufen über das Manifest von ``generate_pdfs_from_folder``. Bögen
+    werden seitenweise als Teil‑PDFs unter ``.cocktail-parts`` gehalten (benannt
+    nach dem Fingerabdruck ihrer Rezepte) und mit PyPDF2 zusammengefügt; ohne
+    PyPDF2 werden Sammel‑PDF und Bögen als Ganzes neu erzeugt.
+    """
+
+    def __init__(
+        self,
+        recipes_folder: str | Path,
+        output_dir: str | Path,
+        glasses_dir: str | Path | None = None,
+        image_cache: ImageCache | None = None,
+        collection_name: str | None = "alle_rezepte_gesamt.pdf",
+        double_name: str | None = "cocktails_zwei_auf_a4.pdf",
+        quadruple_name: str | None = "cocktails_vier_auf_a4.pdf",
+    ) -> None:
+        self.recipes_folder = Path(recipes_folder).expanduser().resolve()
+        self.output_dir = Path(output_dir).expanduser().resolve()
+        self.glasses_dir = resolve_glasses_dir(glasses_dir).expanduser().resolve()
+        self.image_cache = image_cache
+        self.collection_name = collection_name
+        self.sheet_names = {"double": double_name, "quadruple": quadruple_name}
+        self.parts_dir = self.output_dir / PARTS_DIR
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        self._hashes = BuildManifest.load(self.parts_dir)
+        self._stitched: Dict[str, List[Path]] = {}
+
+    def watched_dirs(self) -> Set[Path]:
+        """Rezept‑ und Glasordner sowie alle Ordner, auf die ein ``image_path`` zeigt."""
+        dirs = {self.recipes_folder, self.glasses_dir}
+        for entry in self._hashes.files.values():
+            if entry.get("image_path"):
+                dirs.add(Path(entry["image_path"]).expanduser().absolute().parent)
+        return dirs
+
+    def build(self) -> BuildResult:
+        refresh_directory_indexes()
+        cards = self._build_cards()
+        jsons = recipe_files(self.recipes_folder)
+        if self.collection_name:
+            self._build_collection(jsons, cards)
+        pages: Dict[str, List[int]] = {}
+        fingerprints = [self._hashes.recipe_fingerprint(js, self.glasses_dir, False, self.image_cache) for js in jsons]
+        for kind, name in self.sheet_names.items():
+            if name:
+                pages[kind] = self._build_sheet(kind, self.output_dir / name, jsons, fingerprints)
+        self._hashes.save()
+        log.info(
+            "%d Karte(n) neu, Bogenseiten neu: %s",
+            len(cards), ", ".join(f"{k} {v}" for k, v in pages.items()) or "–",
+        )
+        return BuildResult(cards, pages)
+
+    # -- Einzelkarten + Sammel‑PDF ------------------------------------------
+
+    def _build_cards(self) -> List[str]:
+        before = BuildManifest.load(self.output_dir).outputs
+        try:
+            generate_pdfs_from_folder(
+                self.recipes_folder, self.output_dir, self.glasses_dir, self.image_cache, incremental=True
+            )
+        except RecipeBatchError as exc:
+            log.error("%s", exc)
+        after = BuildManifest.load(self.output_dir).outputs
+        return sorted(
+            name for name, entry in after.items()
+            if entry.get("source") and before.get(name) != entry
+        )
+
+    def _build_collection(self, jsons: List[Path], cards: List[str]) -> None:
+        output = self.output_dir / self.collection_name
+        if not can_stitch():
+            try:
+                generate_collection_pdf(self.recipes_folder, output, self.glasses_dir, image_cache=self.image_cache, incremental=True)
+            except RecipeBatchError as exc:
+                log.error("%s", exc)
+            return
+        parts = [p for p in (self.output_dir / f"{js.stem}.pdf" for js in jsons) if p.is_file()]
+        if cards or parts != self._stitched.get("collection") or not output.is_file():
+            stitch_pdfs(parts, output)
+            self._stitched["collection"] = parts
+
+    # -- Bögen ---------------------------------------------------------------
+
+    def _build_sheet(self, kind: str, output: Path, jsons: List[Path], fingerprints: List[str]) -> List[int]:
+        if not can_stitch():
+            generate = generate_double_a4_sheet if kind == "double" else generate_quadruple_a4_sheet
+            generate(self.recipes_folder, output, self.glasses_dir, self.image_cache, incremental=True)
+            return []
+
+        per_page = SHEET_KINDS[kind].per_page
+        # Ein leerer Ordner ergibt wie beim normalen Generator eine leere Seite
+        pages = [range(i, min(i + per_page, len(jsons))) for i in range(0, len(jsons), per_page)] or [range(0)]
+        parts: List[Path] = []
+        rebuilt: List[int] = []
+        for page_no, idxs in enumerate(pages):
+            fp = BuildManifest.combine(kind, *(fingerprints[i] for i in idxs))
+            part = self.parts_dir / f"{kind}-{fp}.pdf"
+            if not part.is_file():
+                recipes = [self._load_or_placeholder(jsons[i], output, page_no) for i in idxs]
+                render_sheet_part(kind, recipes, part, self.glasses_dir, self.image_cache)
+                rebuilt.append(page_no)
+            parts.append(part)
+
+        if rebuilt or parts != self._stitched.get(kind) or not output.is_file():
+            stitch_pdfs(parts, output)
+            self._stitched[kind] = parts
+        keep = set(parts)
+        for stale in self.parts_dir.glob(f"{kind}-*.pdf"):
+            if stale not in keep:
+                stale.unlink(missing_ok=True)
+        return rebuilt
+
+    @staticmethod
+    def _load_or_placeholder(js: Path, output: Path, page_no: int) -> RecipeData:
+        """Lädt ``js``; ein defektes Rezept wird geloggt und als Platzhalterkarte gezeichnet.
+
+        Die Teil‑PDF‑Datei ist nach dem Fingerabdruck der JSON benannt – sobald die
+        Datei repariert ist, wird die Seite also von selbst neu gebaut.
+        """
+        try:
+            return load_recipe_json(js)
+        except Exception as exc:
+            log.error("%s: Seite %d – %s nicht lesbar: %s", output.name, page_no + 1, js.name, exc)
+            return RecipeData(
+                title=js.stem,
+                ingredients=[],
+                steps=[f"Rezept konnte nicht geladen werden: {exc}"],
+                image_path=None,
+                glass=None,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Dauerbetrieb
+# ---------------------------------------------------------------------------
+
+def watch_recipes(
+    recipes_folder: str | Path,
+    output_dir: str | Path,
+    glasses_dir: str | Path | None = None,
+    image_cache: ImageCache | None = None,
+    debounce: float = 0.3,
+    poll_interval: float = 1.0,
+    use_inotify: bool = True,
+    stop: threading.Event | None = None,
+    on_build: Callable[[BuildResult], None] | None = None,
+) -> None:
+    """Baut einmal alles und danach bei jeder Änderung nur das Betroffene neu.
+
+    Läuft, bis ``stop`` gesetzt wird (oder ``KeyboardInterrupt``). Mehrere Änderungen
+    kurz hintereinander werden gesammelt: gebaut wird erst, wenn ``debounce``
+    Sekunden lang nichts mehr passiert ist. Bild‑ und Formular‑Caches, Schriften
+    und der Verzeichnis‑Index bleiben zwischen den Builds im Prozess erhalten.
+    """
+    builder = WatchBuilder(recipes_folder, output_dir, glasses_dir, image_cache)
+    watcher = _open_watcher(use_inotify, poll_interval)
+    try:
+        while True:
+            try:
+                result = builder.build()
+            except Exception:
+                log.exception("Build fehlgeschlagen")
+            else:
+                if on_build is not None:
+                    on_build(result)
+            watcher.watch(builder.watched_dirs())
+            while not watcher.wait(poll_interval):
+                if stop is not None and stop.is_set():
+                    return
+            while watcher.wait(debounce):
+                pass
+    finally:
+        watcher.close()
@@ -0,0 +1,31 @@
+import logging
+import sys
+from pathlib import Path
+
+from cocktail_pdf_generator import generate_quadruple_a4_sheet, select_recipes
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def main() -> int:
+    root = Path(__file__).parent
+    # z. B.: python drucke_auswahl.py glass:tumbler ingredient:gin
+    query = " ".join(sys.argv[1:])
+
+    treffer = select_recipes(root / "rezepte", query)
+    print(f"{len(treffer)} Rezept(e) für „{query}“")
+    if not treffer:
+        return 1
+    out = root / "pdfs"
+    out.mkdir(parents=True, exist_ok=True)
+    generate_quadruple_a4_sheet(
+        recipes_folder=root / "rezepte",
+        output_path=out / "auswahl_vier_auf_a4.pdf",
+        glasses_dir=root / "glasses",
+        query=query,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+from pathlib import Path
+
+from cocktail_pdf_generator import RecipeCatalogue, compile_catalogue
+
+root = Path(__file__).parent
+katalog = compile_catalogue(root / "rezepte", root / "rezepte.sqlite")
+
+with RecipeCatalogue(katalog) as rezepte:
+    print(f"Katalog erstellt: {katalog.relative_to(root)} ({len(rezepte)} Rezepte)")
@@ -1,15 +1,6 @@
 from pathlib import Path
-from PyPDF2 import PdfMerger
 
-from cocktail_pdf_generator import generate_pdfs_from_folder
-
-
-def merge_pdfs(pdf_paths: list[Path], output_path: Path) -> None:
-    merger = PdfMerger()
-    for pdf in pdf_paths:
-        merger.append(str(pdf))
-    merger.write(str(output_path))
-    merger.close()
+from cocktail_pdf_generator import generate_collection_pdf, print_progress
 
 
 def main() -> None:
@@ -18,16 +9,14 @@ def main() -> None:
     out = root / "pdfs"
     out.mkdir(parents=True, exist_ok=True)
 
-    # Einzelne PDFs generieren
-    pdfs = generate_pdfs_from_folder(rezepte, output_dir=out)
+    # Sammel-PDF und einzelne PDFs in einem Durchgang erzeugen
+    merged_pdf_path = out / "alle_rezepte_gesamt.pdf"
+    generate_collection_pdf(rezepte, merged_pdf_path, split_dir=out, incremental=True, progress=print_progress)
 
     print("\nErzeugte PDFs:")
-    for path in pdfs:
-        print(" •", path.relative_to(root))
+    for json_file in sorted(rezepte.glob("*.json")):
+        print(" •", (out / f"{json_file.stem}.pdf").relative_to(root))
 
-    # Sammel-PDF erzeugen
-    merged_pdf_path = out / "alle_rezepte_gesamt.pdf"
-    merge_pdfs(pdfs, merged_pdf_path)
     print("\nSammel-PDF erstellt:")
     print(" •", merged_pdf_path.relative_to(root))
 
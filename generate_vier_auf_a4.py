@@ -1,8 +1,13 @@
+import logging
+
 from cocktail_pdf_generator import generate_double_a4_sheet
 from cocktail_pdf_generator import generate_quadruple_a4_sheet
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 generate_quadruple_a4_sheet(
     recipes_folder="rezepte",
     output_path=".\pdfs\cocktails_vier_auf_a4.pdf",
-    glasses_dir="glasses"      # falls du den Glasordner umbenannt hast
+    glasses_dir="glasses",     # falls du den Glasordner umbenannt hast
+    incremental=True,          # nur neu erzeugen, wenn sich Rezepte/Bilder geändert haben
 )
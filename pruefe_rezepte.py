@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+from cocktail_pdf_generator import preflight_recipes
+
+
+def main() -> int:
+    root = Path(__file__).parent
+
+    # Alle Rezepte vorab prüfen – Fehler verhindern das Rendern, Warnungen nicht
+    report = preflight_recipes(root / "rezepte", glasses_dir=root / "glasses")
+    print(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import copy
+import pickle
+
+import pytest
+
+from cocktail_pdf_generator.definition import Recipe, recipe_from_dict, recipe_type_errors
+
+DATA = {
+    "title": "Gin Fizz",
+    "ingredients": ["5 cl Gin", "3 cl Zitronensaft"],
+    "steps": ["Shaken.", "Mit Soda auffüllen."],
+    "image_path": None,
+    "glass": "longdrink",
+}
+
+
+def test_recipe_reads_like_recipe_data():
+    rec = Recipe.from_data(DATA)
+    assert rec["title"] == "Gin Fizz"
+    assert rec.get("glass") == "longdrink"
+    assert rec.get("farbe", "rot") == "rot"
+    assert "steps" in rec and "farbe" not in rec
+    assert len(rec) == 5 and list(rec) == ["title", "ingredients", "steps", "image_path", "glass"]
+    assert {**rec}["ingredients"] == ("5 cl Gin", "3 cl Zitronensaft")
+    with pytest.raises(KeyError):
+        rec["farbe"]
+    with pytest.raises(KeyError):
+        rec["__slots__"]
+
+
+def test_round_trip_and_equality():
+    rec = Recipe.from_data(DATA)
+    assert rec.to_data() == DATA
+    assert Recipe.from_data(rec.to_data()) == rec
+    assert hash(Recipe.from_data(DATA)) == hash(rec)
+    assert Recipe.from_data(rec) is rec
+
+
+def test_recipe_is_immutable():
+    rec = Recipe.from_data(DATA)
+    with pytest.raises(AttributeError):
+        rec.title = "Tom Collins"
+    with pytest.raises(AttributeError):
+        del rec.glass
+    changed = rec.replace(title="Tom Collins")
+    assert (changed["title"], rec["title"]) == ("Tom Collins", "Gin Fizz")
+    assert changed["steps"] == rec["steps"]
+
+
+def test_strings_are_interned():
+    a = Recipe.from_data(DATA)
+    b = Recipe.from_data({**DATA, "ingredients": ["".join(["5 cl ", "Gin"])]})
+    assert a.ingredients[0] is b.ingredients[0]
+    assert a.glass is b.glass
+
+
+def test_pickle_and_copy():
+    rec = Recipe.from_data(DATA)
+    assert pickle.loads(pickle.dumps(rec)) == rec
+    assert copy.deepcopy(rec) == rec
+
+
+def test_recipe_from_dict_requires_fields():
+    assert recipe_from_dict(DATA, "x.json")["title"] == "Gin Fizz"
+    with pytest.raises(ValueError, match="x.json"):
+        recipe_from_dict({"title": "Nur Titel"}, "x.json")
+
+
+@pytest.mark.parametrize("changes, expected", [
+    ({}, []),
+    ({"title": "  "}, ["title muss ein nicht‑leerer Text sein"]),
+    ({"ingredients": "abc"}, ["ingredients muss eine Liste von Texten sein"]),
+    ({"steps": ["ok", None]}, ["steps muss eine Liste von Texten sein"]),
+    ({"image_path": 5, "glass": None}, ["image_path muss ein Text oder null sein"]),
+])
+def test_recipe_type_errors(changes, expected):
+    assert recipe_type_errors({**DATA, **changes}) == expected
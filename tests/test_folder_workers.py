@@ -0,0 +1,50 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator import generate_pdfs_from_folder
+from cocktail_pdf_generator.recipe_loader import RecipeBatchError
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    return folder
+
+
+def _text(pdf: Path) -> str:
+    from PyPDF2 import PdfReader
+
+    return "".join(page.extract_text() for page in PdfReader(str(pdf)).pages)
+
+
+def _run(folder: Path, out: Path, workers):
+    try:
+        return generate_pdfs_from_folder(folder, out, ROOT / "glasses", workers=workers), None
+    except RecipeBatchError as exc:
+        return exc.pdfs, exc
+
+
+def test_pool_matches_serial_order_and_content(folder, tmp_path):
+    pytest.importorskip("PyPDF2")
+    serial, _ = _run(folder, tmp_path / "serial", None)
+    pooled, _ = _run(folder, tmp_path / "pool", 2)
+    assert [p.name for p in pooled] == [p.name for p in serial] == [f"{js.stem}.pdf" for js in sorted(folder.glob("*.json"))]
+    assert [_text(p) for p in pooled] == [_text(p) for p in serial]
+
+
+def test_pool_reports_the_same_failures(folder, tmp_path):
+    (folder / "b-kaputt.json").write_text("{ kaputt", "utf-8")
+    (folder / "m-unvollstaendig.json").write_text('{"title": "Nur Titel"}', "utf-8")
+    serial_pdfs, serial = _run(folder, tmp_path / "serial", None)
+    pooled_pdfs, pooled = _run(folder, tmp_path / "pool", 2)
+
+    assert serial is not None and pooled is not None
+    assert [(js.name, type(err)) for js, err in pooled.failures] == [(js.name, type(err)) for js, err in serial.failures]
+    assert [js.name for js, _ in serial.failures] == ["b-kaputt.json", "m-unvollstaendig.json"]
+    assert [p.name for p in pooled_pdfs] == [p.name for p in serial_pdfs]
+    assert len(serial_pdfs) == len(list(folder.glob("*.json"))) - 2
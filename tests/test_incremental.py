@@ -0,0 +1,21 @@
+import shutil
+from pathlib import Path
+
+from cocktail_pdf_generator import generate_pdfs_from_folder
+from cocktail_pdf_generator.manifest import MANIFEST_NAME
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_second_incremental_run_in_recipes_folder(tmp_path):
+    """Ohne ``output_dir`` liegt das Manifest neben den Rezepten und darf nicht als Rezept gelten."""
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+
+    first = generate_pdfs_from_folder(folder, glasses_dir=ROOT / "glasses", incremental=True)
+    assert (folder / MANIFEST_NAME).is_file()
+    mtimes = {pdf: pdf.stat().st_mtime_ns for pdf in first}
+
+    second = generate_pdfs_from_folder(folder, glasses_dir=ROOT / "glasses", incremental=True)
+    assert second == first
+    assert {pdf: pdf.stat().st_mtime_ns for pdf in second} == mtimes
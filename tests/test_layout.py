@@ -0,0 +1,100 @@
+import logging
+from pathlib import Path
+
+from cocktail_pdf_generator.layout import (
+    BODY_FONT,
+    BODY_MIN_SIZE,
+    MARGIN,
+    TITLE_FONT,
+    TITLE_MIN_SIZE,
+    card_layout,
+    overflows,
+    text_layout,
+)
+from cocktail_pdf_generator.text_utils import fit_text, string_width, wrap_text
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _recipe(title="Negroni", ingredients=("3 cl Gin", "3 cl Campari"), steps=("Auf Eis rühren.",)):
+    return {"title": title, "ingredients": list(ingredients), "steps": list(steps), "glass": "tumbler"}
+
+
+# ---------------------------------------------------------------------------
+# Umbruch und Einpassen
+# ---------------------------------------------------------------------------
+
+def test_wrap_keeps_short_text_and_respects_width():
+    font, size = BODY_FONT
+    assert wrap_text(font, size, "kurz", 100) == ("kurz",)
+    text = "Limette achteln und zusammen mit dem Rohrzucker im Glas zerdrücken, dann Eis dazu."
+    lines = wrap_text(font, size, text, 120, indent=10)
+    assert len(lines) > 1
+    assert " ".join(lines).split() == text.split()
+    assert string_width(font, size, lines[0]) <= 120
+    assert all(string_width(font, size, line) <= 110 for line in lines[1:])  # hängender Einzug
+
+
+def test_wrap_splits_words_longer_than_the_line():
+    font, size = BODY_FONT
+    word = "Donaudampfschifffahrtsgesellschaftskapitän"
+    lines = wrap_text(font, size, word, 50)
+    assert "".join(lines) == word
+    assert all(string_width(font, size, line) <= 50 for line in lines)
+
+
+def test_fit_text_shrinks_before_wrapping():
+    font, size = TITLE_FONT
+    title = "Ein ziemlich langer Cocktailname"
+    width = string_width(font, size, title) * 0.9
+    fitted, lines = fit_text(font, size, title, width, TITLE_MIN_SIZE)
+    assert TITLE_MIN_SIZE <= fitted < size and lines == (title,)
+
+    fitted, lines = fit_text(font, size, title, width / 3, TITLE_MIN_SIZE)
+    assert fitted == TITLE_MIN_SIZE and len(lines) > 1
+
+
+# ---------------------------------------------------------------------------
+# Kartenlayout
+# ---------------------------------------------------------------------------
+
+def test_short_recipe_uses_default_sizes():
+    title, blocks = text_layout(_recipe())
+    assert [(line.size, line.text) for line in title] == [(TITLE_FONT[1], "Negroni")]
+    assert {line.size for block in blocks for line in block.lines} == {BODY_FONT[1]}
+    assert [block.heading for block in blocks] == ["Zutaten", "Zubereitung"]
+    assert not overflows(blocks)
+
+
+def test_multiline_title_pushes_body_down():
+    _, short = text_layout(_recipe())
+    title, long = text_layout(_recipe(title="Der allerlängste Cocktailname, den diese Karte je gesehen hat"))
+    assert len(title) > 1 and {line.size for line in title} == {TITLE_MIN_SIZE}
+    assert long[0].y < short[0].y
+
+
+def test_long_body_shrinks_until_it_fits():
+    steps = [f"Schritt {i}: gründlich mit viel Eis rühren und abseihen." for i in range(30)]
+    _, blocks = text_layout(_recipe(steps=steps))
+    sizes = {line.size for block in blocks for line in block.lines}
+    assert len(sizes) == 1 and BODY_MIN_SIZE <= sizes.pop() < BODY_FONT[1]
+    assert not overflows(blocks)
+    assert min(line.y for block in blocks for line in block.lines) >= MARGIN
+
+
+def test_overflow_is_detected_and_logged(caplog):
+    recipe = _recipe(steps=["Sehr langer Schritt " * 8] * 30)
+    _, blocks = text_layout(recipe)
+    assert {line.size for block in blocks for line in block.lines} == {BODY_MIN_SIZE}
+    assert overflows(blocks)
+    with caplog.at_level(logging.WARNING, logger="cocktail_pdf_generator.layout"):
+        card_layout(recipe, ROOT / "glasses")
+    assert "passt auch mit" in caplog.text
+
+
+def test_lines_beside_the_image_box_are_narrower():
+    ingredient = "Ein sehr langer Zutateneintrag, der auf einer Zeile keinesfalls Platz findet, egal wie breit"
+    _, blocks = text_layout(_recipe(ingredients=[ingredient] * 12))
+    lines = blocks[0].lines
+    widths = [string_width(line.font, line.size, line.text) for line in lines]
+    assert max(widths[:2]) < max(widths[-4:])
@@ -0,0 +1,31 @@
+import shutil
+from pathlib import Path
+
+from cocktail_pdf_generator.lookup import auto_same_name, find_glass_image, is_indexed_file
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_glass_created_after_first_lookup(tmp_path):
+    """Langlebige Prozesse (Service, Watcher) sollen später angelegte Glasbilder finden."""
+    gdir = tmp_path / "glasses"
+    gdir.mkdir()
+    shutil.copy(ROOT / "glasses" / "tumbler.png", gdir / "tumbler.png")
+
+    assert find_glass_image("tumbler", gdir) == gdir / "tumbler.png"
+    assert find_glass_image("coupe", gdir) is None
+
+    shutil.copy(ROOT / "glasses" / "martini.png", gdir / "coupe.png")
+    assert find_glass_image("coupe", gdir) == gdir / "coupe.png"
+
+
+def test_same_name_image_created_after_first_lookup(tmp_path):
+    recipe = tmp_path / "negroni.json"
+    recipe.write_text("{}", encoding="utf-8")
+    assert auto_same_name(recipe) is None
+    assert not is_indexed_file(tmp_path / "negroni.jpg")
+
+    shutil.copy(ROOT / "glasses" / "wine.png", tmp_path / "negroni.jpg")
+    assert auto_same_name(recipe) == tmp_path / "negroni.jpg"
+    assert is_indexed_file(tmp_path / "negroni.jpg")
+
@@ -0,0 +1,52 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator import generate_double_a4_sheet, generate_quadruple_a4_sheet, iter_recipes
+from cocktail_pdf_generator.pdf_parts import CHUNK_PAGES, _chunk_pages
+
+PdfReader = pytest.importorskip("PyPDF2").PdfReader
+
+ROOT = Path(__file__).resolve().parent.parent
+GENERATORS = {"double": generate_double_a4_sheet, "quadruple": generate_quadruple_a4_sheet}
+
+
+def _pages(pdf: Path) -> list:
+    """Text und Bilddaten je Seite – unabhängig davon, wie die Objekte nummeriert sind."""
+    result = []
+    for page in PdfReader(str(pdf)).pages:
+        images = []
+        for form in page["/Resources"]["/XObject"].get_object().values():
+            inner = form.get_object().get("/Resources", {}).get("/XObject", {})
+            images += [ref.get_object().get_data() for ref in inner.values()]
+        result.append((page.extract_text(), sorted(images)))
+    return result
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    return folder
+
+
+@pytest.mark.parametrize("kind", ["double", "quadruple"])
+def test_parallel_sheet_equals_single_process(folder, tmp_path, kind):
+    generate = GENERATORS[kind]
+    single = generate(folder, tmp_path / "single.pdf", ROOT / "glasses")
+    parallel = generate(folder, tmp_path / "parallel.pdf", ROOT / "glasses", workers=2)
+    assert _pages(parallel) == _pages(single)
+
+
+def test_parallel_sheet_from_iterable(folder, tmp_path):
+    single = generate_quadruple_a4_sheet(iter_recipes(folder), tmp_path / "single.pdf", ROOT / "glasses")
+    parallel = generate_quadruple_a4_sheet(iter_recipes(folder), tmp_path / "parallel.pdf", ROOT / "glasses", workers=2)
+    assert _pages(parallel) == _pages(single)
+
+
+def test_chunk_size():
+    assert _chunk_pages(None, 4, 2) == CHUNK_PAGES           # Länge unbekannt
+    assert _chunk_pages(19, 2, 2) == 2                       # 10 Seiten auf ~8 Blöcke
+    assert _chunk_pages(1, 4, 8) == 1                        # nie weniger als eine Seite
+    assert _chunk_pages(10**6, 4, 2) == CHUNK_PAGES          # gedeckelt
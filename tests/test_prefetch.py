@@ -0,0 +1,94 @@
+import json
+import random
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator.prefetch import prefetch, prefetch_cards
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Source:
+    """Iterable, das mitzählt, wie weit der Vorauslader schon gelesen hat."""
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.pulled = 0
+        self.threads = set()
+
+    def __iter__(self):
+        for i in range(self.n):
+            self.threads.add(threading.get_ident())
+            self.pulled += 1
+            yield i
+
+
+def _slow(i: int) -> int:
+    time.sleep(random.uniform(0, 0.003))
+    return i * 10
+
+
+def test_results_keep_input_order():
+    assert list(prefetch(range(50), _slow, depth=8)) == [i * 10 for i in range(50)]
+
+
+@pytest.mark.parametrize("depth", [1, 3, 8])
+def test_read_ahead_is_bounded(depth):
+    source = Source(40)
+    for consumed, _ in enumerate(prefetch(source, _slow, depth=depth), 1):
+        assert source.pulled <= consumed + depth
+    assert source.pulled == 40
+
+
+def test_items_are_read_in_the_calling_thread():
+    source = Source(20)
+    list(prefetch(source, _slow, depth=4))
+    assert source.threads == {threading.get_ident()}
+
+
+def test_depth_zero_loads_lazily_in_order():
+    source = Source(5)
+    it = prefetch(source, lambda i: (i, threading.get_ident()), depth=0)
+    assert next(it) == (0, threading.get_ident())
+    assert source.pulled == 1
+
+
+def test_error_is_raised_at_its_position():
+    def load(i: int) -> int:
+        if i == 3:
+            raise ValueError("kaputt")
+        return i
+
+    got = []
+    with pytest.raises(ValueError, match="kaputt"):
+        for value in prefetch(range(10), load, depth=4):
+            got.append(value)
+    assert got == [0, 1, 2]
+
+
+def test_stopping_early_discards_pending_work():
+    started = []
+
+    def load(i: int) -> int:
+        started.append(i)
+        time.sleep(0.01)
+        return i
+
+    it = prefetch(range(100), load, depth=4)
+    assert next(it) == 0
+    it.close()
+    assert len(started) <= 1 + 4
+
+
+def test_prefetch_cards_follow_file_order(tmp_path):
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    jsons = sorted(folder.glob("*.json"))
+    titles = [json.loads(js.read_text("utf-8"))["title"] for js in jsons]
+    cards = list(prefetch_cards(jsons, ROOT / "glasses", depth=4))
+    assert [" ".join(line.text for line in card.title) for card in cards] == titles
+    assert all(card.images for card in cards)  # Glasbild gefunden und vorbereitet
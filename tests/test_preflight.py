@@ -0,0 +1,100 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator import generate_pdfs_from_folder, preflight
+from cocktail_pdf_generator.preflight import ERROR, WARNING, preflight_recipes
+from cocktail_pdf_generator.recipe_loader import RecipeBatchError
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    return folder
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_vanished_file_is_reported_not_raised(folder, tmp_path, monkeypatch, workers):
+    """Zwischen Auflisten und Lesen gelöschte Dateien – auch im Prozess‑Pool."""
+    listed = preflight.recipe_files(folder)
+    gone = folder / "verschwunden.json"
+    monkeypatch.setattr(preflight, "recipe_files", lambda *_: [*listed, gone])
+    monkeypatch.setattr(preflight, "PARALLEL_THRESHOLD", 1)
+
+    report = preflight_recipes(folder, ROOT / "glasses", cache_dir=tmp_path / "cache", workers=workers)
+    assert [(i.file, i.level) for i in report.errors] == [(gone, ERROR)]
+    assert "nicht lesbar" in report.errors[0].message
+    assert report.checked == len(listed) + 1
+
+
+def test_clean_corpus_is_ok(folder, tmp_path):
+    report = preflight_recipes(folder, ROOT / "glasses", cache_dir=tmp_path / "cache")
+    assert report.ok and not report.issues
+    assert (report.checked, report.cached) == (len(list(folder.glob("*.json"))), 0)
+
+
+@pytest.mark.parametrize("content, level, message", [
+    ("{ kaputt", ERROR, "JSON ungültig"),
+    ('["kein", "objekt"]', ERROR, "kein JSON‑Objekt"),
+    ('{"title": "Ohne Rest"}', ERROR, "Pflichtfelder fehlen: ingredients, steps"),
+    ('{"title": 1, "ingredients": ["a"], "steps": ["b"]}', ERROR, "title muss"),
+    ('{"title": "X", "ingredients": "abc", "steps": ["b"]}', ERROR, "ingredients muss eine Liste"),
+    ('{"title": "X", "ingredients": ["a"], "steps": ["b"], "glass": 3}', ERROR, "glass muss"),
+    ('{"title": "X", "ingredients": ["a"], "steps": []}', WARNING, "steps ist leer"),
+    ('{"title": "X", "ingredients": ["a"], "steps": ["b"], "glass": "kelch"}', WARNING, "kein Glasbild"),
+    ('{"title": "X", "ingredients": ["a"], "steps": ["b"], "image_path": "/nirgends.png"}', WARNING, "image_path nicht gefunden"),
+    ('{"title": "X", "ingredients": ["a"], "steps": ' + json.dumps(["Sehr langer Schritt " * 8] * 30) + "}",
+     WARNING, "passt auch mit"),
+])
+def test_findings(folder, tmp_path, content, level, message):
+    (folder / "zzz.json").write_text(content, "utf-8")
+    report = preflight_recipes(folder, ROOT / "glasses", cache_dir=tmp_path / "cache")
+    assert [(i.file.name, i.level) for i in report.issues] == [("zzz.json", level)]
+    assert message in report.issues[0].message
+
+
+def test_cache_skips_unchanged_files(folder, tmp_path):
+    cache = tmp_path / "cache"
+    (folder / "zzz.json").write_text('{"title": "X"}', "utf-8")
+    first = preflight_recipes(folder, ROOT / "glasses", cache_dir=cache)
+    second = preflight_recipes(folder, ROOT / "glasses", cache_dir=cache)
+    assert second.cached == second.checked
+    assert [(i.file, i.message) for i in second.issues] == [(i.file, i.message) for i in first.issues]
+
+    (folder / "zzz.json").write_text('{"title": "X", "ingredients": ["a"], "steps": ["b"]}', "utf-8")
+    third = preflight_recipes(folder, ROOT / "glasses", cache_dir=cache)
+    assert third.ok and third.cached == third.checked - 1
+
+
+def test_assets_are_checked_on_every_run(folder, tmp_path):
+    cache = tmp_path / "cache"
+    glasses = tmp_path / "glasses"
+    shutil.copytree(ROOT / "glasses", glasses)
+    assert preflight_recipes(folder, glasses, cache_dir=cache).ok
+    (glasses / "wine.png").unlink()
+    report = preflight_recipes(folder, glasses, cache_dir=cache)
+    assert report.cached == report.checked
+    assert {i.file.name for i in report.warnings} == {"aperol-spritz.json", "lemoncello-spritz.json"}
+
+
+def test_raise_for_errors(folder, tmp_path):
+    (folder / "zzz.json").write_text('{"title": "X", "ingredients": ["a"], "steps": []}', "utf-8")
+    report = preflight_recipes(folder, ROOT / "glasses", cache_dir=tmp_path / "cache")
+    report.raise_for_errors()  # nur eine Warnung
+    with pytest.raises(RecipeBatchError) as exc:
+        report.raise_for_errors(strict=True)
+    assert [js.name for js, _ in exc.value.failures] == ["zzz.json"]
+
+
+def test_generate_with_preflight_renders_nothing_on_errors(folder, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    (folder / "zzz.json").write_text("{ kaputt", "utf-8")
+    out = tmp_path / "out"
+    with pytest.raises(RecipeBatchError):
+        generate_pdfs_from_folder(folder, out, ROOT / "glasses", preflight=True)
+    assert not list(out.glob("*.pdf"))
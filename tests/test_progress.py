@@ -0,0 +1,81 @@
+import shutil
+import threading
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator import generate_pdfs_from_folder, generate_quadruple_a4_sheet
+from cocktail_pdf_generator.progress import DRAWN, FAILED, LOADED, PAGE, SAVED, RenderCancelled
+from cocktail_pdf_generator.recipe_loader import RecipeBatchError
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    return folder
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_folder_events(folder, tmp_path, workers):
+    events = []
+    pdfs = generate_pdfs_from_folder(folder, tmp_path / "out", ROOT / "glasses", workers=workers, progress=events.append)
+    n = len(pdfs)
+    assert Counter(e.kind for e in events) == {LOADED: n, DRAWN: n, PAGE: n, SAVED: n}
+    assert [e.path for e in events if e.kind == LOADED] == sorted(folder.glob("*.json"))
+    assert [e.path for e in events if e.kind == SAVED] == pdfs
+    assert [e.done for e in events if e.kind == DRAWN] == list(range(1, n + 1))
+    assert events[-1].total == n and events[-1].eta == 0
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_failed_cards_count_as_done(folder, tmp_path, workers):
+    broken = folder / "b-kaputt.json"
+    broken.write_text("{ kaputt", "utf-8")
+    events = []
+    with pytest.raises(RecipeBatchError):
+        generate_pdfs_from_folder(folder, tmp_path / "out", ROOT / "glasses", workers=workers, progress=events.append)
+    failed = [e for e in events if e.kind == FAILED]
+    assert [e.path for e in failed] == [broken]
+    assert events[-1].done == events[-1].total and events[-1].failed == 1
+
+
+def test_cancel_keeps_finished_cards_and_resumes(folder, tmp_path):
+    out = tmp_path / "out"
+    cancel = threading.Event()
+
+    def stop_after_three(event):
+        if event.kind == SAVED and event.done == 3:
+            cancel.set()
+
+    with pytest.raises(RenderCancelled) as exc:
+        generate_pdfs_from_folder(folder, out, ROOT / "glasses", incremental=True, progress=stop_after_three, cancel=cancel)
+    assert len(exc.value.pdfs) == 3
+    assert sorted(out.glob("*.pdf")) == sorted(exc.value.pdfs)
+
+    events = []
+    pdfs = generate_pdfs_from_folder(folder, out, ROOT / "glasses", incremental=True, progress=events.append)
+    assert len(pdfs) == len(list(folder.glob("*.json")))
+    assert sum(e.kind == SAVED for e in events) == len(pdfs) - 3
+
+
+def test_sheet_events_and_cancel(folder, tmp_path):
+    events = []
+    generate_quadruple_a4_sheet(folder, tmp_path / "bogen.pdf", ROOT / "glasses", progress=events.append)
+    n = len(list(folder.glob("*.json")))
+    assert Counter(e.kind for e in events) == {LOADED: n, DRAWN: n, PAGE: -(-n // 4), SAVED: 1}
+    assert events[-1].path == tmp_path / "bogen.pdf"
+
+    cancel = threading.Event()
+
+    def stop_after_first_page(event):
+        if event.kind == PAGE:
+            cancel.set()
+
+    target = tmp_path / "abgebrochen.pdf"
+    with pytest.raises(RenderCancelled):
+        generate_quadruple_a4_sheet(folder, target, ROOT / "glasses", progress=stop_after_first_page, cancel=cancel)
+    assert not target.exists()  # kein halbes PDF
@@ -0,0 +1,116 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator.recipe_index import RecipeIndex, default_index_path, select_recipes
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    return folder
+
+
+def test_index_lives_in_user_cache(folder):
+    before = sorted(p.name for p in folder.iterdir())
+    hits = select_recipes(folder, "glass:tumbler")
+    assert hits and all(p.parent == folder for p in hits)
+    assert sorted(p.name for p in folder.iterdir()) == before
+    assert default_index_path(folder.resolve()).is_file()
+
+
+def test_unwritable_cache_falls_back_to_memory(folder, tmp_path, monkeypatch):
+    blocker = tmp_path / "kein-ordner"
+    blocker.write_text("", "utf-8")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))
+    with RecipeIndex(folder) as index:
+        index.update()
+        assert len(index) == len(list(folder.glob("*.json")))
+
+
+# ---------------------------------------------------------------------------
+# Abfragesprache und Abgleich mit dem Ordner
+# ---------------------------------------------------------------------------
+
+def _write(folder: Path, name: str, title: str, ingredients: list, glass: str | None) -> Path:
+    js = folder / f"{name}.json"
+    js.write_text(json.dumps({"title": title, "ingredients": ingredients, "steps": ["Rühren."], "glass": glass}), "utf-8")
+    return js
+
+
+@pytest.fixture
+def bar(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    folder = tmp_path / "bar"
+    folder.mkdir()
+    _write(folder, "daiquiri", "Daiquiri", ["6 cl Weißer Rum", "2 cl Limettensaft"], "Coupe")
+    _write(folder, "dark-and-stormy", "Dark and Stormy", ["6 cl Dunkler Rum", "Ginger Beer"], "Longdrink")
+    _write(folder, "gin-tonic", "Gin Tonic", ["4 cl Gin", "Tonic Water"], "longdrink")
+    _write(folder, "negroni", "Negroni", ["3 cl Gin", "3 cl Campari", "3 cl Wermut"], "old-fashioned")
+    (folder / ".versteckt.json").write_text("{}", "utf-8")
+    return folder.resolve()
+
+
+def _names(paths: list) -> list:
+    return [p.stem for p in paths]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", ["daiquiri", "dark-and-stormy", "gin-tonic", "negroni"]),
+    ("glass:longdrink", ["dark-and-stormy", "gin-tonic"]),
+    ("glass:LONGDRINK", ["dark-and-stormy", "gin-tonic"]),
+    ('glass:"Old Fashioned"', ["negroni"]),
+    ("ingredient:gin", ["gin-tonic", "negroni"]),
+    ("ingredient:gin glass:longdrink", ["gin-tonic"]),
+    ("ingredient:weisser", ["daiquiri"]),
+    ("ingredient:rum*", ["daiquiri", "dark-and-stormy"]),
+    ("ingredient:lim*", ["daiquiri"]),
+    ('title:"dark and stormy"', ["dark-and-stormy"]),
+    ("title:gin", ["gin-tonic"]),
+    ("stormy", ["dark-and-stormy"]),
+    ("ingredient:cl", ["daiquiri", "dark-and-stormy", "gin-tonic", "negroni"]),
+    ("ingredient:tequila", []),
+])
+def test_query_language(bar, query, expected):
+    assert _names(select_recipes(bar, query)) == expected
+
+
+def test_unknown_field_is_rejected(bar):
+    with pytest.raises(ValueError, match="Suchfeld"):
+        select_recipes(bar, "farbe:rot")
+
+
+def test_update_counts_changes(bar):
+    with RecipeIndex(bar) as index:
+        assert index.update() == (4, 0, 0)
+        assert index.update() == (0, 0, 0)
+        (bar / "negroni.json").unlink()
+        _write(bar, "gimlet", "Gimlet", ["6 cl Gin"], "coupe")
+        assert index.update(full=False) == (1, 0, 1)
+
+
+def test_new_and_deleted_files_are_picked_up(bar):
+    assert _names(select_recipes(bar, "ingredient:gin")) == ["gin-tonic", "negroni"]
+    _write(bar, "gimlet", "Gimlet", ["6 cl Gin", "Limettensirup"], "coupe")
+    (bar / "negroni.json").unlink()
+    assert _names(select_recipes(bar, "ingredient:gin")) == ["gimlet", "gin-tonic"]
+
+
+def test_in_place_edit_of_a_match_is_noticed(bar):
+    assert _names(select_recipes(bar, "glass:longdrink")) == ["dark-and-stormy", "gin-tonic"]
+    _write(bar, "gin-tonic", "Gin Tonic", ["4 cl Gin", "Tonic Water", "Gurke"], "highball")
+    assert _names(select_recipes(bar, "glass:longdrink")) == ["dark-and-stormy"]
+
+
+def test_in_place_edit_of_a_non_match_needs_full_scan(bar):
+    assert _names(select_recipes(bar, "glass:coupe")) == ["daiquiri"]
+    _write(bar, "negroni", "Negroni", ["3 cl Gin", "3 cl Campari", "3 cl Wermut"], "coupe")
+    # Ordner‑mtime unverändert: ohne full nur die bisherigen Treffer abgeglichen
+    assert _names(select_recipes(bar, "glass:coupe")) == ["daiquiri"]
+    assert _names(select_recipes(bar, "glass:coupe", full=True)) == ["daiquiri", "negroni"]
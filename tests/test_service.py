@@ -0,0 +1,72 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator.service import RenderService
+
+ROOT = Path(__file__).resolve().parent.parent
+RECIPE = json.loads((ROOT / "rezepte" / "caipirinha.json").read_text("utf-8"))
+
+
+async def _post(port: int, path: str, payload: object) -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), data
+
+
+def _run(service: RenderService, *requests: tuple) -> list:
+    async def main() -> list:
+        _, port = await service.start(port=0)
+        try:
+            return await asyncio.gather(*(_post(port, path, payload) for path, payload in requests))
+        finally:
+            await service.close()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({**RECIPE, "title": 1}, "title"),
+    ({**RECIPE, "ingredients": "abc"}, "ingredients"),
+    ({**RECIPE, "steps": ["ok", 2]}, "steps"),
+    ({**RECIPE, "glass": ["longdrink"]}, "glass"),
+    ({"title": "Nur Titel"}, "Pflichtfelder"),
+])
+def test_invalid_recipe_is_rejected_with_400(payload, message):
+    [(status, body)] = _run(RenderService(workers=1), ("/render/single", payload))
+    assert status == 400
+    assert message in json.loads(body)["error"]
+
+
+def test_valid_recipe_renders_pdf():
+    [(status, body)] = _run(RenderService(workers=1), ("/render/double", [RECIPE, RECIPE]))
+    assert status == 200
+    assert body.startswith(b"%PDF")
+
+
+def test_backpressure_answers_503():
+    service = RenderService(workers=1, max_concurrency=1, max_pending=1)
+    results = _run(service, *[("/render/quadruple", [RECIPE] * 8)] * 3)
+    statuses = sorted(status for status, _ in results)
+    assert statuses[0] == 200 and 503 in statuses
+    assert service.metrics.rejected == statuses.count(503)
+
+
+def test_image_path_is_confined_to_image_root(tmp_path):
+    root = tmp_path / "bilder"
+    root.mkdir()
+    service = RenderService(workers=1, image_root=root)
+    assert service._allowed_image("caipirinha.png") == str(root / "caipirinha.png")
+    assert service._allowed_image("../geheim.png") is None
+    assert service._allowed_image(str(tmp_path / "geheim.png")) is None
+    assert RenderService(workers=1)._allowed_image("caipirinha.png") is None
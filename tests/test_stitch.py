@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator.image_utils import ImageCache
+from cocktail_pdf_generator.pdf_parts import render_sheet_part, stitch_pdfs
+
+PdfReader = pytest.importorskip("PyPDF2").PdfReader
+Image = pytest.importorskip("PIL.Image")
+
+ROOT = Path(__file__).resolve().parent.parent
+GLASSES = ROOT / "glasses"
+
+
+def _recipe(title: str, image: Path | None = None) -> dict:
+    return {"title": title, "ingredients": ["4 cl Gin"], "steps": ["Rühren."], "image_path": str(image) if image else None, "glass": "tumbler"}
+
+
+def _images(page) -> list:
+    """Rohdaten aller Bilder, die die Formulare einer Seite zeichnen."""
+    data = []
+    for form in page["/Resources"]["/XObject"].get_object().values():
+        inner = form.get_object().get("/Resources", {}).get("/XObject", {})
+        data += [ref.get_object().get_data() for ref in inner.values()]
+    return sorted(data)
+
+
+def test_shared_forms_are_not_duplicated(tmp_path):
+    parts = [
+        render_sheet_part("double", [_recipe(f"Karte {i}"), _recipe(f"Karte {i}b")], tmp_path / f"{i}.pdf", GLASSES)
+        for i in range(3)
+    ]
+    shared = stitch_pdfs(parts, tmp_path / "shared.pdf")
+    plain = stitch_pdfs(parts, tmp_path / "plain.pdf", share_forms=False)
+
+    assert len(PdfReader(str(shared)).pages) == 3
+    assert shared.stat().st_size < plain.stat().st_size
+    forms = [page["/Resources"]["/XObject"].get_object() for page in PdfReader(str(shared)).pages]
+    assert {k: v.idnum for k, v in forms[0].items()} == {k: v.idnum for k, v in forms[2].items()}
+
+
+@pytest.mark.parametrize("target_dpi", [None, 300])
+def test_image_replaced_between_parts(tmp_path, target_dpi):
+    """Dieselbe Bilddatei mit neuem Inhalt darf nicht mit dem alten Stand verschmolzen werden."""
+    cache = ImageCache(target_dpi=target_dpi)
+    image = tmp_path / "bild.jpg"
+    parts = []
+    for i, color in enumerate(("red", "blue")):
+        Image.new("RGB", (64, 64), color).save(image)
+        parts.append(render_sheet_part("quadruple", [_recipe("Negroni", image)], tmp_path / f"{i}.pdf", GLASSES, cache))
+
+    pages = PdfReader(str(stitch_pdfs(parts, tmp_path / "bogen.pdf"))).pages
+    originals = [PdfReader(str(part)).pages[0] for part in parts]
+    assert [_images(p) for p in pages] == [_images(p) for p in originals]
+    assert _images(pages[0]) != _images(pages[1])
+
+
+def test_image_replaced_within_one_document(tmp_path):
+    """Geteilte Bildströme sind nach Inhalt benannt – nicht nach dem Pfad wie bei drawImage."""
+    from reportlab.pdfgen import canvas
+    from cocktail_pdf_generator.image_utils import draw_prepared, prepare_bitmap
+
+    image = tmp_path / "bild.jpg"
+    c = canvas.Canvas(str(tmp_path / "karte.pdf"))
+    for x, color in ((0, "red"), (100, "blue")):
+        Image.new("RGB", (64, 64), color).save(image)
+        assert draw_prepared(c, prepare_bitmap(image), x, 0, 64, 64)
+    c.save()
+
+    images = _images(PdfReader(str(tmp_path / "karte.pdf")).pages[0])
+    assert len(images) == 2 and images[0] != images[1]
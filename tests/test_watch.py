@@ -0,0 +1,69 @@
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cocktail_pdf_generator.watch import WatchBuilder
+
+pytest.importorskip("PyPDF2")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _page_count(pdf: Path) -> int:
+    from PyPDF2 import PdfReader
+
+    return len(PdfReader(str(pdf)).pages)
+
+
+@pytest.fixture
+def builder(tmp_path):
+    folder = tmp_path / "rezepte"
+    shutil.copytree(ROOT / "rezepte", folder)
+    return WatchBuilder(folder, tmp_path / "out", glasses_dir=ROOT / "glasses")
+
+
+def test_only_affected_pages_are_rebuilt(builder):
+    first = builder.build()
+    jsons = sorted(builder.recipes_folder.glob("*.json"))
+    assert len(first.cards) == len(jsons)
+    assert first.pages == {"double": list(range(10)), "quadruple": list(range(5))}
+
+    assert builder.build() == ([], {"double": [], "quadruple": []})
+
+    # Rezept Nr. 5 (0‑basiert) liegt auf 2er‑Seite 2 und 4er‑Seite 1
+    js = jsons[5]
+    data = json.loads(js.read_text("utf-8"))
+    data["steps"].append("Mit Minze garnieren.")
+    js.write_text(json.dumps(data, ensure_ascii=False), "utf-8")
+
+    result = builder.build()
+    assert result.cards == [f"{js.stem}.pdf"]
+    assert result.pages == {"double": [2], "quadruple": [1]}
+    assert _page_count(builder.output_dir / "cocktails_zwei_auf_a4.pdf") == 10
+
+
+def test_broken_recipe_becomes_placeholder(builder, caplog):
+    builder.build()
+    jsons = sorted(builder.recipes_folder.glob("*.json"))
+    jsons[0].write_text("{ kaputt", "utf-8")
+
+    with caplog.at_level(logging.ERROR, logger="cocktail_pdf_generator.watch"):
+        result = builder.build()
+    assert result.pages == {"double": [0], "quadruple": [0]}
+    assert jsons[0].name in caplog.text
+    # Die übrigen Seiten bleiben da, der Bogen ist vollständig
+    assert _page_count(builder.output_dir / "cocktails_vier_auf_a4.pdf") == 5
+
+
+def test_deleted_recipe_rebuilds_only_last_page(builder):
+    builder.build()
+    jsons = sorted(builder.recipes_folder.glob("*.json"))
+    jsons[-3].unlink()  # Index 16 von 19: nur die letzte Seite je Bogen ändert sich
+
+    result = builder.build()
+    assert result.pages == {"double": [8], "quadruple": [4]}
+    assert _page_count(builder.output_dir / "cocktails_zwei_auf_a4.pdf") == 9
+    assert len(list(builder.parts_dir.glob("double-*.pdf"))) == 9
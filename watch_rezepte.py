@@ -0,0 +1,21 @@
+import logging
+from pathlib import Path
+
+from cocktail_pdf_generator import watch_recipes
+
+
+def main() -> None:
+    root = Path(__file__).parent
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Einzel-PDFs, Sammel-PDF sowie 2er- und 4er-Bögen in pdfs/ aktuell halten,
+    # bis Strg+C gedrückt wird
+    print("Beobachte rezepte/ und glasses/ … (Strg+C beendet)")
+    try:
+        watch_recipes(root / "rezepte", root / "pdfs", glasses_dir=root / "glasses")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()